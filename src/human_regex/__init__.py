@@ -3,23 +3,47 @@
 """
 
 from .__about__ import __version__  # noqa: F401
-from .bases import GeneralRegexBase, ReProxy
-from .utilities import building_blocks, create_class_property
+from .bases import DeferredRegexBase, GeneralRegexBase, MappedFileSearch, ReProxy
+from .utilities import BytesBuildingBlocks, StringBuildingBlocks
 
-__all__ = ["StringRegex", "BytesRegex"]
+__all__ = ["StringRegex", "BytesRegex", "DeferredStringRegex", "DeferredBytesRegex"]
 
 # Classes StringRegex and BytesRegex are very similar.
 # BytesRegex has a base class bytes rather than str
-# and has class properties made of building blocks
-# which are encoded in UTF-8, rather than Unicode strings.
-#
-# Hence we generate the classes StringRegex and BytesRegex dynamically:
-for class_name, str_or_bytes, encoding in (
-    ("StringRegex", str, ""),
-    ("BytesRegex", bytes, "utf-8"),
-):
-    globals()[class_name] = type(
-        class_name,
-        (GeneralRegexBase, ReProxy, str_or_bytes),
-        {k: create_class_property(v, encoding=encoding) for k, v in building_blocks.items()},
-    )
+# and its building blocks are bytes, rather than Unicode strings.
+# BytesRegex can also search memory-mapped files.
+
+
+class StringRegex(StringBuildingBlocks, GeneralRegexBase, ReProxy, str):
+    """
+    A regular expression made of `str`. See `human_regex.bases.general_regex.GeneralRegexBase`
+    for its combinators and `human_regex.bases.re_proxy.ReProxy` for the proxied functions of `re`.
+    """
+
+
+class BytesRegex(BytesBuildingBlocks, GeneralRegexBase, ReProxy, MappedFileSearch, bytes):
+    """
+    A regular expression made of `bytes`. See `human_regex.bases.general_regex.GeneralRegexBase`
+    for its combinators, `human_regex.bases.re_proxy.ReProxy` for the proxied functions of `re`
+    and `human_regex.bases.mapped_file.MappedFileSearch` for searching memory-mapped files.
+    """
+
+
+class DeferredStringRegex(StringBuildingBlocks, DeferredRegexBase):
+    """
+    The deferred counterpart of `StringRegex`, see `human_regex.bases.deferred_regex`.
+    """
+
+    regex_class = StringRegex
+
+
+class DeferredBytesRegex(BytesBuildingBlocks, DeferredRegexBase):
+    """
+    The deferred counterpart of `BytesRegex`, see `human_regex.bases.deferred_regex`.
+    """
+
+    regex_class = BytesRegex
+
+
+StringRegex.deferred_class = DeferredStringRegex
+BytesRegex.deferred_class = DeferredBytesRegex
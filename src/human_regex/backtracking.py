@@ -0,0 +1,390 @@
+"""
+Finding patterns prone to catastrophic backtracking, and guarding against them at run time.
+
+The backtracking engine of `re` tries every way in which a pattern can match before it gives up.
+Where a repetition contains another unbounded repetition (`(a+)+`) or alternatives which can match
+the same text (`(a|a)*`), the number of ways grows exponentially with the length of the text,
+and a single failing search can stall a process for hours. `analyze` walks the syntax tree of
+a pattern, reports such constructs and suggests rewrites using possessive quantifiers and
+atomic groups (see `human_regex.StringRegex.atomic`), which do not backtrack:
+
+```py
+from human_regex import StringRegex as Sre
+
+word = Sre(r"\\w").one_or_more
+(finding,) = (word + Sre(r"\\s").optional).unnamed.one_or_more.backtracking_risks()
+assert finding.kind == "nested_quantifier"
+assert finding.fragment == r"(\\w+\\s?)+"
+assert finding.suggestions == (r"(\\w++\\s?)+", r"((?>\\w+)\\s?)+")
+assert finding.rewritten[0] == r"(\\w++\\s?)+"
+assert not Sre(r"\\w").one_or_more.backtracking_risks()
+```
+
+The analysis is a heuristic: it may miss some dangerous patterns and flag some harmless ones.
+For patterns which cannot be vetted in advance, `TimeoutGuard` (created by the `guarded` method)
+runs the proxied calls in a worker process and raises `RegexTimeoutError` when they take too long.
+The `re` engine offers no way to count or limit backtracking steps, so the budget is wall time.
+"""
+
+import multiprocessing
+import re
+from re import _constants as c
+from typing import NamedTuple
+
+from .parallel import _detach
+from .syntax import REPEATS, SubPattern, children, parse, render, substitute, unparse
+
+Text_Element = str | bytes
+"""
+@private
+"""
+
+NESTED_QUANTIFIER = "nested_quantifier"
+"""
+@private
+"""
+
+OVERLAPPING_ALTERNATION = "overlapping_alternation"
+"""
+@private
+"""
+
+PROBE_CHARACTERS = (0x100, 0x3B1, 0x416, 0x660, 0x2028, 0x4E00, 0x1F600)
+"""
+@private
+Characters beyond Latin-1 tried when checking whether two alternatives can start with the same character.
+"""
+
+
+class Finding(NamedTuple):
+    """
+    A construct of a pattern which may backtrack catastrophically.
+    """
+
+    kind: str
+    """
+    `"nested_quantifier"` or `"overlapping_alternation"`.
+    """
+    fragment: Text_Element
+    """
+    The repetition at fault, as rendered from the syntax tree of `re`. It is equivalent to, but not
+    necessarily identical with, the text of the pattern, e.g. `(a|a)*` is rendered as `(a(?:|))*`.
+    """
+    message: str
+    suggestions: tuple[Text_Element, ...]
+    """
+    Rewrites of *fragment* which do not backtrack into the repetition. They may match
+    differently where the original relied on giving characters back, so check them against your texts.
+    """
+    rewritten: tuple[Text_Element, ...]
+    """
+    The whole pattern with each of the *suggestions* applied, ready to be compiled with the same flags.
+    """
+
+
+class RegexTimeoutError(TimeoutError):
+    """
+    Raised by a `TimeoutGuard` when a proxied call exceeds its time budget.
+    """
+
+
+def analyze(pattern: Text_Element, flags: int = 0) -> list[Finding]:
+    """
+    Returns the constructs of *pattern* which may backtrack catastrophically.
+    """
+    tree = parse(pattern, flags)
+    analyzer = _Analyzer(tree, flags)
+    analyzer.walk(tree)
+    return analyzer.findings
+
+
+class _Analyzer:
+    def __init__(self, tree: SubPattern, flags: int) -> None:
+        self.tree = tree
+        self.state = tree.state
+        self.given_flags = int(flags)
+        self.flags = tree.state.flags | int(flags)
+        self.is_bytes = tree.state.is_bytes
+        self.names = {index: name for name, index in tree.state.groupdict.items()}
+        self.findings: list[Finding] = []
+        self._matchers: dict[int, re.Pattern] = {}
+
+    def walk(self, items) -> None:
+        for node in items:
+            op, av = node
+            if op in REPEATS and op is not c.POSSESSIVE_REPEAT and av[1] > 1:
+                self.check_repeat(node)
+            for child in children(op, av):
+                self.walk(child)
+
+    def check_repeat(self, repeat: tuple) -> None:
+        content = repeat[1][2]
+        inner = list(self.free_repeats(content))
+        if inner:
+            possessive = {id(node): (c.POSSESSIVE_REPEAT, node[1]) for node in inner}
+            atomic = {id(node): (c.ATOMIC_GROUP, [node]) for node in inner}
+            self.report(
+                NESTED_QUANTIFIER,
+                repeat,
+                "a repetition contains another repetition, which can split the same text in exponentially many ways",
+                (possessive, atomic),
+            )
+        elif self.adjacent_repeats(content):
+            # making either of the adjacent repetitions possessive would change what matches,
+            # so the outer repetition must not be backtracked into instead
+            self.report(
+                NESTED_QUANTIFIER,
+                repeat,
+                "a repetition contains adjacent repetitions of the same characters, "
+                "which can split the same text in exponentially many ways",
+                self.protected(repeat),
+            )
+        branches = [node for node in self.branches(content) if self.overlapping(node[1][1])]
+        if branches:
+            self.report(
+                OVERLAPPING_ALTERNATION,
+                repeat,
+                "a repetition contains alternatives which can match the same text",
+                (*self.protected(repeat), {id(node): (c.ATOMIC_GROUP, [node]) for node in branches}),
+            )
+
+    @staticmethod
+    def protected(repeat: tuple) -> tuple[dict, dict]:
+        """
+        Rewrites making *repeat* possessive, or putting it into an atomic group.
+        """
+        return {id(repeat): (c.POSSESSIVE_REPEAT, repeat[1])}, {id(repeat): (c.ATOMIC_GROUP, [repeat])}
+
+    def report(self, kind: str, repeat: tuple, message: str, rewrites) -> None:
+        suggestions = []
+        rewritten = []
+        for replacements in rewrites:
+            suggestions.append(self.render(substitute([repeat], replacements)))
+            rewritten.append(unparse(SubPattern(self.state, substitute(self.tree, replacements)), self.given_flags))
+        self.findings.append(Finding(kind, self.render([repeat]), message, tuple(suggestions), tuple(rewritten)))
+
+    def render(self, items: list) -> Text_Element:
+        text = render(items, self.names)
+        return text.encode("latin-1") if self.is_bytes else text
+
+    def free_repeats(self, items):
+        """
+        Repetitions within *items* which can take up all of the text matched by *items*,
+        because everything around them can match the empty string.
+        """
+        for index, node in enumerate(items):
+            if any(self.min_width(other) for position, other in enumerate(items) if position != index):
+                continue
+            op, av = node
+            if op in REPEATS:
+                if op is not c.POSSESSIVE_REPEAT and av[1] > 1:
+                    yield node
+            elif op is c.SUBPATTERN:
+                yield from self.free_repeats(av[3])
+            elif op is c.BRANCH:
+                for branch in av[1]:
+                    yield from self.free_repeats(branch)
+
+    def adjacent_repeats(self, items) -> bool:
+        """
+        Whether *items* contain two adjacent repetitions, not protected from backtracking,
+        which can match the same characters, like `x+x+`.
+        """
+        for index, (op, av) in enumerate(items):
+            if op is c.ATOMIC_GROUP or op is c.POSSESSIVE_REPEAT:
+                continue
+            if op in REPEATS and av[1] > 1 and index + 1 < len(items):
+                following_op, following_av = items[index + 1]
+                if (
+                    following_op in REPEATS
+                    and following_op is not c.POSSESSIVE_REPEAT
+                    and following_av[1] > 1
+                    and self.intersect(self.first_atoms(av[2])[0], self.first_atoms(following_av[2])[0])
+                ):
+                    return True
+            if any(self.adjacent_repeats(child) for child in children(op, av)):
+                return True
+        return False
+
+    def branches(self, items):
+        """
+        Alternations within *items* which are not protected from backtracking.
+        """
+        for node in items:
+            op, av = node
+            if op is c.BRANCH:
+                yield node
+            if op is c.ATOMIC_GROUP or op is c.POSSESSIVE_REPEAT:
+                continue
+            for child in children(op, av):
+                yield from self.branches(child)
+
+    def min_width(self, node: tuple) -> int:
+        return SubPattern(self.state, [node]).getwidth()[0]
+
+    def overlapping(self, alternatives: list) -> bool:
+        firsts = []
+        for alternative in alternatives:
+            atoms, nullable = self.first_atoms(alternative)
+            firsts.append((atoms, nullable))
+        for index, (atoms, nullable) in enumerate(firsts):
+            for other_atoms, other_nullable in firsts[index + 1 :]:
+                if nullable and other_nullable:
+                    return True
+                if self.intersect(atoms, other_atoms):
+                    return True
+        return False
+
+    def first_atoms(self, items) -> tuple[list, bool]:
+        """
+        Nodes matching the characters a match of *items* can start with,
+        and whether *items* can match the empty string.
+        """
+        atoms = []
+        for node in items:
+            op, av = node
+            if op in (c.LITERAL, c.NOT_LITERAL, c.ANY, c.IN, c.GROUPREF):
+                atoms.append(node)
+                return atoms, False
+            if op in REPEATS:
+                atoms.extend(self.first_atoms(av[2])[0])
+                if av[0]:
+                    return atoms, False
+            elif op is c.SUBPATTERN:
+                inner, nullable = self.first_atoms(av[3])
+                atoms.extend(inner)
+                if not nullable:
+                    return atoms, False
+            elif op is c.ATOMIC_GROUP:
+                inner, nullable = self.first_atoms(av)
+                atoms.extend(inner)
+                if not nullable:
+                    return atoms, False
+            elif op is c.BRANCH:
+                nullable = False
+                for branch in av[1]:
+                    inner, branch_nullable = self.first_atoms(branch)
+                    atoms.extend(inner)
+                    nullable = nullable or branch_nullable
+                if not nullable:
+                    return atoms, False
+            elif op is c.GROUPREF_EXISTS:
+                atoms.append((c.ANY, None))
+                return atoms, False
+            # anchors and lookarounds match the empty string
+        return atoms, True
+
+    def intersect(self, atoms: list, other_atoms: list) -> bool:
+        if not atoms or not other_atoms:
+            return False
+        matchers = [self.matcher(atom) for atom in atoms]
+        other_matchers = [self.matcher(atom) for atom in other_atoms]
+        if None in matchers or None in other_matchers:
+            # a backreference can start with anything
+            return True
+        for code in self.probes(atoms + other_atoms):
+            character = bytes((code,)) if self.is_bytes else chr(code)
+            if any(m.match(character) for m in matchers) and any(m.match(character) for m in other_matchers):
+                return True
+        return False
+
+    def matcher(self, atom: tuple) -> re.Pattern | None:
+        if atom[0] is c.GROUPREF:
+            return None
+        key = id(atom)
+        if key not in self._matchers:
+            self._matchers[key] = re.compile(self.render([atom]), self.flags & ~c.SRE_FLAG_VERBOSE)
+        return self._matchers[key]
+
+    def probes(self, atoms: list):
+        yield from range(0x100)
+        if self.is_bytes:
+            return
+        yield from PROBE_CHARACTERS
+        for op, av in atoms:
+            if op is c.LITERAL or op is c.NOT_LITERAL:
+                yield av
+            elif op is c.IN:
+                for item_op, item_av in av:
+                    if item_op is c.LITERAL:
+                        yield item_av
+                    elif item_op is c.RANGE:
+                        yield from item_av
+
+
+def _run(pattern, method: str, args: tuple, kwargs: dict):
+    if type(pattern) is str or type(pattern) is bytes:
+        return _detach(getattr(re, method)(pattern, *args, **kwargs))
+    return _detach(getattr(pattern, method)(*args, **kwargs))
+
+
+def _guarded(name: str):
+    def guarded(self, *args, **kwargs):
+        return self._call(name, args, kwargs)
+
+    guarded.__name__ = name
+    guarded.__doc__ = f"Like the proxied {name}, but raises `RegexTimeoutError` when the time budget is exceeded."
+    return guarded
+
+
+class TimeoutGuard:
+    """
+    Runs the proxied calls of *pattern* (or the functions of `re`, if *pattern* is a plain `str`
+    or `bytes`) in a worker process and gives up on them after *timeout* seconds,
+    terminating the worker and raising `RegexTimeoutError`. A new worker is started on the next call.
+
+    Matches are returned as `human_regex.matches.DetachedMatch` objects, finditer returns a list,
+    and the arguments (e.g. a replacement function for sub) must be picklable.
+    Use the guard as a context manager, or call `TimeoutGuard.close`, to stop the worker.
+
+    ```py
+    from human_regex import StringRegex as Sre
+
+    with Sre(r"\\d").one_or_more.guarded(timeout=5) as guarded:
+        assert guarded.search("abc 123").span() == (4, 7)
+        assert guarded.sub("#", "1 and 22") == "# and #"
+    ```
+    """
+
+    def __init__(self, pattern: Text_Element, timeout: float) -> None:
+        if timeout <= 0:
+            msg = "timeout must be positive"
+            raise ValueError(msg)
+        self.pattern = pattern
+        self.timeout = timeout
+        self._pool = None
+
+    def _call(self, method: str, args: tuple, kwargs: dict):
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(1)
+        result = self._pool.apply_async(_run, (self.pattern, method, args, kwargs))
+        try:
+            return result.get(self.timeout)
+        except multiprocessing.TimeoutError:
+            self.close()
+            msg = f"{method} did not finish within {self.timeout} seconds"
+            raise RegexTimeoutError(msg) from None
+
+    search = _guarded("search")
+    match = _guarded("match")
+    fullmatch = _guarded("fullmatch")
+    findall = _guarded("findall")
+    finditer = _guarded("finditer")
+    split = _guarded("split")
+    sub = _guarded("sub")
+    subn = _guarded("subn")
+
+    def close(self) -> None:
+        """
+        Terminates the worker process.
+        """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self) -> "TimeoutGuard":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -1,4 +1,6 @@
+from .deferred_regex import DeferredRegexBase
 from .general_regex import GeneralRegexBase
+from .mapped_file import MappedFileSearch
 from .re_proxy import ReProxy
 
-__all__ = ["GeneralRegexBase", "ReProxy"]
+__all__ = ["DeferredRegexBase", "GeneralRegexBase", "MappedFileSearch", "ReProxy"]
@@ -0,0 +1,135 @@
+"""
+Deferred (lazy) variants of `human_regex.StringRegex` and `human_regex.BytesRegex`.
+
+A deferred regex supports all the combinators of `human_regex.bases.general_regex.GeneralRegexBase`,
+but rather than joining a new string on every operation, it only records the pieces of the operation
+in a lightweight tree (a rope). The text of the regular expression is joined once, when it is first
+needed: on `DeferredRegexBase.render`, on `DeferredRegexBase.compile`, on conversion with `str` or `bytes`,
+or when any method of the eager class is used, e.g. `search`. Eager and deferred expressions can be
+combined freely; the functions of the `re` module, however, only accept the rendered or compiled expression.
+
+```py
+from human_regex import StringRegex as Sre
+
+digits = Sre(r"\\d").deferred.one_or_more
+grammar = digits.named("major") + r"\\." + digits.named("minor")
+assert grammar.render() == r"(?P<major>\\d+)\\.(?P<minor>\\d+)"
+assert type(grammar.render()) is Sre
+assert grammar.search("version 3.11").group("minor") == "11"
+```
+"""
+
+from collections.abc import Iterable
+from typing import Self
+
+from .general_regex import GeneralRegexBase, Text_Element
+
+
+class DeferredRegexBase(GeneralRegexBase):
+    """
+    Base class for `human_regex.DeferredStringRegex` and `human_regex.DeferredBytesRegex`.
+    """
+
+    __slots__ = ("_parts", "_rendered")
+
+    regex_class: type
+    """
+    @private
+    The eager class the deferred expression renders to.
+    """
+
+    def __init__(self, value: Text_Element | None = None, /) -> None:
+        if value is None:
+            value = self.EMPTY
+        self._parts = (value,)
+        self._rendered = None
+
+    @classmethod
+    def concatenate(cls, elements: Iterable[Text_Element]) -> Self:
+        """
+        Records the concatenation of *elements* without joining them.
+        """
+        deferred = cls.__new__(cls)
+        deferred._parts = tuple(elements)
+        deferred._rendered = None
+        return deferred
+
+    _join = concatenate
+
+    def join(self, elements: Iterable[Text_Element]) -> Self:
+        """
+        Records *elements* separated by *self* without joining them.
+        """
+        parts = []
+        for element in elements:
+            parts.append(element)
+            parts.append(self)
+        return type(self).concatenate(parts[:-1])
+
+    @classmethod
+    def _convert_to_bytes_or_string(cls, i: int) -> Text_Element:
+        return cls.regex_class._convert_to_bytes_or_string(i)
+
+    @property
+    def deferred(self) -> Self:
+        return self
+
+    def render(self):
+        """
+        Returns the eager `human_regex.StringRegex` or `human_regex.BytesRegex` instance of the
+        recorded expression. The text is joined on the first call only.
+        """
+        if self._rendered is None:
+            pieces = []
+            stack = [self]
+            # walk the tree iteratively, deep chains of combinators would exceed the recursion limit
+            while stack:
+                part = stack.pop()
+                if isinstance(part, DeferredRegexBase):
+                    if part._rendered is None:
+                        stack.extend(reversed(part._parts))
+                    else:
+                        pieces.append(part._rendered)
+                else:
+                    pieces.append(part)
+            self._rendered = self.regex_class(self.EMPTY.join(pieces))
+            self._parts = ()
+        return self._rendered
+
+    def compile(self, flags=0):
+        """
+        Renders the expression and compiles it. See `human_regex.bases.re_proxy.ReProxy.compile`.
+        """
+        return self.render().compile(flags)
+
+    def __radd__(self, other: Text_Element) -> Self:
+        return type(self).concatenate((other, self))
+
+    def __ror__(self, other: Text_Element) -> Self:
+        return type(self).concatenate((other, self.OR, self))
+
+    def __len__(self) -> int:
+        return len(self.render())
+
+    def __str__(self) -> str:
+        return str(self.render())
+
+    def __bytes__(self) -> bytes:
+        return bytes(self.render())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.render()!r})"
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, DeferredRegexBase):
+            other = other.render()
+        return self.render() == other
+
+    def __hash__(self) -> int:
+        return hash(self.render())
+
+    def __getattr__(self, name: str):
+        # everything else, e.g. the proxied re functions, is served by the rendered expression
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.render(), name)
@@ -4,256 +4,221 @@ they are equally applicable for the `human_regex.BytesRegex` variant, if you
 use byte-strings (`b"..."`) instead of strings (`"..."`).
 """
 
-from abc import abstractmethod
-from collections.abc import Iterable
-from typing import Self
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable, Mapping
+from typing import TYPE_CHECKING, Self
 
 from ..contracts.abstract_regex import AbstractRegex
+from ..utilities import lazy_import
+
+if TYPE_CHECKING:
+    from ..rules import RuleIndex
+    from ..scanner import PatternSet
+
+# only needed with build_nodes or for the node property, so imported on first use
+nodes = lazy_import("human_regex.nodes")
 
 Text_Element = str | bytes
 """
 @private
 """
 
+INTERN_TABLE_SIZE = 4096
+"""
+@private
+How many instances of `human_regex.BytesRegex` are kept interned. Subclasses of bytes cannot be
+weakly referenced, so their interned instances are kept in bounded tables instead of weak ones.
+"""
+
+
+class _BoundedTable(OrderedDict):
+    """
+    @private
+    Keeps the `INTERN_TABLE_SIZE` most recently used values.
+    """
+
+    def get(self, key, default=None):
+        value = super().get(key, default)
+        if value is not default:
+            self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        while len(self) > INTERN_TABLE_SIZE:
+            self.popitem(last=False)
+
+
+_interned = {True: weakref.WeakValueDictionary(), False: _BoundedTable()}
+_derived = {True: weakref.WeakValueDictionary(), False: _BoundedTable()}
+_intern_lock = threading.Lock()
+
 
 class GeneralRegexBase(AbstractRegex):
     """
     Base class for `human_regex.StringRegex` and `human_regex.BytesRegex`.
     """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def EMPTY(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    __slots__ = ()
 
-    @classmethod
-    @property
-    @abstractmethod
-    def OPEN_CHAR_SET(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    deferred_class: type
+    """
+    @private
+    The deferred counterpart of the class, see `GeneralRegexBase.deferred`.
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def CLOSE_CHAR_SET(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    TEXT_TYPE: type
+    """
+    @private
+    `str` or `bytes`, the type of the text of the expressions.
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def OPEN_GROUP(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    build_nodes: bool = False
+    """
+    Set to True on `human_regex.StringRegex` or `human_regex.BytesRegex` to have the combinators
+    build the `GeneralRegexBase.node` of their results alongside the text. See `human_regex.nodes`.
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def CLOSE_GROUP(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    intern_patterns: bool = False
+    """
+    Set to True on `human_regex.StringRegex` or `human_regex.BytesRegex` to have the combinators
+    return one shared instance for each text (see `GeneralRegexBase.intern`) and remember their results
+    by their operands, so building the same expression again returns the identical instance without joining it anew.
+    As the instances are shared, do not set attributes such as `cache_patterns` on them.
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def OPEN_EXTENSION(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    EMPTY: Text_Element
+    """
+    @private
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def CLOSE_EXTENSION(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    OPEN_CHAR_SET: Text_Element
+    """
+    @private
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def OPEN_NAME(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    CLOSE_CHAR_SET: Text_Element
+    """
+    @private
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def CLOSE_NAME(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    OPEN_GROUP: Text_Element
+    """
+    @private
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def OPEN_QUANTIFIER(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    CLOSE_GROUP: Text_Element
+    """
+    @private
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def CLOSE_QUANTIFIER(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    OPEN_EXTENSION: Text_Element
+    """
+    @private
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def QUANTIFIER_SEPARATOR(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    CLOSE_EXTENSION: Text_Element
+    """
+    @private
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def OR(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    OPEN_NAME: Text_Element
+    """
+    @private
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def NO_CAPTURE(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    CLOSE_NAME: Text_Element
+    """
+    @private
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def FLAGS_END(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    OPEN_QUANTIFIER: Text_Element
+    """
+    @private
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def ATOMIC(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    CLOSE_QUANTIFIER: Text_Element
+    """
+    @private
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def NAME_REFERENCE(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    QUANTIFIER_SEPARATOR: Text_Element
+    """
+    @private
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def COMMENT(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    OR: Text_Element
+    """
+    @private
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def FOLLOWED_BY(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    NO_CAPTURE: Text_Element
+    """
+    @private
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def NOT_FOLLOWED_BY(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    FLAGS_END: Text_Element
+    """
+    @private
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def PRECEDED_BY(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    ATOMIC: Text_Element
+    """
+    @private
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def NOT_PRECEDED_BY(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    NAME_REFERENCE: Text_Element
+    """
+    @private
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def ZERO_OR_MORE(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    COMMENT: Text_Element
+    """
+    @private
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def ONE_OR_MORE(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    FOLLOWED_BY: Text_Element
+    """
+    @private
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def OPTIONAL(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    NOT_FOLLOWED_BY: Text_Element
+    """
+    @private
+    """
 
-    @classmethod
-    @property
-    @abstractmethod
-    def LAZY(cls) -> Text_Element:
-        """
-        @private
-        """
-        ...
+    PRECEDED_BY: Text_Element
+    """
+    @private
+    """
+
+    NOT_PRECEDED_BY: Text_Element
+    """
+    @private
+    """
+
+    ZERO_OR_MORE: Text_Element
+    """
+    @private
+    """
+
+    ONE_OR_MORE: Text_Element
+    """
+    @private
+    """
+
+    OPTIONAL: Text_Element
+    """
+    @private
+    """
+
+    LAZY: Text_Element
+    """
+    @private
+    """
 
     @classmethod
     def concatenate(cls, elements: Iterable[Text_Element]) -> Self:
@@ -271,9 +236,69 @@ class GeneralRegexBase(AbstractRegex):
         sre = Sre("Hello") + " " + "world"
         ```
         """
-        str_or_bytes = str if str in cls.__mro__ else bytes
-        result = str_or_bytes(cls.EMPTY).join(elements)
-        return cls(result)
+        if type(elements) is not tuple and type(elements) is not list:
+            elements = tuple(elements)
+        result = cls._join(elements)
+        if cls.build_nodes:
+            _attach(result, nodes.concatenation([nodes.node_of(element) for element in elements]))
+        return result
+
+    @classmethod
+    def _join(cls, elements: tuple | list) -> Self:
+        """
+        Concatenates *elements* like `GeneralRegexBase.concatenate`, but leaves building the node
+        of the result to the calling combinator. The combinators pass all the pieces of their result
+        at once, so each of them joins a single string and creates a single instance.
+        """
+        if cls.intern_patterns:
+            return cls._derive(elements)
+        try:
+            return cls(cls.EMPTY.join(elements))
+        except TypeError:
+            return cls(cls.EMPTY.join(_rendered(elements)))
+
+    @classmethod
+    def _derive(cls, elements: tuple | list) -> Self:
+        """
+        Returns the interned concatenation of *elements*. The results are remembered by their pieces,
+        so repeating a combinator on equal operands returns the same instance without joining it anew.
+        """
+        key = (cls, *elements)
+        derived = _derived[bool(cls.__weakrefoffset__)]
+        try:
+            with _intern_lock:
+                result = derived.get(key)
+        except TypeError:
+            # unhashable pieces are not remembered
+            return cls.intern(cls.EMPTY.join(_rendered(elements)))
+        if result is None:
+            result = cls.intern(cls.EMPTY.join(_rendered(elements)))
+            with _intern_lock:
+                derived[key] = result
+        return result
+
+    @classmethod
+    def intern(cls, text: Text_Element) -> Self:
+        """
+        @public
+        Returns the shared instance of the class with the text *text*. The instance is kept
+        as long as it is used, so equal expressions interned meanwhile are the identical object,
+        sharing their compiled patterns and nodes.
+
+        ```py
+        from human_regex import StringRegex as Sre
+
+        digits = Sre.intern(r"\\d+")
+        assert Sre.intern(Sre(r"\\d").one_or_more) is digits
+        ```
+        """
+        key = (cls, text)
+        interned = _interned[bool(cls.__weakrefoffset__)]
+        with _intern_lock:
+            instance = interned.get(key)
+            if instance is None:
+                instance = interned[key] = text if type(text) is cls else cls(text)
+        return instance
 
     def __add__(self, other: Text_Element) -> Self:
         """
@@ -294,7 +319,10 @@ class GeneralRegexBase(AbstractRegex):
         ```
         """
         cls = type(self)
-        return cls.concatenate((self, other))
+        result = cls._join((self, other))
+        if cls.build_nodes:
+            _attach(result, nodes.concatenation([nodes.node_of(self), nodes.node_of(other)]))
+        return result
 
     def __or__(self, other) -> Self:
         """
@@ -402,9 +430,82 @@ class GeneralRegexBase(AbstractRegex):
         are illegal or not part of the longitude notation norm, e.g. `190° 78′ 93″ E` would be a match.)
         """
         cls = type(self)
-        str_or_bytes = str if str in cls.__mro__ else bytes
-        result = str_or_bytes(self).join(elements)
-        return cls(result)
+        if type(elements) is not tuple and type(elements) is not list:
+            elements = tuple(elements)
+        try:
+            text = cls.TEXT_TYPE.join(self, elements)
+        except TypeError:
+            text = cls.TEXT_TYPE.join(self, _rendered(elements))
+        result = cls.intern(text) if cls.intern_patterns else cls(text)
+        if cls.build_nodes:
+            separator = nodes.node_of(self)
+            parts = []
+            for element in elements:
+                parts.extend((separator, nodes.node_of(element)))
+            _attach(result, nodes.concatenation(parts[1:]))
+        return result
+
+    @property
+    def deferred(self):
+        """
+        @public
+        Returns a deferred counterpart of *self* (`human_regex.DeferredStringRegex` or
+        `human_regex.DeferredBytesRegex`). Its combinators only record their operands in
+        a tree, rather than joining a new string on every operation. The text is joined
+        once, on `render()`, on `compile()`, on `str()` or on any other use, including
+        combining it with eager instances. Only the functions of the `re` module itself
+        do not accept deferred expressions; pass them `render()` or `compile()` instead.
+        Long chains of combinators are built in linear time this way.
+
+        ```py
+        from human_regex import StringRegex as Sre
+
+        sre = Sre("a").deferred
+        for _ in range(1000):
+            sre = sre.append("b").no_capture
+        rendered = sre.render()
+        assert type(rendered) is Sre
+        assert rendered.startswith("(?:" * 1000 + "ab)")
+        ```
+        """
+        return self.deferred_class(self)
+
+    @property
+    def node(self) -> "nodes.Node":
+        """
+        @public
+        The expression as a tree of `human_regex.nodes.Node` objects. Raises `re.error`
+        if the expression is not a valid regular expression.
+
+        ```py
+        from human_regex import StringRegex as Sre
+        from human_regex.nodes import Alternation, Literal, Set
+
+        sre = Sre("abc") | Sre("0-9").set
+        assert sre.node is Alternation((Literal("abc"), Set("0-9")))
+        ```
+        """
+        node = nodes.node_of(self)
+        return node if node is not None else nodes.parse(self)
+
+    @classmethod
+    def from_node(cls, node: "nodes.Node") -> Self:
+        """
+        @public
+        Renders the tree *node* (see `GeneralRegexBase.node`) into an expression.
+
+        ```py
+        from human_regex import StringRegex as Sre
+        from human_regex.nodes import Group, Literal, Quantifier
+
+        assert Sre.from_node(Quantifier(Group(Literal("ab"), "pair"), 2, None)) == "(?P<pair>ab){2,}"
+        ```
+        """
+        text = nodes.render(node)
+        result = cls(text if isinstance(cls.EMPTY, str) else text.encode("latin-1"))
+        if cls.build_nodes:
+            _attach(result, node)
+        return result
 
     @property
     def unnamed(self) -> Self:
@@ -422,7 +523,10 @@ class GeneralRegexBase(AbstractRegex):
         ```
         """
         cls = type(self)
-        return cls.concatenate((cls.OPEN_GROUP, self, cls.CLOSE_GROUP))
+        result = cls._join((cls.OPEN_GROUP, self, cls.CLOSE_GROUP))
+        if cls.build_nodes:
+            _attach(result, nodes.group(nodes.node_of(self)))
+        return result
 
     @property
     def extension(self) -> Self:
@@ -438,7 +542,8 @@ class GeneralRegexBase(AbstractRegex):
         ```
         """
         cls = type(self)
-        return cls.concatenate((cls.OPEN_EXTENSION, self, cls.CLOSE_EXTENSION))
+        # the meaning depends on the content, so the node is parsed from the text when needed
+        return cls._join((cls.OPEN_EXTENSION, self, cls.CLOSE_EXTENSION))
 
     @classmethod
     def set_flags(cls, flags: Text_Element) -> Self:
@@ -477,7 +582,10 @@ class GeneralRegexBase(AbstractRegex):
         ```
         """
         cls = type(self)
-        return cls.concatenate((cls.NO_CAPTURE, self)).extension
+        result = cls._join((cls.OPEN_EXTENSION, cls.NO_CAPTURE, self, cls.CLOSE_EXTENSION))
+        if cls.build_nodes:
+            _attach(result, nodes.group(nodes.node_of(self), capture=False))
+        return result
 
     def modify_flags(self, flags: Text_Element) -> Self:
         """
@@ -506,8 +614,10 @@ class GeneralRegexBase(AbstractRegex):
         ```
         """
         cls = type(self)
-        extension_core = cls.concatenate((flags, cls.FLAGS_END, self))
-        return extension_core.extension
+        result = cls._join((cls.OPEN_EXTENSION, flags, cls.FLAGS_END, self, cls.CLOSE_EXTENSION))
+        if cls.build_nodes:
+            _attach(result, nodes.group(nodes.node_of(self), flags=flags))
+        return result
 
     @property
     def atomic(self) -> Self:
@@ -523,7 +633,10 @@ class GeneralRegexBase(AbstractRegex):
         ```
         """
         cls = type(self)
-        return cls.concatenate((cls.ATOMIC, self)).extension
+        result = cls._join((cls.OPEN_EXTENSION, cls.ATOMIC, self, cls.CLOSE_EXTENSION))
+        if cls.build_nodes:
+            _attach(result, nodes.group(nodes.node_of(self), atomic=True))
+        return result
 
     def named(self, name: Text_Element) -> Self:
         """
@@ -548,8 +661,10 @@ class GeneralRegexBase(AbstractRegex):
         ```
         """
         cls = type(self)
-        label = cls.concatenate((cls.OPEN_NAME, name, cls.CLOSE_NAME))
-        return cls.concatenate((label, self)).extension
+        result = cls._join((cls.OPEN_EXTENSION, cls.OPEN_NAME, name, cls.CLOSE_NAME, self, cls.CLOSE_EXTENSION))
+        if cls.build_nodes:
+            _attach(result, nodes.group(nodes.node_of(self), name))
+        return result
 
     @property
     def backreference(self) -> Self:
@@ -571,7 +686,10 @@ class GeneralRegexBase(AbstractRegex):
         ```
         """
         cls = type(self)
-        return cls.concatenate((cls.NAME_REFERENCE, self)).extension
+        result = cls._join((cls.OPEN_EXTENSION, cls.NAME_REFERENCE, self, cls.CLOSE_EXTENSION))
+        if cls.build_nodes:
+            _attach(result, nodes.backreference(self))
+        return result
 
     @property
     def comment(self) -> Self:
@@ -587,7 +705,10 @@ class GeneralRegexBase(AbstractRegex):
         ```
         """
         cls = type(self)
-        return cls.concatenate((cls.COMMENT, self)).extension
+        result = cls._join((cls.OPEN_EXTENSION, cls.COMMENT, self, cls.CLOSE_EXTENSION))
+        if cls.build_nodes:
+            _attach(result, nodes.comment(self))
+        return result
 
     def followed_by(self, following: Text_Element) -> Self:
         """
@@ -602,8 +723,10 @@ class GeneralRegexBase(AbstractRegex):
         ```
         """
         cls = type(self)
-        follows = cls.concatenate((cls.FOLLOWED_BY, following)).extension
-        return cls.concatenate((self, follows))
+        result = cls._join((self, cls.OPEN_EXTENSION, cls.FOLLOWED_BY, following, cls.CLOSE_EXTENSION))
+        if cls.build_nodes:
+            _attach(result, nodes.concatenation([nodes.node_of(self), nodes.lookaround(nodes.node_of(following))]))
+        return result
 
     def not_followed_by(self, not_following: Text_Element) -> Self:
         """
@@ -618,8 +741,15 @@ class GeneralRegexBase(AbstractRegex):
         ```
         """
         cls = type(self)
-        does_not_follow = cls.concatenate((cls.NOT_FOLLOWED_BY, not_following)).extension
-        return cls.concatenate((self, does_not_follow))
+        result = cls._join((self, cls.OPEN_EXTENSION, cls.NOT_FOLLOWED_BY, not_following, cls.CLOSE_EXTENSION))
+        if cls.build_nodes:
+            _attach(
+                result,
+                nodes.concatenation(
+                    [nodes.node_of(self), nodes.lookaround(nodes.node_of(not_following), negative=True)]
+                ),
+            )
+        return result
 
     def preceded_by(self, preceding: Text_Element) -> Self:
         """
@@ -634,8 +764,13 @@ class GeneralRegexBase(AbstractRegex):
         ```
         """
         cls = type(self)
-        precedes = cls.concatenate((cls.PRECEDED_BY, preceding)).extension
-        return cls.concatenate((precedes, self))
+        result = cls._join((cls.OPEN_EXTENSION, cls.PRECEDED_BY, preceding, cls.CLOSE_EXTENSION, self))
+        if cls.build_nodes:
+            _attach(
+                result,
+                nodes.concatenation([nodes.lookaround(nodes.node_of(preceding), behind=True), nodes.node_of(self)]),
+            )
+        return result
 
     def not_preceded_by(self, not_preceding: Text_Element) -> Self:
         """
@@ -650,8 +785,15 @@ class GeneralRegexBase(AbstractRegex):
         ```
         """
         cls = type(self)
-        does_not_precede = cls.concatenate((cls.NOT_PRECEDED_BY, not_preceding)).extension
-        return cls.concatenate((does_not_precede, self))
+        result = cls._join((cls.OPEN_EXTENSION, cls.NOT_PRECEDED_BY, not_preceding, cls.CLOSE_EXTENSION, self))
+        if cls.build_nodes:
+            _attach(
+                result,
+                nodes.concatenation(
+                    [nodes.lookaround(nodes.node_of(not_preceding), behind=True, negative=True), nodes.node_of(self)]
+                ),
+            )
+        return result
 
     @classmethod
     def yes_no(cls, id_name: int | Text_Element, yes: Text_Element, no: Text_Element | None = None) -> Self:
@@ -684,18 +826,137 @@ class GeneralRegexBase(AbstractRegex):
         assert mail_re == r"(<)?(\\w+@\\w+(?:\\.\\w+)+)(?(1)>|$)"
         ```
         """
+        group_id = id_name
         id_name = cls._convert_to_bytes_or_string(id_name) if isinstance(id_name, int) else id_name
-        result = cls.concatenate((cls(id_name).unnamed, yes))
+        parts = [cls.OPEN_EXTENSION, cls.OPEN_GROUP, id_name, cls.CLOSE_GROUP, yes]
         if no is not None:
-            result += cls.concatenate((cls.OR, no))
-        return result.extension
+            parts.extend((cls.OR, no))
+        parts.append(cls.CLOSE_EXTENSION)
+        result = cls._join(parts)
+        if cls.build_nodes:
+            no_node = None if no is None else nodes.node_of(no)
+            if no is None or no_node is not None:
+                _attach(result, nodes.conditional(group_id, nodes.node_of(yes), no_node))
+        return result
+
+    @classmethod
+    def any_of(cls, words: Iterable[Text_Element]) -> Self:
+        """
+        @public
+        Returns a `StringRegex` matching any of the literal *words*. The words are escaped
+        and their common prefixes are factored out into a trie of non-capturing groups,
+        character sets and optional suffixes. Unlike a flat alternation `word1|word2|...`,
+        which the regular expression engine tries branch by branch, the trie is matched
+        in time proportional to the length of the matched word, no matter how many words
+        there are. Where several words match at the same position, the longest one wins.
+
+        ```py
+        from human_regex import StringRegex as Sre
+
+        sre = Sre.any_of(("car", "cart", "care", "cat", "dog"))
+        assert sre == "(?:ca(?:r[et]?|t)|dog)"
+        assert sre.findall("my cart, my cat and my dog") == ["cart", "cat", "dog"]
+        ```
+        """
+        end = cls.EMPTY
+        trie = {}
+        for word in words:
+            node = trie
+            for i in range(len(word)):
+                node = node.setdefault(word[i : i + 1], {})
+            node[end] = None
+        if not trie:
+            # an empty list of words matches nothing
+            return cls(cls.EMPTY).not_followed_by(cls.EMPTY)
+        regex, _ = cls._trie_to_regex(trie)
+        return regex
+
+    @classmethod
+    def scanner(
+        cls, patterns: Mapping[Hashable, Text_Element] | Iterable[Text_Element], flags: int = 0
+    ) -> "PatternSet":
+        """
+        @public
+        Combines *patterns* into a `human_regex.scanner.PatternSet`, which searches for
+        all of them in a single pass over a text and reports which pattern matched.
+        *patterns* is a mapping of pattern ids to patterns, or an iterable of patterns
+        identified by their indices.
+
+        ```py
+        from human_regex import StringRegex as Sre
+
+        scanner = Sre.scanner({"word": Sre(r"[a-z]").one_or_more, "number": Sre(r"\\d").one_or_more})
+        assert scanner.pattern == r"(?P<_hr_pattern_0>[a-z]+)|(?P<_hr_pattern_1>\\d+)"
+        found = [(m.pattern_id, m.text) for m in scanner.finditer("abc 123")]
+        assert found == [("word", "abc"), ("number", "123")]
+        ```
+        """
+        from ..scanner import PatternSet  # noqa: PLC0415 (loaded on first use)
+
+        return PatternSet(patterns, cls, flags)
+
+    @classmethod
+    def rule_index(cls, rules: Mapping[Hashable, Text_Element] | Iterable[Text_Element], flags: int = 0) -> "RuleIndex":
+        """
+        @public
+        Indexes *rules* by the literals they require in a `human_regex.rules.RuleIndex`, which
+        searches a text only for the rules whose literals it contains. *rules* is a mapping of
+        rule ids to patterns, or an iterable of patterns identified by their indices.
+
+        ```py
+        from human_regex import StringRegex as Sre
+
+        index = Sre.rule_index((Sre("disk ") + Sre(r"\\w+") + " full", Sre("out of memory")))
+        assert index.candidates("disk sda1 full") == [0]
+        assert index.matching_ids("out of memory") == {1}
+        ```
+        """
+        from ..rules import RuleIndex  # noqa: PLC0415 (loaded on first use)
+
+        return RuleIndex(rules, cls, flags)
+
+    @classmethod
+    def _trie_to_regex(cls, node: dict) -> tuple[Self, bool]:
+        """
+        Renders a trie built by `GeneralRegexBase.any_of`. Returns the expression and whether
+        it is a single atom which can be quantified without grouping it first.
+        """
+        end = cls.EMPTY
+        singles = []
+        branches = []
+        for key in sorted(key for key in node if key):
+            child = node[key]
+            literal = [re.escape(key)]
+            # collapse chains of nodes with a single child into one literal
+            while len(child) == 1 and end not in child:
+                ((next_key, child),) = child.items()
+                literal.append(re.escape(next_key))
+            if len(child) > 1:
+                rest, _ = cls._trie_to_regex(child)
+                branches.append(cls.concatenate((*literal, rest)))
+            elif len(literal) > 1:
+                branches.append(cls.concatenate(literal))
+            else:
+                singles.append(literal[0])
+        if len(singles) > 1:
+            branches.append(cls.concatenate(singles).set)
+        elif singles:
+            branches.append(cls(singles[0]))
+        if not branches:
+            return cls(end), True
+        if len(branches) > 1:
+            regex, atomic = cls(cls.OR).join(branches).no_capture, True
+        else:
+            regex, atomic = branches[0], bool(singles)
+        if end in node:
+            regex, atomic = (regex if atomic else regex.no_capture).optional, False
+        return regex, atomic
 
     @classmethod
     def _convert_to_bytes_or_string(cls, i: int) -> Text_Element:
-        i = str(i)
-        if bytes in cls.__mro__:
-            i = i.encode()
-        return i
+        if cls.TEXT_TYPE is bytes:
+            return str(i).encode()
+        return str(i)
 
     @property
     def set(self) -> Self:
@@ -711,7 +972,10 @@ class GeneralRegexBase(AbstractRegex):
         ```
         """
         cls = type(self)
-        return cls.concatenate((cls.OPEN_CHAR_SET, self, cls.CLOSE_CHAR_SET))
+        result = cls._join((cls.OPEN_CHAR_SET, self, cls.CLOSE_CHAR_SET))
+        if cls.build_nodes:
+            _attach(result, nodes.character_set(self))
+        return result
 
     @property
     def optional(self) -> Self:
@@ -728,7 +992,10 @@ class GeneralRegexBase(AbstractRegex):
         ```
         """
         cls = type(self)
-        return cls.concatenate((self, cls.OPTIONAL))
+        result = cls._join((self, cls.OPTIONAL))
+        if cls.build_nodes:
+            _attach(result, nodes.quantified(nodes.node_of(self), 0, 1, "?"))
+        return result
 
     @property
     def zero_or_more(self) -> Self:
@@ -745,7 +1012,10 @@ class GeneralRegexBase(AbstractRegex):
         ```
         """
         cls = type(self)
-        return cls.concatenate((self, cls.ZERO_OR_MORE))
+        result = cls._join((self, cls.ZERO_OR_MORE))
+        if cls.build_nodes:
+            _attach(result, nodes.quantified(nodes.node_of(self), 0, None, "*"))
+        return result
 
     @property
     def one_or_more(self) -> Self:
@@ -762,7 +1032,10 @@ class GeneralRegexBase(AbstractRegex):
         ```
         """
         cls = type(self)
-        return cls.concatenate((self, cls.ONE_OR_MORE))
+        result = cls._join((self, cls.ONE_OR_MORE))
+        if cls.build_nodes:
+            _attach(result, nodes.quantified(nodes.node_of(self), 1, None, "+"))
+        return result
 
     @property
     def lazy(self) -> Self:
@@ -782,7 +1055,10 @@ class GeneralRegexBase(AbstractRegex):
         ```
         """
         cls = type(self)
-        return cls.concatenate((self, cls.LAZY))
+        result = cls._join((self, cls.LAZY))
+        if cls.build_nodes:
+            _attach(result, nodes.quantified(nodes.node_of(self), 0, 1, "?"))
+        return result
 
     def repeat(self, minimum, maximum, /) -> Self:
         """
@@ -802,11 +1078,19 @@ class GeneralRegexBase(AbstractRegex):
         ```
         """
         cls = type(self)
-        minimum = cls._convert_to_bytes_or_string(minimum) if minimum is not None else cls.EMPTY
-        maximum = cls._convert_to_bytes_or_string(maximum) if maximum is not None else cls.EMPTY
-        return cls.concatenate(
-            (self, cls.OPEN_QUANTIFIER, minimum, cls.QUANTIFIER_SEPARATOR, maximum, cls.CLOSE_QUANTIFIER)
+        result = cls._join(
+            (
+                self,
+                cls.OPEN_QUANTIFIER,
+                cls._convert_to_bytes_or_string(minimum) if minimum is not None else cls.EMPTY,
+                cls.QUANTIFIER_SEPARATOR,
+                cls._convert_to_bytes_or_string(maximum) if maximum is not None else cls.EMPTY,
+                cls.CLOSE_QUANTIFIER,
+            )
         )
+        if cls.build_nodes and (minimum is None or maximum is None or minimum <= maximum):
+            _attach(result, nodes.quantified(nodes.node_of(self), minimum or 0, maximum))
+        return result
 
     def exactly(self, number: int) -> Self:
         """
@@ -821,5 +1105,28 @@ class GeneralRegexBase(AbstractRegex):
         ```
         """
         cls = type(self)
-        number = cls._convert_to_bytes_or_string(number) if number else cls.EMPTY
-        return cls.concatenate((self, cls.OPEN_QUANTIFIER, number, cls.CLOSE_QUANTIFIER))
+        text = cls._convert_to_bytes_or_string(number) if number else cls.EMPTY
+        result = cls._join((self, cls.OPEN_QUANTIFIER, text, cls.CLOSE_QUANTIFIER))
+        if cls.build_nodes and number:
+            _attach(result, nodes.quantified(nodes.node_of(self), number, number))
+        return result
+
+
+def _attach(result: GeneralRegexBase, node: "nodes.Node | None") -> None:
+    """
+    @private
+    Stores *node* as the node of *result*. If it is None, the node will be parsed from the text when needed.
+    """
+    if node is not None:
+        result.__dict__["_node"] = node
+
+
+def _rendered(elements: Iterable) -> list[Text_Element]:
+    """
+    @private
+    *elements* with the deferred expressions among them rendered.
+    """
+    return [
+        element.render() if isinstance(element, GeneralRegexBase) and not isinstance(element, str | bytes) else element
+        for element in elements
+    ]
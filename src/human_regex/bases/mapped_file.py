@@ -0,0 +1,115 @@
+"""
+Searching files through memory mapping, for `human_regex.BytesRegex`.
+"""
+
+import mmap
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from ..matches import DetachedMatch
+
+
+def map_file(path: str | os.PathLike) -> mmap.mmap | bytes:
+    """
+    @private
+    Maps the file at *path* into memory for reading. Empty files cannot be mapped,
+    for them an empty `bytes` object is returned.
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return b""
+        # the mapping keeps its own handle of the file, which is closed with the mapping
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+@contextmanager
+def mapped_file(path: str | os.PathLike) -> Iterator[mmap.mmap | bytes]:
+    """
+    Maps the file at *path* into memory for reading within a `with` block, and closes the
+    mapping at its end. Matches and memoryviews of the mapping must not be used after that.
+    """
+    mapped = map_file(path)
+    try:
+        yield mapped
+    finally:
+        if isinstance(mapped, mmap.mmap):
+            mapped.close()
+
+
+class MappedFileSearch:
+    """
+    Methods of `human_regex.BytesRegex` which run the compiled pattern directly over
+    a memory-mapped file. The file is neither read nor copied, so it can be larger than
+    the available memory. The matches are `human_regex.matches.DetachedMatch` objects,
+    which keep only the matched bytes. Their positions are offsets in the file.
+    The memory map is closed as soon as the search is over, rather than whenever it is
+    garbage collected (which is not deterministic on PyPy).
+
+    ```py
+    import tempfile
+
+    from human_regex import BytesRegex as Bre
+
+    with tempfile.NamedTemporaryFile(delete=False) as file:
+        file.write(bytes(1000) + b"MAGIC" + bytes(1000) + b"MAGIC")
+
+    magic = Bre(b"MAGIC")
+    assert magic.search_file(file.name).start() == 1000
+    assert [m.start() for m in magic.finditer_file(file.name)] == [1000, 2005]
+
+    # run any proxied function over the mapped file
+    with Bre.mapped_file(file.name) as data:
+        assert magic.findall(data) == [b"MAGIC", b"MAGIC"]
+    ```
+    """
+
+    __slots__ = ()
+
+    mapped_file = staticmethod(mapped_file)
+
+    def search_file(self, path: str | os.PathLike, flags: int = 0) -> DetachedMatch | None:
+        """
+        Like search, but scans the file at *path* through a memory map.
+        """
+        with mapped_file(path) as mapped:
+            if self.prefilter and self._absent(mapped, flags):
+                return None
+            match = self.compile(flags).search(mapped)
+            return None if match is None else DetachedMatch.from_match(match).compact()
+
+    def finditer_file(
+        self, path: str | os.PathLike, flags: int = 0, *, memoryviews: bool = False
+    ) -> Iterator[DetachedMatch] | Iterator[tuple[DetachedMatch, memoryview]]:
+        """
+        Like finditer, but scans the file at *path* through a memory map, which is closed
+        when the iteration ends. With *memoryviews*, pairs of each match and a zero-copy
+        `memoryview` of the matched part of the file are yielded. The memoryviews keep the
+        mapping open until they are released; use `mapped_file` to control its lifetime then.
+        """
+        if memoryviews:
+            mapped = map_file(path)
+            view = memoryview(mapped)
+            return (
+                (DetachedMatch.from_match(match).compact(), view[match.start() : match.end()])
+                for match in self.compile(flags).finditer(mapped)
+            )
+        literal = self._prefilter_literal(flags) if self.prefilter else None
+        return _finditer_mapped(self.compile(flags), path, literal)
+
+
+def _finditer_mapped(compiled, path: str | os.PathLike, literal: bytes | None = None) -> Iterator[DetachedMatch]:
+    mapped = map_file(path)
+    if literal is not None and mapped.find(literal) == -1:
+        if isinstance(mapped, mmap.mmap):
+            mapped.close()
+        return
+    scanner = compiled.finditer(mapped)
+    try:
+        for match in scanner:
+            yield DetachedMatch.from_match(match).compact()
+    finally:
+        # the scanner holds a buffer of the mapping, which cannot be closed while it is exported
+        del scanner
+        if isinstance(mapped, mmap.mmap):
+            mapped.close()
@@ -1,43 +1,472 @@
 import re
 
-from ..utilities import create_class_property, make_re_proxy_function
-
-re_flags = {
-    "A": re.A,
-    "ASCII": re.ASCII,
-    "DEBUG": re.DEBUG,
-    "I": re.I,
-    "IGNORECASE": re.IGNORECASE,
-    "L": re.L,
-    "LOCALE": re.LOCALE,
-    "M": re.M,
-    "MULTILINE": re.MULTILINE,
-    "NOFLAG": re.NOFLAG,
-    "S": re.S,
-    "DOTALL": re.DOTALL,
-    "U": re.U,
-    "UNICODE": re.UNICODE,
-    "X": re.X,
-    "VERBOSE": re.VERBOSE,
-}
-
-re_proxy_class_dict = {k: create_class_property(v, encoding=None) for k, v in re_flags.items()}
-
-re_functions = [
-    re.compile,
-    re.search,
-    re.match,
-    re.fullmatch,
-    re.split,
-    re.findall,
-    re.finditer,
-    re.sub,
-    re.subn,
-    re.escape,
-    re.purge,
-]
-
-re_proxy_class_dict.update({f.__name__: make_re_proxy_function(f) for f in re_functions})
-re_proxy_class_dict.update({"RegexFlag": re.RegexFlag})
-
-ReProxy = type("ReProxy", (), re_proxy_class_dict)
+from ..instrumentation import instrumented_call, instrumented_compile, listeners
+from ..registry import default_registry, make_key
+from ..streaming import DEFAULT_CHUNK_SIZE, DEFAULT_MAX_MATCH_LEN, DEFAULT_OFFLOAD_THRESHOLD
+from ..streaming import afinditer as _afinditer
+from ..streaming import finditer_stream as _finditer_stream
+
+
+class ReProxy:
+    """
+    Methods of `human_regex.StringRegex` and `human_regex.BytesRegex` which proxy the functions
+    of `re`, passing the instance as the pattern. The functions which match take an *engine*
+    keyword argument to run on another matching engine, see `human_regex.engines`.
+    """
+
+    # no __slots__, the instances keep the registry keys of their compiled patterns in their __dict__
+
+    A = re.A
+    ASCII = re.ASCII
+    DEBUG = re.DEBUG
+    I = re.I  # noqa: E741
+    IGNORECASE = re.IGNORECASE
+    L = re.L
+    LOCALE = re.LOCALE
+    M = re.M
+    MULTILINE = re.MULTILINE
+    NOFLAG = re.NOFLAG
+    S = re.S
+    DOTALL = re.DOTALL
+    U = re.U
+    UNICODE = re.UNICODE
+    X = re.X
+    VERBOSE = re.VERBOSE
+    RegexFlag = re.RegexFlag
+
+    # Proxied calls are dispatched to the methods of a compiled pattern memoized
+    # on the instance. Set to False on a class or an instance to opt out and
+    # let the module-level functions of `re` do the work instead.
+    cache_patterns = True
+    # Source of the compiled patterns, see `human_regex.registry`.
+    pattern_registry = default_registry
+    # Before search, findall and finditer scan a text, look for a literal every match
+    # contains with str.find or bytes.find, see `human_regex.literals`. Set to False
+    # on a class or an instance to always run the regular expression.
+    prefilter = True
+    # Matching engine the proxied functions run on, given by its name or as an object,
+    # see `human_regex.engines`. None runs them on `re` through the *pattern_registry*.
+    engine = None
+
+    def _compiled(self, flags=0):
+        """
+        Returns the compiled `re.Pattern` of *self* for *flags* from the *pattern_registry*.
+        The instance only remembers the registry keys, so the registry stays the only owner
+        of the compiled patterns and sees every use of them.
+        """
+        keys = self.__dict__.get("_pattern_keys")
+        if keys is None:
+            keys = self.__dict__["_pattern_keys"] = {}
+        key = keys.get(flags)
+        if key is None:
+            key = keys[flags] = make_key(self, flags)
+        return self.pattern_registry.compile_key(key)
+
+    def compile(self, flags=0, *, engine=None):
+        """
+        Proxy for re.compile
+        Compile a regular expression pattern, returning a Pattern object.
+
+        Unless *cache_patterns* is disabled, the compiled pattern is taken from the
+        *pattern_registry*, so repeated calls with the same *flags* return the identical
+        `re.Pattern` object as long as the registry keeps it. With an *engine* (by default
+        the *engine* of the instance), the pattern is compiled by it, see `human_regex.engines`.
+        """
+        engine = engine or self.engine
+        if engine is not None:
+            return self._engine_compiled(engine, flags)
+        if not self.cache_patterns:
+            if listeners:
+                return instrumented_compile(self, flags)
+            return re.compile(self, flags)
+        return self._compiled(flags)
+
+    def required_literals(self, flags=0):
+        """
+        Returns the literal substrings which every match of *self* compiled with *flags* contains,
+        longest first. See `human_regex.literals`.
+        """
+        from ..literals import required_literals  # noqa: PLC0415 (loaded on first use)
+
+        return required_literals(self, flags)
+
+    def _prefilter_literal(self, flags):
+        """
+        Returns the literal the prefilter looks for in texts scanned with *flags*, or None.
+        The literal is remembered on the instance, like the registry keys.
+        """
+        literals = self.__dict__.get("_prefilter_literals")
+        if literals is None:
+            literals = self.__dict__["_prefilter_literals"] = {}
+        try:
+            return literals[flags]
+        except KeyError:
+            from ..literals import prefilter_literal  # noqa: PLC0415 (loaded on first use)
+
+            literal = literals[flags] = prefilter_literal(self, flags)
+            return literal
+
+    def _absent(self, string, flags):
+        """
+        Tells whether the literal of the prefilter is certainly not in *string*, so *self* cannot match it.
+        """
+        literal = self._prefilter_literal(flags)
+        if literal is None:
+            return False
+        try:
+            return string.find(literal) == -1
+        except (AttributeError, TypeError):
+            # a text without a find method, like a memoryview
+            return False
+
+    def _engine_compiled(self, engine, flags):
+        """
+        Returns *self* compiled with *flags* by *engine*. The `re` engine takes it from the *pattern_registry*.
+        """
+        from ..engines import ReEngine, get_engine  # noqa: PLC0415 (loaded on first use)
+
+        engine = get_engine(engine)
+        if type(engine) is ReEngine and self.cache_patterns:
+            return self._compiled(flags)
+        return engine.compiled(self, flags)
+
+    def _engine_call(self, engine, name, flags, args, size_position=0):
+        """
+        Calls the method *name* of the pattern compiled by *engine* with *args*, see `human_regex.engines`.
+        """
+        from ..engines import get_engine  # noqa: PLC0415 (loaded on first use)
+
+        engine = get_engine(engine)
+        if engine.prefilter and self.prefilter and name in {"search", "findall", "finditer"}:
+            if self._absent(args[0], flags):
+                return None if name == "search" else [] if name == "findall" else iter(())
+        compiled = self._engine_compiled(engine, flags)
+        if listeners:
+            method = getattr(type(compiled), name)
+            return instrumented_call(method, compiled, name, self, flags, args=args, size_position=size_position)
+        return getattr(compiled, name)(*args)
+
+    def _instrumented(self, name, flags, args, size_position=0):
+        """
+        Calls the method *name* of the compiled pattern with *args* and reports the call to the listeners,
+        see `human_regex.instrumentation`.
+        """
+        compiled = self._compiled(flags) if self.cache_patterns else instrumented_compile(self, flags)
+        return instrumented_call(
+            getattr(re.Pattern, name), compiled, name, self, flags, args=args, size_position=size_position
+        )
+
+    def search(self, string, flags=0, *, engine=None):
+        """
+        Proxy for re.search
+        Scan through string looking for a match to the pattern, returning
+        a Match object, or None if no match was found.
+        """
+        engine = engine or self.engine
+        if engine is not None:
+            return self._engine_call(engine, "search", flags, (string,))
+        if self.prefilter and self._absent(string, flags):
+            return None
+        if listeners:
+            return self._instrumented("search", flags, (string,))
+        if not self.cache_patterns:
+            return re.search(self, string, flags)
+        return self._compiled(flags).search(string)
+
+    def match(self, string, flags=0, *, engine=None):
+        """
+        Proxy for re.match
+        Try to apply the pattern at the start of the string, returning
+        a Match object, or None if no match was found.
+        """
+        engine = engine or self.engine
+        if engine is not None:
+            return self._engine_call(engine, "match", flags, (string,))
+        if listeners:
+            return self._instrumented("match", flags, (string,))
+        if not self.cache_patterns:
+            return re.match(self, string, flags)
+        return self._compiled(flags).match(string)
+
+    def fullmatch(self, string, flags=0, *, engine=None):
+        """
+        Proxy for re.fullmatch
+        Try to apply the pattern to all of the string, returning
+        a Match object, or None if no match was found.
+        """
+        engine = engine or self.engine
+        if engine is not None:
+            return self._engine_call(engine, "fullmatch", flags, (string,))
+        if listeners:
+            return self._instrumented("fullmatch", flags, (string,))
+        if not self.cache_patterns:
+            return re.fullmatch(self, string, flags)
+        return self._compiled(flags).fullmatch(string)
+
+    def split(self, string, maxsplit=0, flags=0, *, engine=None):
+        """
+        Proxy for re.split
+        Split the source string by the occurrences of the pattern,
+        returning a list containing the resulting substrings.  If
+        capturing parentheses are used in pattern, then the text of all
+        groups in the pattern are also returned as part of the resulting
+        list.  If maxsplit is nonzero, at most maxsplit splits occur,
+        and the remainder of the string is returned as the final element
+        of the list.
+        """
+        engine = engine or self.engine
+        if engine is not None:
+            return self._engine_call(engine, "split", flags, (string, maxsplit))
+        if listeners:
+            return self._instrumented("split", flags, (string, maxsplit))
+        if not self.cache_patterns:
+            return re.split(self, string, maxsplit=maxsplit, flags=flags)
+        return self._compiled(flags).split(string, maxsplit)
+
+    def findall(self, string, flags=0, *, engine=None):
+        """
+        Proxy for re.findall
+        Return a list of all non-overlapping matches in the string.
+
+        If one or more capturing groups are present in the pattern, return
+        a list of groups; this will be a list of tuples if the pattern
+        has more than one group.
+
+        Empty matches are included in the result.
+        """
+        engine = engine or self.engine
+        if engine is not None:
+            return self._engine_call(engine, "findall", flags, (string,))
+        if self.prefilter and self._absent(string, flags):
+            return []
+        if listeners:
+            return self._instrumented("findall", flags, (string,))
+        if not self.cache_patterns:
+            return re.findall(self, string, flags)
+        return self._compiled(flags).findall(string)
+
+    def finditer(self, string, flags=0, *, engine=None):
+        """
+        Proxy for re.finditer
+        Return an iterator over all non-overlapping matches in the
+        string.  For each match, the iterator returns a Match object.
+
+        Empty matches are included in the result.
+        """
+        engine = engine or self.engine
+        if engine is not None:
+            return self._engine_call(engine, "finditer", flags, (string,))
+        if self.prefilter and self._absent(string, flags):
+            return iter(())
+        if listeners:
+            return self._instrumented("finditer", flags, (string,))
+        if not self.cache_patterns:
+            return re.finditer(self, string, flags)
+        return self._compiled(flags).finditer(string)
+
+    def sub(self, repl, string, count=0, flags=0, *, engine=None):
+        """
+        Proxy for re.sub
+        Return the string obtained by replacing the leftmost
+        non-overlapping occurrences of the pattern in string by the
+        replacement repl.  repl can be either a string or a callable;
+        if a string, backslash escapes in it are processed.  If it is
+        a callable, it's passed the Match object and must return
+        a replacement string to be used.
+        """
+        engine = engine or self.engine
+        if engine is not None:
+            return self._engine_call(engine, "sub", flags, (repl, string, count), 1)
+        if listeners:
+            return self._instrumented("sub", flags, (repl, string, count), 1)
+        if not self.cache_patterns:
+            return re.sub(self, repl, string, count=count, flags=flags)
+        return self._compiled(flags).sub(repl, string, count)
+
+    def subn(self, repl, string, count=0, flags=0, *, engine=None):
+        """
+        Proxy for re.subn
+        Return a 2-tuple containing (new_string, number).
+        new_string is the string obtained by replacing the leftmost
+        non-overlapping occurrences of the pattern in the source
+        string by the replacement repl.  number is the number of
+        substitutions that were made. repl can be either a string or a
+        callable; if a string, backslash escapes in it are processed.
+        If it is a callable, it's passed the Match object and must
+        return a replacement string to be used.
+        """
+        engine = engine or self.engine
+        if engine is not None:
+            return self._engine_call(engine, "subn", flags, (repl, string, count), 1)
+        if listeners:
+            return self._instrumented("subn", flags, (repl, string, count), 1)
+        if not self.cache_patterns:
+            return re.subn(self, repl, string, count=count, flags=flags)
+        return self._compiled(flags).subn(repl, string, count)
+
+    def escape(self):
+        """
+        Proxy for re.escape
+        Escape special characters in a string.
+        """
+        return re.escape(self)
+
+    @property
+    def cached_patterns(self):
+        """
+        A snapshot of the compiled patterns of this instance which are still in the registry, keyed by their flags.
+        """
+        patterns = {}
+        for flags, (pattern, key_flags) in self.__dict__.get("_pattern_keys", {}).items():
+            compiled = self.pattern_registry.get(pattern, key_flags)
+            if compiled is not None:
+                patterns[flags] = compiled
+        return patterns
+
+    @classmethod
+    def purge(cls):
+        """
+        Proxy for re.purge
+        Clear the regular expression caches: the unpinned patterns of the *pattern_registry*
+        as well as the internal cache of `re`.
+        """
+        cls.pattern_registry.clear()
+        re.purge()
+
+    def clear_cached_patterns(self):
+        """
+        Forgets which compiled patterns this instance used. The patterns stay in the registry.
+        """
+        self.__dict__.pop("_pattern_keys", None)
+
+    def finditer_stream(self, source, flags=0, *, max_match_len=DEFAULT_MAX_MATCH_LEN, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Like finditer, but reads the text from *source* chunk by chunk rather than taking it in memory.
+        *source* is a file object opened for reading (in text mode for `StringRegex`, in binary mode
+        for `BytesRegex`) or an iterable of chunks. Matches spanning the boundaries of chunks are found,
+        as long as they are not longer than *max_match_len*. The positions of the yielded
+        `human_regex.matches.DetachedMatch` objects are offsets in the whole stream.
+        See `human_regex.streaming`.
+        """
+        return _finditer_stream(self.compile(flags), source, max_match_len, chunk_size)
+
+    def afinditer(
+        self,
+        source,
+        flags=0,
+        *,
+        max_match_len=DEFAULT_MAX_MATCH_LEN,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        encoding=None,
+        offload_threshold=DEFAULT_OFFLOAD_THRESHOLD,
+    ):
+        """
+        Asynchronous counterpart of finditer_stream for use with `async for`. *source* is
+        an `asyncio.StreamReader` (or another object with a coroutine method `read`) or an
+        asynchronous iterable of chunks. Large chunks are scanned in a thread executor,
+        so the event loop is not blocked. See `human_regex.streaming.afinditer`.
+        """
+        return _afinditer(
+            self.compile(flags),
+            source,
+            max_match_len,
+            chunk_size,
+            encoding=encoding,
+            offload_threshold=offload_threshold,
+        )
+
+    def grep(
+        self, source, mode="lines", flags=0, *, line_numbers=False, offsets=False, block_size=1 << 20, encoding="utf-8"
+    ):
+        """
+        Finds the lines of *source*, a path or a file object, which match *self*, like `grep`.
+        *mode* is `"lines"` for an iterator of the matching lines, `"count"` for their number,
+        `"first"` for the first one and `"files-with-matches"` for whether there is one.
+        With *line_numbers* and *offsets*, the lines come with their numbers and positions.
+        Files given by their paths are read in blocks of *block_size*, as text in *encoding*
+        for `StringRegex`. See `human_regex.grep`.
+        """
+        from ..grep import grep  # noqa: PLC0415 (loaded on first use)
+
+        return grep(
+            self,
+            source,
+            mode,
+            flags,
+            line_numbers=line_numbers,
+            offsets=offsets,
+            block_size=block_size,
+            encoding=encoding,
+        )
+
+    def search_many(
+        self, items, flags=0, *, method="findall", workers=None, executor="process", ordered=True, **kwargs
+    ):
+        """
+        Runs the proxied *method* (findall by default) over many files or texts in a pool
+        of *workers* processes or threads, depending on *executor*. See `human_regex.parallel.search_many`.
+        """
+        # imported on use, so importing human_regex does not import multiprocessing
+        from ..parallel import search_many  # noqa: PLC0415 (loaded on first use)
+
+        return search_many(
+            self, items, flags, method=method, workers=workers, executor=executor, ordered=ordered, **kwargs
+        )
+
+    def match_all(self, items, flags=0, *, method="match", numpy=False):
+        """
+        Tells for each of *items* whether *self* matches it, using the match, search or fullmatch
+        *method*. Returns an `array.array` of 1 and 0 bytes, or a boolean NumPy array with *numpy*.
+        See `human_regex.batch`.
+        """
+        from .. import batch  # noqa: PLC0415 (loaded on first use)
+
+        return batch.match_all(self.compile(flags), items, method, numpy=numpy)
+
+    def sub_all(self, items, repl, count=0, flags=0):
+        """
+        Like sub, applied to each of *items*. Returns the list of the results.
+        """
+        from .. import batch  # noqa: PLC0415 (loaded on first use)
+
+        return batch.sub_all(self.compile(flags), items, repl, count)
+
+    def extract(self, items, groups=None, flags=0, *, method="search"):
+        """
+        Returns a column of values for each of *groups* (by default the named groups of *self*),
+        taken from the matches of *self* in each of *items*. See `human_regex.batch.extract`.
+        """
+        from .. import batch  # noqa: PLC0415 (loaded on first use)
+
+        return batch.extract(self.compile(flags), items, groups, method)
+
+    def backtracking_risks(self, flags=0):
+        """
+        Returns the constructs of *self* which may backtrack catastrophically, with suggested rewrites.
+        See `human_regex.backtracking`.
+        """
+        from ..backtracking import analyze  # noqa: PLC0415 (loaded on first use)
+
+        return analyze(self, flags)
+
+    def guarded(self, timeout):
+        """
+        Returns a `human_regex.backtracking.TimeoutGuard`, whose proxied calls run in a worker process
+        and raise `human_regex.backtracking.RegexTimeoutError` after *timeout* seconds.
+        """
+        from ..backtracking import TimeoutGuard  # noqa: PLC0415 (loaded on first use)
+
+        return TimeoutGuard(self, timeout)
+
+    def optimize(self, flags=0):
+        """
+        Returns an equivalent, but simpler expression of the same class as *self*,
+        meant to be compiled with *flags*. See `human_regex.optimizer`.
+        """
+        from ..optimizer import optimize  # noqa: PLC0415 (loaded on first use)
+
+        return type(self)(optimize(self, flags))
+
+    def __reduce__(self):
+        # pickle just the text, not the registry keys remembered by the instance
+        return type(self), (str(self) if isinstance(self, str) else bytes(self),)
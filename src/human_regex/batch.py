@@ -0,0 +1,103 @@
+"""
+Applying one pattern to many strings at once.
+
+The functions here compile the pattern once, bind the method of the compiled pattern once
+and collect the results in compact columns, rather than calling a proxied function per item:
+
+```py
+from human_regex import StringRegex as Sre
+
+word = Sre(r"\\w").one_or_more
+pair = word.named("key") + "=" + word.named("value")
+rows = ["a=1", "no pair", "b=2"]
+
+assert list(pair.match_all(rows)) == [1, 0, 1]
+assert pair.extract(rows) == {"key": ["a", None, "b"], "value": ["1", None, "2"]}
+assert pair.sub_all(rows, r"\\g<value>=\\g<key>") == ["1=a", "no pair", "2=b"]
+```
+"""
+
+import re
+from array import array
+from collections.abc import Iterable, Sequence
+
+Text_Element = str | bytes
+"""
+@private
+"""
+
+MATCH_METHODS = ("match", "search", "fullmatch")
+"""
+@private
+"""
+
+
+def _method(pattern: re.Pattern, method: str):
+    if method not in MATCH_METHODS:
+        msg = f"method must be one of {', '.join(MATCH_METHODS)}"
+        raise ValueError(msg)
+    return getattr(pattern, method)
+
+
+def match_all(pattern: re.Pattern, items: Iterable[Text_Element], method: str = "match", *, numpy: bool = False):
+    """
+    Returns a mask telling for each of *items* whether the compiled *pattern* matches it
+    using *method*: an `array.array` of bytes which are 1 or 0, or a boolean NumPy array with *numpy*.
+    """
+    find = _method(pattern, method)
+    mask = (find(item) is not None for item in items)
+    if numpy:
+        try:
+            import numpy as np  # noqa: PLC0415 (optional dependency)
+        except ImportError as e:
+            msg = "numpy=True requires NumPy to be installed"
+            raise ImportError(msg) from e
+        return np.fromiter(mask, dtype=bool)
+    return array("B", mask)
+
+
+def sub_all(pattern: re.Pattern, items: Iterable[Text_Element], repl, count: int = 0) -> list[Text_Element]:
+    """
+    Returns the list of *items* with the matches of the compiled *pattern* replaced by *repl*.
+    """
+    sub = pattern.sub
+    return [sub(repl, item, count) for item in items]
+
+
+def extract(
+    pattern: re.Pattern,
+    items: Iterable[Text_Element],
+    groups: Sequence[int | str] | None = None,
+    method: str = "search",
+) -> dict[int | str, list[Text_Element | None]]:
+    """
+    Matches the compiled *pattern* against each of *items* using *method* and returns columns
+    of the values of *groups*, one list per group, labeled by the group names or numbers.
+    Items which do not match have `None` in every column.
+
+    By default, the columns are the named groups of the pattern. A pattern without named groups
+    yields a column for each numbered group, a pattern without any groups the column `0` with the
+    whole matches.
+    """
+    find = _method(pattern, method)
+    if groups is None:
+        if pattern.groupindex:
+            groups = sorted(pattern.groupindex, key=pattern.groupindex.get)
+        else:
+            groups = range(1, pattern.groups + 1) if pattern.groups else (0,)
+    groups = tuple(groups)
+    columns = tuple([] for _ in groups)
+    appenders = tuple(column.append for column in columns)
+    if len(groups) == 1:
+        (append,) = appenders
+        (group,) = groups
+        for item in items:
+            found = find(item)
+            append(None if found is None else found.group(group))
+    else:
+        for item in items:
+            found = find(item)
+            values = (None,) * len(groups) if found is None else found.group(*groups)
+            for append, value in zip(appenders, values, strict=True):
+                append(value)
+    return dict(zip(groups, columns, strict=True))
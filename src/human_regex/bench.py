@@ -0,0 +1,233 @@
+"""
+Benchmarks of the combinators and of the proxied `re` functions.
+
+Run them with `python -m human_regex.bench` (or `hatch run bench`). The results are printed
+as a table and, with `--output`, written to a JSON file, so they can be compared between releases:
+
+```sh
+python -m human_regex.bench --output bench.json
+python -m human_regex.bench --filter proxy --repeat 7
+```
+
+Each benchmark reports the time per call in nanoseconds: the best and the median of *repeat*
+runs of *number* calls each. The `op` group compares single combinators with joining
+the same text with `str.join`, the `build` group times long chains of combinators and the `proxy`
+group compares the proxied functions with the methods of `re.Pattern`, and a search with
+and without the literal prefilter of `human_regex.literals`.
+"""
+
+import argparse
+import json
+import platform
+import re
+import statistics
+import sys
+import timeit
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime
+
+from . import BytesRegex, StringRegex
+from .__about__ import __version__
+
+Benchmark = tuple[str, str, Callable[[], object]]
+"""
+@private
+Group, name and the benchmarked callable.
+"""
+
+TEXT = "The quick brown fox jumps over the lazy dog 12345 times. " * 20
+"""
+@private
+"""
+
+
+def builder_benchmarks(regex_class: type, depth: int) -> Iterator[Benchmark]:
+    """
+    @private
+    Building deep chains of combinators.
+    """
+    flavor = regex_class.__name__
+    encode = str.encode if isinstance(regex_class.EMPTY, bytes) else str
+    digit = regex_class(encode(r"\d"))
+    names = [encode(f"group{i}") for i in range(depth)]
+    pieces = [encode(f"piece{i}") for i in range(depth)]
+
+    def named_chain():
+        regex = digit
+        for name in names:
+            regex = regex.named(name)
+        return regex
+
+    def repeat_chain():
+        regex = digit
+        for _ in range(depth):
+            regex = regex.repeat(1, 3).no_capture
+        return regex
+
+    def join_many():
+        return regex_class(regex_class.OR).join(pieces)
+
+    def yes_no_chain():
+        regex = digit
+        for _ in range(depth):
+            regex = regex_class.yes_no(1, regex, digit)
+        return regex
+
+    def deferred_named_chain():
+        regex = digit.deferred
+        for name in names:
+            regex = regex.named(name)
+        return regex.render()
+
+    yield "build", f"{flavor}.named x{depth}", named_chain
+    yield "build", f"{flavor}.repeat x{depth}", repeat_chain
+    yield "build", f"{flavor}.join of {depth}", join_many
+    yield "build", f"{flavor}.yes_no x{depth}", yes_no_chain
+    yield "build", f"{flavor}.deferred.named x{depth}", deferred_named_chain
+
+
+def combinator_benchmarks(regex_class: type) -> Iterator[Benchmark]:
+    """
+    @private
+    Cost of single combinators compared with joining the same text with `str.join` or `bytes.join`.
+    """
+    flavor = regex_class.__name__
+    encode = str.encode if isinstance(regex_class.EMPTY, bytes) else str
+    empty = encode("")
+    regex = regex_class(encode(r"\d+"))
+    plain = encode(r"\d+")
+    name, other, one, three = encode("number"), encode("x"), encode("1"), encode("3")
+    open_name, close_name, close = encode("(?P<"), encode(">"), encode(")")
+    open_lookahead, open_condition, bar = encode("(?="), encode("(?("), encode("|")
+    open_quantifier, comma, close_quantifier = encode("{"), encode(","), encode("}")
+    for operation, combinator, joined in (
+        ("+", lambda: regex + other, lambda: empty.join((plain, other))),
+        ("named", lambda: regex.named(name), lambda: empty.join((open_name, name, close_name, plain, close))),
+        ("followed_by", lambda: regex.followed_by(other), lambda: empty.join((plain, open_lookahead, other, close))),
+        (
+            "yes_no",
+            lambda: regex_class.yes_no(1, regex, other),
+            lambda: empty.join((open_condition, one, close, plain, bar, other, close)),
+        ),
+        (
+            "repeat",
+            lambda: regex.repeat(1, 3),
+            lambda: empty.join((plain, open_quantifier, one, comma, three, close_quantifier)),
+        ),
+        ("join", lambda: regex.join((other, other, other)), lambda: plain.join((other, other, other))),
+    ):
+        yield "op", f"{flavor}.{operation}", combinator
+        yield "op", f"{type(empty).__name__}.join for {operation} ({flavor})", joined
+
+
+def proxy_benchmarks(regex_class: type) -> Iterator[Benchmark]:
+    """
+    @private
+    Per-call overhead of the proxied functions compared with the methods of `re.Pattern`.
+    """
+    flavor = regex_class.__name__
+    is_bytes = isinstance(regex_class.EMPTY, bytes)
+    text = TEXT.encode() if is_bytes else TEXT
+    regex = regex_class(rb"(?P<number>\d+)" if is_bytes else r"(?P<number>\d+)")
+    compiled = re.compile(regex)
+    repl = b"#" if is_bytes else "#"
+    uncached = regex_class(regex)
+    uncached.cache_patterns = False
+    for name, proxied, raw in (
+        ("search", lambda: regex.search(text), lambda: compiled.search(text)),
+        ("match", lambda: regex.match(text), lambda: compiled.match(text)),
+        ("findall", lambda: regex.findall(text), lambda: compiled.findall(text)),
+        ("sub", lambda: regex.sub(repl, text), lambda: compiled.sub(repl, text)),
+    ):
+        yield "proxy", f"{flavor}.{name}", proxied
+        yield "proxy", f"re.Pattern.{name} ({flavor})", raw
+    yield "proxy", f"{flavor}.search without pattern cache", lambda: uncached.search(text)
+    yield "proxy", f"re.search ({flavor})", lambda: re.search(regex, text)
+    # a literal which is not in the text, found missing by the prefilter
+    absent = regex + (b" kilograms" if is_bytes else " kilograms")
+    unfiltered = regex_class(absent)
+    unfiltered.prefilter = False
+    yield "proxy", f"{flavor}.search for an absent literal", lambda: absent.search(text)
+    yield "proxy", f"{flavor}.search for an absent literal without prefilter", lambda: unfiltered.search(text)
+
+
+def all_benchmarks(depth: int) -> Iterator[Benchmark]:
+    """
+    @private
+    """
+    for regex_class in (StringRegex, BytesRegex):
+        yield from combinator_benchmarks(regex_class)
+    for regex_class in (StringRegex, BytesRegex):
+        yield from builder_benchmarks(regex_class, depth)
+    for regex_class in (StringRegex, BytesRegex):
+        yield from proxy_benchmarks(regex_class)
+
+
+def run(
+    benchmarks: Iterator[Benchmark], number: int | None = None, repeat: int = 5, name_filter: str = ""
+) -> list[dict]:
+    """
+    Times *benchmarks* and returns a result record for each of them. Without *number*,
+    it is chosen so that one run takes at least 0.1 seconds.
+    """
+    results = []
+    for group, name, function in benchmarks:
+        if name_filter not in f"{group} {name}":
+            continue
+        timer = timeit.Timer(function)
+        calls = number or timer.autorange()[0]
+        times = [total / calls * 1e9 for total in timer.repeat(repeat=repeat, number=calls)]
+        results.append(
+            {
+                "group": group,
+                "name": name,
+                "number": calls,
+                "repeat": repeat,
+                "best_ns": min(times),
+                "median_ns": statistics.median(times),
+            }
+        )
+    return results
+
+
+def report(results: list[dict]) -> dict:
+    """
+    Wraps *results* with information about the environment they were measured in.
+    """
+    return {
+        "human_regex": __version__,
+        "python": sys.version,
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "created": datetime.now(UTC).isoformat(),
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    @private
+    """
+    parser = argparse.ArgumentParser(prog="python -m human_regex.bench", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", "-o", help="write the results as JSON to this file")
+    parser.add_argument("--filter", "-k", default="", help="run only benchmarks whose name contains this text")
+    parser.add_argument("--depth", type=int, default=100, help="length of the combinator chains (default: 100)")
+    parser.add_argument("--number", type=int, help="calls per run (default: chosen automatically)")
+    parser.add_argument("--repeat", type=int, default=5, help="number of runs (default: 5)")
+    arguments = parser.parse_args(argv)
+
+    results = run(all_benchmarks(arguments.depth), arguments.number, arguments.repeat, arguments.filter)
+    width = max((len(result["name"]) for result in results), default=0)
+    for result in results:
+        print(  # noqa: T201
+            f"{result['group']:<6} {result['name']:<{width}} "
+            f"{result['best_ns']:>14,.0f} ns  (median {result['median_ns']:,.0f} ns)"
+        )
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            json.dump(report(results), file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""
+Saving built expressions to a file and loading them again, without running the combinators.
+
+A service which builds thousands of expressions at startup can build them once, save them
+in a `PatternBundle` and load the bundle on every start instead. The bundle stores the texts
+of the expressions, their flags and the groups of their compiled patterns in a JSON file,
+together with a SHA-256 hash of all of it. Loading checks the hash and creates the
+`human_regex.StringRegex` and `human_regex.BytesRegex` instances; the patterns are compiled
+on first use, and their groups are checked against the bundle then.
+
+```py
+import os
+import tempfile
+
+from human_regex import StringRegex as Sre
+from human_regex.bundle import PatternBundle
+
+digits = Sre(r"\\d").one_or_more
+version = digits.named("major") + r"\\." + digits.named("minor")
+bundle = PatternBundle({"version": version, "word": (Sre(r"\\w+"), Sre.I)})
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, "patterns.json")
+    bundle.save(path)
+    loaded = PatternBundle.load(path)
+assert loaded["version"] == r"(?P<major>\\d+)\\.(?P<minor>\\d+)"
+assert loaded.entries["version"].groupindex == {"major": 1, "minor": 2}
+assert loaded.compile("word").flags & Sre.I
+assert loaded.compile("version").search("v3.11").group("minor") == "11"
+```
+
+`PatternBundle.load_or_build` builds and saves the bundle if the file is missing or invalid,
+so a module can define its expressions with `bundle = PatternBundle.load_or_build(path, build)`.
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections.abc import Callable, Iterator, Mapping
+from typing import NamedTuple
+
+from . import BytesRegex, StringRegex
+
+Text_Element = str | bytes
+"""
+@private
+"""
+
+FORMAT_VERSION = 1
+"""
+@private
+Version of the format of the bundle files.
+"""
+
+
+class BundleError(ValueError):
+    """
+    Raised when a bundle file is not valid, or does not match the patterns it describes.
+    """
+
+
+class BundleEntry(NamedTuple):
+    """
+    An expression of a `PatternBundle` with the flags it is compiled with and the groups of its compiled pattern.
+    """
+
+    pattern: StringRegex | BytesRegex
+    flags: int
+    groups: int
+    groupindex: dict[str, int]
+
+
+class PatternBundle(Mapping):
+    """
+    A read-only mapping of names to expressions, which can be saved to a file and loaded again.
+    *patterns* maps the names to the expressions, or to pairs of an expression and the flags to compile it with.
+    """
+
+    def __init__(self, patterns: Mapping[str, Text_Element | tuple[Text_Element, int]] | None = None) -> None:
+        self._patterns: dict[str, StringRegex | BytesRegex] = {}
+        self._flags: dict[str, int] = {}
+        self._entries: dict[str, BundleEntry] = {}
+        self._verified: set[str] = set()
+        for name, value in (patterns or {}).items():
+            pattern, flags = value if isinstance(value, tuple) else (value, 0)
+            if not isinstance(pattern, StringRegex | BytesRegex):
+                pattern = StringRegex(pattern) if isinstance(pattern, str) else BytesRegex(pattern)
+            self._patterns[name] = pattern
+            self._flags[name] = int(flags)
+
+    def __getitem__(self, name: str) -> StringRegex | BytesRegex:
+        return self._patterns[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._patterns)
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    @property
+    def entries(self) -> dict[str, BundleEntry]:
+        """
+        The `BundleEntry` of every expression. Built bundles compile their expressions for it.
+        """
+        for name in self._patterns.keys() - self._entries.keys():
+            compiled = self.compile(name)
+            self._entries[name] = BundleEntry(
+                self._patterns[name], self._flags[name], compiled.groups, compiled.groupindex
+            )
+        return {name: self._entries[name] for name in self._patterns}
+
+    def compile(self, name: str) -> re.Pattern:
+        """
+        Compiles the expression *name* with its flags. The first time, the groups of the compiled pattern
+        of a loaded bundle are checked against the bundle, raising `BundleError` if they differ.
+        """
+        compiled = self._patterns[name].compile(self._flags[name])
+        if name not in self._verified:
+            entry = self._entries.get(name)
+            if entry is not None and (compiled.groups, compiled.groupindex) != (entry.groups, entry.groupindex):
+                msg = f"the groups of the pattern {name!r} do not match the bundle"
+                raise BundleError(msg)
+            self._verified.add(name)
+        return compiled
+
+    def to_json(self) -> str:
+        """
+        Returns the bundle as a JSON document.
+        """
+        patterns = []
+        for name, entry in self.entries.items():
+            pattern = entry.pattern
+            patterns.append(
+                {
+                    "name": name,
+                    "bytes": isinstance(pattern, bytes),
+                    "pattern": pattern.decode("latin-1") if isinstance(pattern, bytes) else str(pattern),
+                    "flags": entry.flags,
+                    "groups": entry.groups,
+                    "groupindex": dict(entry.groupindex),
+                }
+            )
+        return json.dumps({"format": FORMAT_VERSION, "sha256": _hash(patterns), "patterns": patterns}, indent=1)
+
+    @classmethod
+    def from_json(cls, document: str | bytes) -> "PatternBundle":
+        """
+        Creates a bundle from a JSON document made by `PatternBundle.to_json`. Raises `BundleError`
+        if the document is not a valid bundle or its hash does not match.
+        """
+        try:
+            data = json.loads(document)
+            if data["format"] != FORMAT_VERSION:
+                msg = f"unsupported bundle format {data['format']!r}"
+                raise BundleError(msg)
+            patterns = data["patterns"]
+            if data["sha256"] != _hash(patterns):
+                msg = "the hash of the bundle does not match its patterns"
+                raise BundleError(msg)
+            bundle = cls()
+            for item in patterns:
+                text = item["pattern"]
+                pattern = BytesRegex(text.encode("latin-1")) if item["bytes"] else StringRegex(text)
+                name = item["name"]
+                bundle._patterns[name] = pattern
+                bundle._flags[name] = item["flags"]
+                bundle._entries[name] = BundleEntry(pattern, item["flags"], item["groups"], item["groupindex"])
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            if isinstance(e, BundleError):
+                raise
+            msg = f"not a valid bundle: {e}"
+            raise BundleError(msg) from e
+        return bundle
+
+    def save(self, path: str | os.PathLike) -> None:
+        """
+        Writes the bundle to the file *path*. The file is replaced atomically, so processes
+        loading it concurrently read either the old or the new bundle.
+        """
+        temporary = f"{os.fspath(path)}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(self.to_json())
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "PatternBundle":
+        """
+        Reads a bundle saved by `PatternBundle.save`. Raises `BundleError` if the file is not a valid bundle.
+        """
+        with open(path, "rb") as file:
+            return cls.from_json(file.read())
+
+    @classmethod
+    def load_or_build(cls, path: str | os.PathLike, build: Callable[[], "PatternBundle"]) -> "PatternBundle":
+        """
+        Loads the bundle from *path*. If the file does not exist or is not a valid bundle,
+        calls *build* for a new bundle instead, and saves it to *path*.
+        """
+        try:
+            return cls.load(path)
+        except (FileNotFoundError, BundleError):
+            bundle = build()
+            bundle.save(path)
+            return bundle
+
+
+def _hash(patterns: list[dict]) -> str:
+    canonical = json.dumps(patterns, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+    return hashlib.sha256(f"{FORMAT_VERSION}:{canonical}".encode()).hexdigest()
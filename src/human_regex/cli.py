@@ -0,0 +1,203 @@
+"""
+Measuring how fast expressions run over a corpus, from the command line.
+
+`human-regex` (or `python -m human_regex`) loads the expressions from a Python module,
+a Python file or a bundle saved by `human_regex.bundle.PatternBundle`, runs each of them over
+the files of a corpus and reports, slowest first, how long its compilation and its runs took,
+the throughput in megabytes and lines per second and the number of matches:
+
+```sh
+human-regex patterns.py logs/ --repeat 5
+human-regex myapp.patterns access.log --method grep --output run.json
+```
+
+A module or file defines its expressions either in a `PATTERNS` mapping of names to expressions
+(or to pairs of an expression and its flags), or as module-level `human_regex.StringRegex` and
+`human_regex.BytesRegex` instances, which are named after their variables. `StringRegex`
+expressions run over the files decoded with `--encoding`, `BytesRegex` expressions over their bytes.
+With `--method finditer` (the default) the matches are counted, with `--method grep` the matching
+lines (see `human_regex.grep`). The runs use the proxied functions, so they include the prefilter
+of `human_regex.literals`; the compile time is that of `re` without any cache.
+
+With `--output`, the results are written as JSON, together with the versions of Python and of
+`human_regex`, so that runs can be compared.
+"""
+
+import argparse
+import importlib
+import io
+import json
+import os
+import re
+import runpy
+import sys
+import time
+from collections.abc import Iterator, Mapping
+from re import _compiler
+
+from . import BytesRegex, StringRegex
+from .bench import report
+from .bundle import PatternBundle
+
+METHODS = ("finditer", "grep")
+"""
+@private
+"""
+
+
+def load_patterns(source: str) -> dict[str, tuple[StringRegex | BytesRegex, int]]:
+    """
+    @private
+    Loads the expressions of *source*, a bundle file, a Python file or the name of a module,
+    as a mapping of their names to pairs of the expression and its flags.
+    """
+    if source.endswith(".json"):
+        return {name: (entry.pattern, entry.flags) for name, entry in PatternBundle.load(source).entries.items()}
+    namespace = runpy.run_path(source) if os.path.exists(source) else vars(importlib.import_module(source))
+    items = namespace.get("PATTERNS")
+    if items is None:
+        items = {
+            name: value
+            for name, value in namespace.items()
+            if not name.startswith("_") and isinstance(value, StringRegex | BytesRegex)
+        }
+    elif not isinstance(items, Mapping):
+        items = dict(enumerate(items))
+    patterns = {}
+    for name, value in items.items():
+        pattern, flags = value if isinstance(value, tuple) else (value, 0)
+        if not isinstance(pattern, StringRegex | BytesRegex):
+            pattern = StringRegex(pattern) if isinstance(pattern, str) else BytesRegex(pattern)
+        patterns[str(name)] = (pattern, int(flags))
+    return patterns
+
+
+def corpus_files(path: str) -> list[str]:
+    """
+    @private
+    The files of the corpus *path*, a file or a directory searched recursively, in a stable order.
+    """
+    if not os.path.isdir(path):
+        return [path]
+    return sorted(os.path.join(directory, name) for directory, _, names in os.walk(path) for name in names)
+
+
+class Corpus:
+    """
+    @private
+    The contents of the corpus files in memory, as bytes and as decoded text.
+    """
+
+    def __init__(self, paths: list[str], encoding: str) -> None:
+        self.data: list[bytes] = []
+        for path in paths:
+            with open(path, "rb") as file:
+                self.data.append(file.read())
+        self.texts: list[str] = [data.decode(encoding, errors="replace") for data in self.data]
+        self.size = sum(map(len, self.data))
+        self.lines = sum(data.count(b"\n") + (bool(data) and not data.endswith(b"\n")) for data in self.data)
+
+    def contents(self, regex: StringRegex | BytesRegex) -> list[str] | list[bytes]:
+        return self.data if isinstance(regex, bytes) else self.texts
+
+
+def run_pattern(regex: StringRegex | BytesRegex, flags: int, contents: list, method: str) -> int:
+    """
+    @private
+    Runs *regex* over each of *contents* with *method* and returns the number of matches or matching lines.
+    """
+    if method == "grep":
+        stream = io.BytesIO if isinstance(regex, bytes) else io.StringIO
+        return sum(regex.grep(stream(content), "count", flags) for content in contents)
+    count = 0
+    for content in contents:
+        for _ in regex.finditer(content, flags):
+            count += 1
+    return count
+
+
+def measure(
+    patterns: dict[str, tuple[StringRegex | BytesRegex, int]], corpus: Corpus, method: str, repeat: int
+) -> Iterator[dict]:
+    """
+    @private
+    Runs each of *patterns* *repeat* times over *corpus* and yields a result record for each of them.
+    """
+    megabytes = corpus.size / 1e6
+    for name, (regex, flags) in patterns.items():
+        started = time.perf_counter()
+        _compiler.compile(regex, flags)
+        compile_seconds = time.perf_counter() - started
+        contents = corpus.contents(regex)
+        times = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            matches = run_pattern(regex, flags, contents, method)
+            times.append(time.perf_counter() - started)
+        best = max(min(times), 1e-9)
+        yield {
+            "name": name,
+            "pattern": regex.decode("latin-1") if isinstance(regex, bytes) else str(regex),
+            "bytes": isinstance(regex, bytes),
+            "flags": flags,
+            "method": method,
+            "matches": matches,
+            "compile_ms": compile_seconds * 1e3,
+            "best_ms": best * 1e3,
+            "mb_per_s": megabytes / best,
+            "lines_per_s": corpus.lines / best,
+        }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    @private
+    """
+    parser = argparse.ArgumentParser(prog="human-regex", description=__doc__.split("\n\n")[0])
+    parser.add_argument("patterns", help="a Python module or file defining the expressions, or a bundle .json file")
+    parser.add_argument("corpus", help="a file, or a directory whose files are searched")
+    parser.add_argument("--method", "-m", choices=METHODS, default="finditer", help="what to run (default: finditer)")
+    parser.add_argument("--repeat", "-r", type=int, default=3, help="runs per expression, the best counts (default: 3)")
+    parser.add_argument("--filter", "-k", default="", help="run only expressions whose name contains this text")
+    parser.add_argument("--top", "-n", type=int, default=20, help="number of slowest expressions shown (default: 20)")
+    parser.add_argument("--encoding", default="utf-8", help="encoding of the corpus for str expressions")
+    parser.add_argument("--output", "-o", help="write the results as JSON to this file")
+    arguments = parser.parse_args(argv)
+    if arguments.repeat < 1:
+        parser.error("--repeat must be positive")
+
+    try:
+        patterns = load_patterns(arguments.patterns)
+        paths = corpus_files(arguments.corpus)
+        corpus = Corpus(paths, arguments.encoding)
+    except (OSError, ImportError, ValueError) as e:
+        parser.error(str(e))
+    patterns = {name: value for name, value in patterns.items() if arguments.filter in name}
+    try:
+        results = sorted(
+            measure(patterns, corpus, arguments.method, arguments.repeat), key=lambda result: -result["best_ms"]
+        )
+    except re.error as e:
+        parser.error(f"invalid expression: {e}")
+
+    print(  # noqa: T201
+        f"{len(patterns)} expressions over {len(paths)} files, "
+        f"{corpus.size / 1e6:,.2f} MB in {corpus.lines:,} lines, method {arguments.method}"
+    )
+    width = max((len(result["name"]) for result in results[: arguments.top]), default=0)
+    for result in results[: arguments.top]:
+        print(  # noqa: T201
+            f"{result['name']:<{width}} {result['best_ms']:>10,.2f} ms {result['mb_per_s']:>10,.1f} MB/s "
+            f"{result['lines_per_s']:>14,.0f} lines/s {result['matches']:>10,} matches "
+            f"(compiled in {result['compile_ms']:,.3f} ms)"
+        )
+    if arguments.output:
+        document = report(results)
+        document["corpus"] = {"files": len(paths), "bytes": corpus.size, "lines": corpus.lines}
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            json.dump(document, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
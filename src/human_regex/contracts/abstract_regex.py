@@ -6,6 +6,8 @@ Text_Element = str | bytes
 
 
 class AbstractRegex(ABC):
+    __slots__ = ()
+
     @classmethod
     @abstractmethod
     def concatenate(cls, args: Iterable[Text_Element]) -> Self: ...
@@ -25,6 +27,10 @@ class AbstractRegex(ABC):
     @abstractmethod
     def join(self, elements: Iterable[Text_Element]) -> Self: ...
 
+    @property
+    @abstractmethod
+    def deferred(self): ...
+
     @property
     @abstractmethod
     def unnamed(self) -> Self: ...
@@ -75,6 +81,14 @@ class AbstractRegex(ABC):
     @abstractmethod
     def yes_no(cls, id_name: int | Text_Element, yes: Text_Element, no: Text_Element | None = None) -> Self: ...
 
+    @classmethod
+    @abstractmethod
+    def any_of(cls, words: Iterable[Text_Element]) -> Self: ...
+
+    @classmethod
+    @abstractmethod
+    def scanner(cls, patterns, flags: int = 0): ...
+
     @property
     @abstractmethod
     def set(self) -> Self: ...
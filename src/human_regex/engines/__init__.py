@@ -0,0 +1,98 @@
+"""
+Matching engines which the proxied functions can run the expressions on.
+
+By default, the proxied functions of `human_regex.StringRegex` and `human_regex.BytesRegex`
+run on `re`, through the pattern registry (see `human_regex.registry`). An *engine* compiles
+the expressions with another implementation instead. It is chosen by setting `engine` on
+a class or on an instance, or per call with the *engine* keyword argument of `compile`, `search`,
+`match`, `fullmatch`, `split`, `findall`, `finditer`, `sub` and `subn`. Engines are given by
+their registered names or as `Engine` objects:
+
+```py
+import re
+
+from human_regex import StringRegex as Sre
+from human_regex.engines import Engine, register_engine
+
+
+compiled = []
+
+
+class Tracing(Engine):
+    name = "tracing"
+
+    def compile(self, pattern, flags=0):
+        compiled.append(pattern)
+        return re.compile(pattern, flags)
+
+
+register_engine(Tracing())
+number = Sre(r"\\d").one_or_more.named("number")
+assert number.search("route 66", engine="tracing").group("number") == "66"
+number.engine = "tracing"
+assert number.findall("1, 2 and 3") == ["1", "2", "3"]
+assert compiled == [r"(?P<number>\\d+)"]
+```
+
+Registered are `"re"` (`ReEngine`), `"linear"` (`LinearEngine`, which runs in linear time, see
+`human_regex.engines.linear`) and, if the third-party `regex` module is installed, `"regex"`
+(`RegexModuleEngine`). Custom engines subclass `Engine`, implement `Engine.compile` to return
+an object with the methods of `re.Pattern`, and are registered with `register_engine`.
+Expressions are built the same way for every engine, so they must be valid for the engine
+they run on. The prefilter of `human_regex.literals` only applies to `"re"` and `"linear"`.
+"""
+
+from .base import Engine, EngineUnavailableError
+from .linear import LinearEngine, UnsupportedPatternError
+from .regex_module import RegexModuleEngine
+from .stdlib import ReEngine
+
+_engines: dict[str, Engine] = {}
+
+
+def register_engine(engine: Engine, name: str | None = None) -> None:
+    """
+    Registers *engine* under *name*, by default the `Engine.name` of the engine.
+    """
+    _engines[name or engine.name] = engine
+
+
+def get_engine(engine: str | Engine) -> Engine:
+    """
+    Returns the engine registered as *engine*, or *engine* itself if it is an `Engine`.
+    Raises `ValueError` for unknown names and `EngineUnavailableError` for engines which are not installed.
+    """
+    if isinstance(engine, str):
+        try:
+            engine = _engines[engine]
+        except KeyError:
+            msg = f"unknown engine {engine!r}, registered are: {', '.join(_engines)}"
+            raise ValueError(msg) from None
+    if not engine.available:
+        msg = f"the engine {engine.name or engine!r} is not installed"
+        raise EngineUnavailableError(msg)
+    return engine
+
+
+def available_engines() -> list[str]:
+    """
+    Returns the names of the registered engines which can be used.
+    """
+    return [name for name, engine in _engines.items() if engine.available]
+
+
+register_engine(ReEngine())
+register_engine(RegexModuleEngine())
+register_engine(LinearEngine())
+
+__all__ = [
+    "Engine",
+    "EngineUnavailableError",
+    "LinearEngine",
+    "ReEngine",
+    "RegexModuleEngine",
+    "UnsupportedPatternError",
+    "available_engines",
+    "get_engine",
+    "register_engine",
+]
@@ -0,0 +1,85 @@
+"""
+The base class of the engines, see `human_regex.engines`.
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+
+from ..registry import make_key
+
+Text_Element = str | bytes
+"""
+@private
+"""
+
+ENGINE_CACHE_SIZE = 512
+"""
+@private
+Number of compiled patterns an engine keeps.
+"""
+
+
+class EngineUnavailableError(ImportError):
+    """
+    Raised when an engine is used whose implementation is not installed.
+    """
+
+
+class Engine(ABC):
+    """
+    A regular expression implementation the proxied functions can run on.
+    """
+
+    name: str = ""
+    """
+    The name the engine is registered with by default.
+    """
+    prefilter: bool = False
+    """
+    Whether the engine has the syntax and semantics of `re`, so the prefilter of `human_regex.literals` is valid for it.
+    """
+
+    def __init__(self) -> None:
+        self._patterns: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def available(self) -> bool:
+        """
+        Whether the implementation of the engine can be used.
+        """
+        return True
+
+    @abstractmethod
+    def compile(self, pattern: Text_Element, flags: int = 0):
+        """
+        Compiles *pattern* with *flags* into an object with the methods of `re.Pattern`.
+        """
+
+    def compiled(self, pattern: Text_Element, flags: int = 0):
+        """
+        Like `Engine.compile`, but remembers the most recently used compiled patterns.
+        """
+        key = make_key(pattern, flags)
+        with self._lock:
+            compiled = self._patterns.get(key)
+            if compiled is not None:
+                self._patterns.move_to_end(key)
+                return compiled
+        compiled = self.compile(*key)
+        with self._lock:
+            self._patterns[key] = compiled
+            while len(self._patterns) > ENGINE_CACHE_SIZE:
+                self._patterns.popitem(last=False)
+        return compiled
+
+    def purge(self) -> None:
+        """
+        Forgets the compiled patterns.
+        """
+        with self._lock:
+            self._patterns.clear()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
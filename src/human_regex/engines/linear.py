@@ -0,0 +1,745 @@
+"""
+A matching engine which runs in time linear in the length of the text, for untrusted input.
+
+`re` is a backtracking engine: some patterns take exponential time on some texts (see
+`human_regex.backtracking`). The `"linear"` engine compiles the regular subset of the syntax
+into a Thompson NFA and simulates it with a lazily built deterministic automaton, whose states
+are cached as they are discovered. A search reads every character of the text a bounded number
+of times, whatever the pattern:
+
+```py
+from human_regex import StringRegex as Sre
+
+nested = (Sre("a").one_or_more).unnamed.one_or_more + "b"
+assert nested.search("a" * 10_000, engine="linear") is None
+
+word = Sre(r"\\w").one_or_more
+pair = word.named("key") + "=" + word.named("value")
+match = pair.search("set color=blue", engine="linear")
+assert match.span() == (4, 14)
+assert match.group("key", "value") == ("color", "blue")
+assert pair.sub(r"\\g<value>=\\g<key>", "a=1, b=2", engine="linear") == "1=a, 2=b"
+```
+
+The subset covers literals, character sets, `.`, alternatives, capturing and non-capturing
+groups, greedy and lazy repetitions, the anchors `^`, `$`, `\\A`, `\\Z`, `\\b` and `\\B`,
+and global and scoped flags: what the combinators build except `backreference`, the lookarounds
+(`followed_by`, `preceded_by` and their negations), `yes_no`, `atomic` and possessive repetitions.
+Patterns using them raise `UnsupportedPatternError` when compiled, unless the engine was created
+with `LinearEngine(fallback=True)`, which compiles them with `re` instead.
+
+Matches are found as `re` finds them: the leftmost match, and among the matches starting there
+the one `re` prefers, with the same groups. As in `re`, an optional iteration of a repetition
+which matches the empty string ends the repetition. Matches are `human_regex.matches.DetachedMatch`
+objects.
+
+`finditer`, `findall`, `sub`, `subn` and `split` search again after each match. A search stops
+reading as soon as no match can end further on, but an expression which may have to read far
+beyond the matches it finds, like `a*b|a` in a long run of `a`, makes finding all matches take
+time quadratic in the length of the text. Only single searches are guaranteed to be linear.
+
+A search runs the automaton forwards to find where the match ends, then backwards from
+there to find where it starts. The groups are extracted by a simulation of the NFA over the
+matched text only. Characters are classified by the `re` module, one character set at
+a time, so that case-insensitive matching and character classes behave as in `re`.
+"""
+
+import re
+import sys
+from collections.abc import Callable, Iterator
+from functools import partial
+from re import _constants as c
+from threading import Lock
+
+from ..matches import DetachedMatch, compile_template, expand_template
+from ..syntax import REPEATS, parse, render_node
+from .base import Engine, Text_Element
+
+MAX_PROGRAM_SIZE = 20_000
+"""
+@private
+Largest number of NFA instructions a pattern may compile to, counted repetitions included.
+"""
+
+MAX_STATES = 10_000
+"""
+@private
+Number of automaton states cached before the cache is cleared.
+"""
+
+# NFA instructions: (opcode, argument, argument)
+CHAR, SPLIT, JUMP, SAVE, ASSERT, MATCH, LOOP, LOOP_END = range(8)
+
+# what the characters around a position tell the anchors
+LEFT_START, LEFT_NEWLINE, LEFT_WORD = 1, 2, 4
+RIGHT_END, RIGHT_NEWLINE, RIGHT_WORD, RIGHT_FINAL_NEWLINE = 1, 2, 4, 8
+
+(
+    BEGIN_STRING,
+    BEGIN_LINE,
+    END_STRING,
+    END_OR_FINAL_NEWLINE,
+    END_LINE,
+    BOUNDARY,
+    NON_BOUNDARY,
+) = range(7)
+
+# flags which change what a character set matches
+CHARACTER_FLAGS = c.SRE_FLAG_IGNORECASE | c.SRE_FLAG_LOCALE | c.SRE_FLAG_ASCII | c.SRE_FLAG_UNICODE | c.SRE_FLAG_DOTALL
+WORD_FLAGS = c.SRE_FLAG_LOCALE | c.SRE_FLAG_ASCII | c.SRE_FLAG_UNICODE
+
+UNSUPPORTED = {
+    c.GROUPREF: "backreferences",
+    c.GROUPREF_EXISTS: "conditionals",
+    c.ASSERT: "lookarounds",
+    c.ASSERT_NOT: "lookarounds",
+    c.ATOMIC_GROUP: "atomic groups",
+    c.POSSESSIVE_REPEAT: "possessive repetitions",
+}
+
+
+class UnsupportedPatternError(ValueError):
+    """
+    Raised when a pattern uses syntax the linear-time engine cannot run.
+    """
+
+
+class LinearEngine(Engine):
+    """
+    The linear-time engine, registered as `"linear"`. With *fallback*, patterns
+    outside of its subset are compiled with `re` rather than rejected.
+    """
+
+    name = "linear"
+    prefilter = True
+
+    def __init__(self, *, fallback: bool = False) -> None:
+        super().__init__()
+        self.fallback = fallback
+
+    def compile(self, pattern: Text_Element, flags: int = 0) -> "LinearPattern | re.Pattern":
+        try:
+            return LinearPattern(pattern, flags)
+        except UnsupportedPatternError:
+            if self.fallback:
+                return re.compile(pattern, flags)
+            raise
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(fallback={self.fallback})"
+
+
+class _Atom:
+    """
+    A set of characters, tested by `re` and remembered character by character.
+    """
+
+    __slots__ = ("compiled", "is_bytes", "known")
+
+    def __init__(self, compiled: re.Pattern | None, is_bytes: bool) -> None:  # noqa: FBT001
+        self.compiled = compiled
+        self.known: dict = {}
+        self.is_bytes = is_bytes
+
+    def __call__(self, character) -> bool:
+        known = self.known.get(character)
+        if known is None:
+            if self.compiled is None:
+                known = True
+            else:
+                text = bytes((character,)) if self.is_bytes else character
+                known = self.compiled.fullmatch(text) is not None
+            self.known[character] = known
+        return known
+
+
+class _Compiler:
+    """
+    Translates the syntax tree of a pattern into NFA instructions.
+    """
+
+    def __init__(self, is_bytes: bool) -> None:  # noqa: FBT001
+        self.is_bytes = is_bytes
+        self.program: list[tuple] = []
+        self.atoms: list[_Atom] = [_Atom(None, is_bytes)]
+        self._atom_ids: dict[tuple, int] = {}
+        self.word_flags: set[int] = set()
+
+    def emit(self, instruction: tuple) -> int:
+        if len(self.program) >= MAX_PROGRAM_SIZE:
+            msg = f"the pattern needs more than {MAX_PROGRAM_SIZE} instructions"
+            raise UnsupportedPatternError(msg)
+        self.program.append(instruction)
+        return len(self.program) - 1
+
+    def patch(self, pc: int, instruction: tuple) -> None:
+        self.program[pc] = instruction
+
+    def atom(self, op, av, flags: int) -> int:
+        text = render_node(op, av, {})
+        key = (text, flags & CHARACTER_FLAGS)
+        atom_id = self._atom_ids.get(key)
+        if atom_id is None:
+            source = text.encode("latin-1") if self.is_bytes else text
+            compiled = re.compile(source, flags & CHARACTER_FLAGS)
+            atom_id = self._atom_ids[key] = len(self.atoms)
+            self.atoms.append(_Atom(compiled, self.is_bytes))
+        return atom_id
+
+    def sequence(self, items, flags: int, *, reverse: bool, forward: bool) -> None:
+        for op, av in reversed(list(items)) if reverse else items:
+            self.node(op, av, flags, reverse=reverse, forward=forward)
+
+    def node(self, op, av, flags: int, *, reverse: bool, forward: bool) -> None:
+        if op in UNSUPPORTED:
+            msg = f"{UNSUPPORTED[op]} cannot be matched in linear time"
+            raise UnsupportedPatternError(msg)
+        if op is c.LITERAL or op is c.NOT_LITERAL or op is c.ANY or op is c.IN:
+            self.emit((CHAR, self.atom(op, av, flags), None))
+        elif op is c.AT:
+            self.emit((ASSERT, self.anchor(av, flags), None))
+        elif op is c.SUBPATTERN:
+            group, add_flags, del_flags, content = av
+            inner = (flags | add_flags) & ~del_flags
+            if group is not None and forward:
+                self.emit((SAVE, 2 * group, None))
+            self.sequence(content, inner, reverse=reverse, forward=forward)
+            if group is not None and forward:
+                self.emit((SAVE, 2 * group + 1, None))
+        elif op is c.BRANCH:
+            jumps = []
+            alternatives = av[1]
+            for index, alternative in enumerate(alternatives):
+                if index < len(alternatives) - 1:
+                    split = self.emit(None)
+                    self.sequence(alternative, flags, reverse=reverse, forward=forward)
+                    jumps.append(self.emit(None))
+                    self.patch(split, (SPLIT, split + 1, len(self.program)))
+                else:
+                    self.sequence(alternative, flags, reverse=reverse, forward=forward)
+            for jump in jumps:
+                self.patch(jump, (JUMP, len(self.program), None))
+        elif op in REPEATS:
+            self.repeat(op, av, flags, reverse=reverse, forward=forward)
+        else:
+            msg = f"unsupported opcode {op}"
+            raise UnsupportedPatternError(msg)
+
+    def repeat(self, op, av, flags: int, *, reverse: bool, forward: bool) -> None:
+        """
+        Expands a repetition into copies of its content. In the forward program, like in `re`,
+        an optional iteration which matched the empty string ends the repetition: `LOOP` marks
+        the start of an iteration and `LOOP_END` leaves the repetition if no character was read since.
+        """
+        minimum, maximum, content = av
+        greedy = op is c.MAX_REPEAT
+        for _ in range(minimum):
+            self.sequence(content, flags, reverse=reverse, forward=forward)
+        if maximum == c.MAXREPEAT:
+            loop = self.emit((LOOP, None, None)) if forward else len(self.program)
+            split = self.emit(None)
+            self.sequence(content, flags, reverse=reverse, forward=forward)
+            end = self.emit(None) if forward else None
+            self.emit((JUMP, loop, None))
+            out = len(self.program)
+            self.patch(split, self.split(split + 1, out, greedy=greedy))
+            if end is not None:
+                self.patch(end, (LOOP_END, loop, out))
+            return
+        iterations = []
+        for index in range(maximum - minimum):
+            loop = self.emit((LOOP, None, None)) if forward else len(self.program)
+            split = self.emit(None)
+            self.sequence(content, flags, reverse=reverse, forward=forward)
+            # after the last iteration, the repetition ends anyway
+            end = self.emit(None) if forward and index < maximum - minimum - 1 else None
+            iterations.append((loop, split, end))
+        out = len(self.program)
+        for loop, split, end in iterations:
+            self.patch(split, self.split(split + 1, out, greedy=greedy))
+            if end is not None:
+                self.patch(end, (LOOP_END, loop, out))
+
+    @staticmethod
+    def split(body: int, out: int, *, greedy: bool) -> tuple:
+        return (SPLIT, body, out) if greedy else (SPLIT, out, body)
+
+    def anchor(self, at, flags: int) -> int:
+        multiline = flags & c.SRE_FLAG_MULTILINE
+        if at is c.AT_BEGINNING:
+            return BEGIN_LINE if multiline else BEGIN_STRING
+        if at is c.AT_BEGINNING_STRING:
+            return BEGIN_STRING
+        if at is c.AT_END:
+            return END_LINE if multiline else END_OR_FINAL_NEWLINE
+        if at is c.AT_END_STRING:
+            return END_STRING
+        self.word_flags.add(flags & WORD_FLAGS)
+        if len(self.word_flags) > 1:
+            msg = "word boundaries with different flags cannot be matched in linear time"
+            raise UnsupportedPatternError(msg)
+        return BOUNDARY if at is c.AT_BOUNDARY else NON_BOUNDARY
+
+
+def _holds(anchor: int, left: int, right: int) -> bool:
+    if anchor == BEGIN_STRING:
+        return bool(left & LEFT_START)
+    if anchor == BEGIN_LINE:
+        return bool(left & (LEFT_START | LEFT_NEWLINE))
+    if anchor == END_STRING:
+        return bool(right & RIGHT_END)
+    if anchor == END_OR_FINAL_NEWLINE:
+        return bool(right & (RIGHT_END | RIGHT_FINAL_NEWLINE))
+    if anchor == END_LINE:
+        return bool(right & (RIGHT_END | RIGHT_NEWLINE))
+    boundary = bool(left & LEFT_WORD) != bool(right & RIGHT_WORD)
+    if anchor == BOUNDARY:
+        return boundary
+    # like re, \B does not match in an empty text
+    return not boundary and not (left & LEFT_START and right & RIGHT_END)
+
+
+# where a match reached by the threads counts
+ANYWHERE, AT_END, NOWHERE = range(3)
+
+
+NO_LOOPS: frozenset = frozenset()
+
+
+def _closure(program, pcs, left: int, right: int, *, first: bool, accept: int) -> tuple[list[int], bool]:
+    """
+    Follows the instructions which consume no character from *pcs*, in the order of their priority.
+    Returns the character instructions reached and whether a match was reached. With *first*, the
+    threads of lower priority than a match are dropped, as a backtracking engine would never try them.
+    Threads remember the iterations they started without reading a character, see `_Compiler.repeat`.
+    """
+    reached = []
+    matched = False
+    seen = set()
+    stack = [(pc, NO_LOOPS) for pc in reversed(pcs)]
+    while stack:
+        pc, loops = stack.pop()
+        op, a, b = program[pc]
+        if op == CHAR:
+            if pc not in seen:
+                seen.add(pc)
+                reached.append(pc)
+            continue
+        if (pc, loops) in seen:
+            continue
+        seen.add((pc, loops))
+        if op == SPLIT:
+            stack.append((b, loops))
+            stack.append((a, loops))
+        elif op == JUMP:
+            stack.append((a, loops))
+        elif op == SAVE:
+            stack.append((pc + 1, loops))
+        elif op == LOOP:
+            stack.append((pc + 1, loops | {pc}))
+        elif op == LOOP_END:
+            stack.append((b if a in loops else pc + 1, loops))
+        elif op == ASSERT:
+            if _holds(a, left, right):
+                stack.append((pc + 1, loops))
+        elif accept == ANYWHERE or (accept == AT_END and right & RIGHT_END):
+            matched = True
+            if first:
+                break
+    return reached, matched
+
+
+class _Cache:
+    """
+    The states of an automaton discovered so far and their transitions. State 0 has no threads left.
+    """
+
+    __slots__ = ("finals", "ids", "states", "transitions")
+
+    def __init__(self) -> None:
+        self.ids: dict[tuple, int] = {}
+        self.states: list[tuple] = []
+        self.transitions: list[dict] = []
+        self.finals: list[dict] = []
+        self.state((), 0, NOWHERE)
+
+    def state(self, pcs: tuple, context: int, accept: int) -> int:
+        key = (pcs, context, accept) if pcs else ((), 0, NOWHERE)
+        state = self.ids.get(key)
+        if state is None:
+            state = self.ids[key] = len(self.states)
+            self.states.append(key)
+            self.transitions.append({})
+            self.finals.append({})
+        return state
+
+
+class _Automaton:
+    """
+    A deterministic automaton simulating an NFA program, built lazily. A state is the ordered tuple
+    of the NFA instructions its threads are at, before following the instructions which consume no
+    character, what the last character read tells the anchors, and where matches count.
+    A forward automaton remembers the character left of the position, a backward one the character
+    right of it. When the cache of states is full, it is replaced by an empty one.
+    """
+
+    def __init__(self, pattern: "LinearPattern", program: list[tuple], *, first: bool, forward: bool) -> None:
+        self.pattern = pattern
+        self.program = program
+        self.first = first
+        self.forward = forward
+        self.cache = _Cache()
+        self._lock = Lock()
+
+    def start(self, pcs: tuple, context: int, accept: int) -> tuple[_Cache, int]:
+        with self._lock:
+            cache = self.cache
+            return cache, cache.state(pcs, context, accept)
+
+    def step(self, cache: _Cache, state: int, key, character, final: bool) -> tuple[_Cache, bool, int]:  # noqa: FBT001
+        """
+        Reads *character* in *state* and returns the cache the next state is in, whether a match
+        was reached before the character and the next state.
+        """
+        pattern = self.pattern
+        with self._lock:
+            pcs, context, accept = cache.states[state]
+            if self.forward:
+                left, right = context, pattern._right_of(character, final=final)
+                following_context = pattern._left_of(character)
+            else:
+                left, right = pattern._left_of(character), context
+                following_context = pattern._right_of(character, final=final)
+            reached, matched = _closure(self.program, pcs, left, right, first=self.first, accept=accept)
+            atoms = pattern._atoms
+            program = self.program
+            following = tuple(pc + 1 for pc in reached if atoms[program[pc][1]](character))
+            if len(cache.states) >= MAX_STATES:
+                if cache is self.cache:
+                    self.cache = _Cache()
+                cache = self.cache
+                state = cache.state(pcs, context, accept)
+            # only the first position of a search may forbid matches
+            next_state = cache.state(following, following_context, AT_END if accept == AT_END else ANYWHERE)
+            cache.transitions[state][key] = (matched, next_state)
+            return cache, matched, next_state
+
+    def matches(self, cache: _Cache, state: int, context: int) -> bool:
+        """
+        Whether a match is reached in *state* at the end of the text, or at its start for a backward automaton.
+        """
+        finals = cache.finals[state]
+        matched = finals.get(context)
+        if matched is None:
+            pcs, own, accept = cache.states[state]
+            left, right = (own, context) if self.forward else (context, own)
+            matched = _closure(self.program, pcs, left, right, first=self.first, accept=accept)[1]
+            finals[context] = matched
+        return matched
+
+
+class LinearPattern:
+    """
+    A pattern compiled by `LinearEngine`, with the matching methods of `re.Pattern`.
+    """
+
+    def __init__(self, pattern: Text_Element, flags: int = 0) -> None:
+        if type(pattern) is not str and type(pattern) is not bytes:
+            pattern = str(pattern) if isinstance(pattern, str) else bytes(pattern)
+        tree = parse(pattern, flags)
+        self.pattern = pattern
+        self.flags: int = tree.state.flags
+        self.groups: int = tree.state.groups - 1
+        self.groupindex: dict[str, int] = dict(tree.state.groupdict)
+        is_bytes = isinstance(pattern, bytes)
+        self._newline = 10 if is_bytes else "\n"
+        self._empty = pattern[:0]
+
+        forward = _Compiler(is_bytes)
+        # an unanchored search restarts the pattern at every position, at the lowest priority
+        forward.emit((SPLIT, 3, 1))
+        forward.emit((CHAR, 0, None))
+        forward.emit((JUMP, 0, None))
+        self._body = len(forward.program)
+        forward.sequence(tree, self.flags, reverse=False, forward=True)
+        forward.emit((MATCH, None, None))
+        # the reversed pattern finds where a match ending at a known position starts
+        backward = _Compiler(is_bytes)
+        backward.atoms, backward._atom_ids, backward.word_flags = forward.atoms, forward._atom_ids, forward.word_flags
+        backward.sequence(tree, self.flags, reverse=True, forward=False)
+        backward.emit((MATCH, None, None))
+
+        self._program = forward.program
+        self._atoms = forward.atoms
+        word_flags = next(iter(forward.word_flags), self.flags & WORD_FLAGS)
+        self._word = _Atom(re.compile(rb"\w" if is_bytes else r"\w", word_flags), is_bytes)
+        self._lefts: dict = {}
+        self._rights: dict = {}
+        self._forward = _Automaton(self, forward.program, first=True, forward=True)
+        self._backward = _Automaton(self, backward.program, first=False, forward=False)
+
+    def __repr__(self) -> str:
+        return f"LinearPattern({self.pattern!r})"
+
+    def _left_of(self, character) -> int:
+        left = self._lefts.get(character)
+        if left is None:
+            left = (LEFT_NEWLINE if character == self._newline else 0) | (LEFT_WORD if self._word(character) else 0)
+            self._lefts[character] = left
+        return left
+
+    def _right_of(self, character, *, final: bool) -> int:
+        right = self._rights.get((character, final))
+        if right is None:
+            right = RIGHT_WORD if self._word(character) else 0
+            if character == self._newline:
+                right |= RIGHT_NEWLINE | (RIGHT_FINAL_NEWLINE if final else 0)
+            self._rights[(character, final)] = right
+        return right
+
+    def _left_at(self, string: Text_Element, position: int) -> int:
+        return LEFT_START if position == 0 else self._left_of(string[position - 1])
+
+    def _right_at(self, string: Text_Element, position: int, endpos: int) -> int:
+        return RIGHT_END if position == endpos else self._right_of(string[position], final=position + 1 == endpos)
+
+    def _end(self, string: Text_Element, start: int, pc: int, endpos: int, accept: int) -> int:
+        """
+        Runs the forward automaton from *start*, with a thread at *pc*, and returns the end of the preferred
+        match or -1.
+        """
+        automaton = self._forward
+        cache, state = automaton.start((pc,), self._left_at(string, start), accept)
+        transitions = cache.transitions
+        newline = self._newline
+        end = -1
+        position = start
+        while position < endpos:
+            character = string[position]
+            # a line break ending the text is where a $ without MULTILINE matches too
+            final = position + 1 == endpos and character == newline
+            key = (character, True) if final else character
+            result = transitions[state].get(key)
+            if result is None:
+                cache, matched, state = automaton.step(cache, state, key, character, final)
+                transitions = cache.transitions
+            else:
+                matched, state = result
+            if matched:
+                end = position
+            if not state:
+                return end
+            position += 1
+        if automaton.matches(cache, state, RIGHT_END):
+            end = endpos
+        return end
+
+    def _start(self, string: Text_Element, pos: int, end: int, endpos: int) -> int:
+        """
+        Runs the backward automaton from *end* down to *pos* and returns the leftmost start of a match ending at *end*.
+        """
+        automaton = self._backward
+        cache, state = automaton.start((0,), self._right_at(string, end, endpos), ANYWHERE)
+        transitions = cache.transitions
+        newline = self._newline
+        start = -1
+        position = end
+        while position > pos:
+            character = string[position - 1]
+            final = position == endpos and character == newline
+            key = (character, True) if final else character
+            result = transitions[state].get(key)
+            if result is None:
+                cache, matched, state = automaton.step(cache, state, key, character, final)
+                transitions = cache.transitions
+            else:
+                matched, state = result
+            if matched:
+                start = position
+            if not state:
+                return start
+            position -= 1
+        if automaton.matches(cache, state, self._left_at(string, pos)):
+            start = pos
+        return start
+
+    def _captures(self, string: Text_Element, start: int, end: int, *, endpos: int, first: int, accept: int):
+        """
+        Simulates the NFA from *start* to *end*, keeping the positions of the groups in the threads,
+        and returns the spans of the groups of the preferred match ending at *end* and the group it
+        closed last. *first* tells where matches count at *start*, *accept* at the other positions.
+        """
+        program = self._program
+        atoms = self._atoms
+        # the slots of the groups, then the group closed last
+        threads = [(self._body, (-1,) * (2 * self.groups + 2) + (None,))]
+        best = None
+        position = start
+        while threads:
+            left = self._left_at(string, position)
+            right = self._right_at(string, position, endpos)
+            here = first if position == start else accept
+            reached = []
+            seen = set()
+            stack = [(pc, NO_LOOPS, slots) for pc, slots in reversed(threads)]
+            while stack:
+                pc, loops, slots = stack.pop()
+                op, a, b = program[pc]
+                if op == CHAR:
+                    if pc not in seen:
+                        seen.add(pc)
+                        reached.append((pc, slots))
+                    continue
+                if (pc, loops) in seen:
+                    continue
+                seen.add((pc, loops))
+                if op == SPLIT:
+                    stack.append((b, loops, slots))
+                    stack.append((a, loops, slots))
+                elif op == JUMP:
+                    stack.append((a, loops, slots))
+                elif op == SAVE:
+                    last = a // 2 if a % 2 else slots[-1]
+                    stack.append((pc + 1, loops, (*slots[:a], position, *slots[a + 1 : -1], last)))
+                elif op == LOOP:
+                    stack.append((pc + 1, loops | {pc}, slots))
+                elif op == LOOP_END:
+                    stack.append((b if a in loops else pc + 1, loops, slots))
+                elif op == ASSERT:
+                    if _holds(a, left, right):
+                        stack.append((pc + 1, loops, slots))
+                elif here == ANYWHERE or (here == AT_END and right & RIGHT_END):
+                    # the threads of lower priority are never tried
+                    best = slots
+                    break
+            if position == end:
+                break
+            character = string[position]
+            threads = [(pc + 1, slots) for pc, slots in reached if atoms[program[pc][1]](character)]
+            position += 1
+        regs = [(start, end)]
+        for group in range(1, self.groups + 1):
+            group_start, group_end = best[2 * group], best[2 * group + 1]
+            regs.append((group_start, group_end) if group_start >= 0 and group_end >= 0 else (-1, -1))
+        return regs, best[-1]
+
+    def _match(self, string: Text_Element, start: int, end: int, *, pos: int, endpos: int, first: int, accept: int):
+        if self.groups:
+            regs, lastindex = self._captures(string, start, end, endpos=endpos, first=first, accept=accept)
+        else:
+            regs, lastindex = [(start, end)], None
+        return DetachedMatch(string, self, tuple(regs), pos=pos, endpos=endpos, lastindex=lastindex)
+
+    def _search(self, string: Text_Element, pos: int, endpos: int, *, must_advance: bool = False):
+        """
+        Searches like `search`. With *must_advance*, there is no empty match at *pos*, as after an empty match.
+        """
+        first = NOWHERE if must_advance else ANYWHERE
+        end = self._end(string, pos, 0, endpos, first)
+        if end < 0:
+            return None
+        start = self._start(string, pos, end, endpos)
+        first = first if start == pos else ANYWHERE
+        return self._match(string, start, end, pos=pos, endpos=endpos, first=first, accept=ANYWHERE)
+
+    def search(self, string: Text_Element, pos: int = 0, endpos: int = sys.maxsize) -> DetachedMatch | None:
+        """
+        Scans through *string* for the first match, like `re.Pattern.search`.
+        """
+        pos, endpos = _bounds(string, pos, endpos)
+        if pos > endpos:
+            return None
+        return self._search(string, pos, endpos)
+
+    def match(self, string: Text_Element, pos: int = 0, endpos: int = sys.maxsize) -> DetachedMatch | None:
+        """
+        Matches at the beginning of *string*, like `re.Pattern.match`.
+        """
+        pos, endpos = _bounds(string, pos, endpos)
+        end = self._end(string, pos, self._body, endpos, ANYWHERE) if pos <= endpos else -1
+        if end < 0:
+            return None
+        return self._match(string, pos, end, pos=pos, endpos=endpos, first=ANYWHERE, accept=ANYWHERE)
+
+    def fullmatch(self, string: Text_Element, pos: int = 0, endpos: int = sys.maxsize) -> DetachedMatch | None:
+        """
+        Matches all of *string*, like `re.Pattern.fullmatch`.
+        """
+        pos, endpos = _bounds(string, pos, endpos)
+        if pos > endpos or self._end(string, pos, self._body, endpos, AT_END) != endpos:
+            return None
+        return self._match(string, pos, endpos, pos=pos, endpos=endpos, first=AT_END, accept=AT_END)
+
+    def finditer(self, string: Text_Element, pos: int = 0, endpos: int = sys.maxsize) -> Iterator[DetachedMatch]:
+        """
+        Yields all non-overlapping matches in *string*, like `re.Pattern.finditer`.
+        """
+        pos, endpos = _bounds(string, pos, endpos)
+        must_advance = False
+        while pos <= endpos:
+            match = self._search(string, pos, endpos, must_advance=must_advance)
+            if match is None:
+                return
+            yield match
+            start, pos = match.span()
+            must_advance = start == pos
+
+    def findall(self, string: Text_Element, pos: int = 0, endpos: int = sys.maxsize) -> list:
+        """
+        Returns all non-overlapping matches in *string*, like `re.Pattern.findall`.
+        """
+        empty = self._empty
+        matches = self.finditer(string, pos, endpos)
+        if self.groups == 0:
+            return [match.group() for match in matches]
+        if self.groups == 1:
+            return [match.group(1) or empty for match in matches]
+        return [match.groups(empty) for match in matches]
+
+    def split(self, string: Text_Element, maxsplit: int = 0) -> list:
+        """
+        Splits *string* by the matches, like `re.Pattern.split`.
+        """
+        pieces = []
+        last = 0
+        for count, match in enumerate(self.finditer(string), 1):
+            pieces.append(string[last : match.start()])
+            pieces.extend(match.groups())
+            last = match.end()
+            if count == maxsplit:
+                break
+        pieces.append(string[last:])
+        return pieces
+
+    def subn(self, repl: Text_Element | Callable, string: Text_Element, count: int = 0) -> tuple[Text_Element, int]:
+        """
+        Replaces the matches in *string* by *repl*, like `re.Pattern.subn`.
+        """
+        if callable(repl):
+            replace = repl
+        else:
+            template = compile_template(repl, self)
+            replace = partial(expand_template, template)
+        pieces = []
+        last = 0
+        replaced = 0
+        for match in self.finditer(string):
+            pieces.append(string[last : match.start()])
+            pieces.append(replace(match))
+            last = match.end()
+            replaced += 1
+            if replaced == count:
+                break
+        pieces.append(string[last:])
+        return self._empty.join(pieces), replaced
+
+    def sub(self, repl: Text_Element | Callable, string: Text_Element, count: int = 0) -> Text_Element:
+        """
+        Replaces the matches in *string* by *repl*, like `re.Pattern.sub`.
+        """
+        return self.subn(repl, string, count)[0]
+
+
+def _bounds(string: Text_Element, pos: int, endpos: int) -> tuple[int, int]:
+    length = len(string)
+    return min(max(pos, 0), length), min(max(endpos, 0), length)
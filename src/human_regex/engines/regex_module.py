@@ -0,0 +1,30 @@
+"""
+An adapter for the third-party [`regex`](https://pypi.org/project/regex/) module.
+"""
+
+import importlib.util
+from functools import cached_property
+
+from .base import Engine, EngineUnavailableError, Text_Element
+
+
+class RegexModuleEngine(Engine):
+    """
+    Runs the expressions on the `regex` module, which is imported on first use. Its flags
+    have the values of the flags of `re`, and its version 0 behaviour, the default, is
+    compatible with `re`, so the expressions built for `re` run unchanged.
+    """
+
+    name = "regex"
+
+    @cached_property
+    def available(self) -> bool:
+        return importlib.util.find_spec("regex") is not None
+
+    def compile(self, pattern: Text_Element, flags: int = 0):
+        try:
+            import regex  # noqa: PLC0415 (optional dependency)
+        except ImportError as e:
+            msg = "the regex engine needs the regex module, install it with: pip install regex"
+            raise EngineUnavailableError(msg) from e
+        return regex.compile(pattern, int(flags))
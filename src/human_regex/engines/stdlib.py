@@ -0,0 +1,20 @@
+"""
+The engine of the standard library, `re`.
+"""
+
+import re
+
+from .base import Engine, Text_Element
+
+
+class ReEngine(Engine):
+    """
+    Runs the expressions on `re`. The proxied functions get its compiled patterns from
+    their pattern registry rather than from the cache of the engine, as without an engine.
+    """
+
+    name = "re"
+    prefilter = True
+
+    def compile(self, pattern: Text_Element, flags: int = 0) -> re.Pattern:
+        return re.compile(pattern, flags)
@@ -0,0 +1,254 @@
+"""
+Finding the lines of a file which match an expression, like `grep`.
+
+Searching line by line costs a Python call per line. `grep` reads the file in large blocks
+instead, runs the expression over each block with `re.MULTILINE`, so that `^` and `$` match at
+the ends of lines, and maps the matches back to the lines they start on. Only matching lines
+cost Python code, the other lines are skipped by the regular expression engine, and blocks
+without the literal of the prefilter (see `human_regex.literals`) by `str.find`:
+
+```py
+import io
+
+from human_regex import StringRegex as Sre
+
+log = io.StringIO("boot ok\\ndisk full\\nfan ok\\nDISK full\\n")
+full = Sre("disk|DISK").no_capture + " full"
+hits = list(full.grep(log, line_numbers=True))
+assert [(hit.line, hit.number) for hit in hits] == [("disk full", 2), ("DISK full", 4)]
+assert full.grep(io.StringIO("disk full\\ndisk full"), "count") == 2
+assert Sre(r"ok$").grep(io.StringIO("boot ok\\nfan ok"), "first", offsets=True).offset == 0
+assert not Sre("fire").grep(io.StringIO("boot ok\\n"), "files-with-matches")
+```
+
+A line matches if a search of the line alone finds a match. Matches which run across the end
+of a line, and matches of expressions with lookaheads or `\\B`, are checked against the line alone.
+Expressions whose matches may depend on the lines around them, because they use `\\A`, `\\Z`,
+lookbehinds, negative lookaheads, atomic groups or possessive repetitions, are searched for
+line by line within each block instead.
+Lines end at `\\n`; a `\\r` before it is part of the line.
+"""
+
+import re
+from collections.abc import Iterator
+from contextlib import closing
+from re import _constants as c
+from typing import IO, NamedTuple
+
+from .syntax import children, parse
+
+Text_Element = str | bytes
+"""
+@private
+"""
+
+DEFAULT_BLOCK_SIZE = 1 << 20
+"""
+@private
+Number of characters or bytes read at a time.
+"""
+
+MODES = ("lines", "count", "first", "files-with-matches")
+"""
+@private
+"""
+
+
+class GrepLine(NamedTuple):
+    """
+    A matching line, without its line break.
+    """
+
+    line: Text_Element
+    number: int | None
+    """
+    The number of the line, counted from 1, if line numbers were asked for.
+    """
+    offset: int | None
+    """
+    The position of the start of the line in the file, if offsets were asked for. It counts
+    bytes in files read by `human_regex.BytesRegex` and characters in files read by
+    `human_regex.StringRegex`.
+    """
+
+
+def grep(
+    regex,
+    source: str | IO,
+    mode: str = "lines",
+    flags: int = 0,
+    *,
+    line_numbers: bool = False,
+    offsets: bool = False,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    encoding: str = "utf-8",
+) -> Iterator[GrepLine] | GrepLine | int | bool | None:
+    """
+    Searches the lines of *source*, a path or a file object opened for reading, for *regex*
+    compiled with *flags*. Depending on *mode*, returns an iterator of the matching lines as
+    `GrepLine` tuples (`"lines"`), the number of matching lines (`"count"`), the first matching
+    line or None (`"first"`), or whether any line matches (`"files-with-matches"`).
+    The last two stop reading at the first match. Files given by their paths are opened in
+    text mode with *encoding* for `human_regex.StringRegex`, in binary mode for `human_regex.BytesRegex`.
+    """
+    if mode not in MODES:
+        msg = f"mode must be one of {', '.join(MODES)}, not {mode!r}"
+        raise ValueError(msg)
+    if block_size < 1:
+        msg = "block_size must be positive"
+        raise ValueError(msg)
+    lines = _grep(regex, source, flags, block_size, encoding, line_numbers=line_numbers, offsets=offsets)
+    if mode == "lines":
+        return lines
+    if mode == "count":
+        return sum(1 for _ in lines)
+    # closing the generator closes the file it opened
+    with closing(lines):
+        first = next(lines, None)
+    return first if mode == "first" else first is not None
+
+
+def _grep(
+    regex, source: str | IO, flags: int, block_size: int, encoding: str, *, line_numbers: bool, offsets: bool
+) -> Iterator[GrepLine]:
+    if hasattr(source, "read"):
+        yield from _grep_file(regex, source, flags, block_size, line_numbers=line_numbers, offsets=offsets)
+        return
+    is_bytes = isinstance(regex, bytes)
+    with open(source, "rb") if is_bytes else open(source, encoding=encoding) as file:
+        yield from _grep_file(regex, file, flags, block_size, line_numbers=line_numbers, offsets=offsets)
+
+
+def _grep_file(
+    regex, file: IO, flags: int, block_size: int, *, line_numbers: bool, offsets: bool
+) -> Iterator[GrepLine]:
+    newline = b"\n" if isinstance(regex, bytes) else "\n"
+    strategy = line_strategy(regex, flags)
+    block_search = regex.compile(flags | re.MULTILINE).search
+    line_search = regex.compile(flags).search
+    prefilter = regex.prefilter
+    carry = newline[:0]
+    # number of lines and characters before the current block
+    number = 1
+    offset = 0
+    while True:
+        data = file.read(block_size)
+        if data:
+            carry += data
+            end = carry.rfind(newline) + 1
+            if not end:
+                # no complete line yet
+                continue
+            block, carry = carry[:end], carry[end:]
+            last = False
+        else:
+            if not carry:
+                return
+            block, last = carry, True
+        if not (prefilter and regex._absent(block, flags)):
+            lines = (
+                _lines_by_line(block, newline, line_search)
+                if strategy is BY_LINE
+                else _lines_in_block(block, newline, block_search, line_search, verify=strategy is VERIFY)
+            )
+            counted = 0
+            for start, stop in lines:
+                if line_numbers:
+                    number += block.count(newline, counted, start)
+                    counted = start
+                yield GrepLine(block[start:stop], number if line_numbers else None, offset + start if offsets else None)
+            if line_numbers:
+                number += block.count(newline, counted)
+        elif line_numbers:
+            number += block.count(newline)
+        offset += len(block)
+        if last:
+            return
+
+
+def _lines_in_block(
+    block: Text_Element, newline: Text_Element, block_search, line_search, *, verify: bool
+) -> Iterator[tuple[int, int]]:
+    """
+    Yields the starts and ends of the matching lines of *block*, found by searching the whole block.
+    With *verify*, each line is confirmed by a search of the line alone.
+    """
+    # a line break at the end of the block is not followed by another line
+    end = len(block) - 1 if block.endswith(newline) else len(block)
+    position = 0
+    while position <= end:
+        match = block_search(block, position, end)
+        if match is None:
+            return
+        hit = match.start()
+        start = block.rfind(newline, 0, hit) + 1
+        stop = block.find(newline, hit, end)
+        if stop == -1:
+            stop = end
+        if (match.end() <= stop and not verify) or line_search(block[start:stop]):
+            yield start, stop
+        position = stop + 1
+
+
+def _lines_by_line(block: Text_Element, newline: Text_Element, line_search) -> Iterator[tuple[int, int]]:
+    """
+    Yields the starts and ends of the lines of *block* which *line_search* finds a match in.
+    """
+    if block.endswith(newline):
+        block = block[:-1]
+    start = 0
+    for line in block.split(newline):
+        stop = start + len(line)
+        if line_search(line):
+            yield start, stop
+        start = stop + 1
+
+
+BLOCK = "block"
+"""
+@private
+"""
+
+VERIFY = "verify"
+"""
+@private
+"""
+
+BY_LINE = "by line"
+"""
+@private
+"""
+
+
+def line_strategy(regex, flags: int = 0) -> str:
+    """
+    @private
+    How the lines matching *regex* are found. With `BLOCK`, a line matches if a search of the
+    whole block with `re.MULTILINE` finds a match starting on it which either ends on it, or which
+    a search of the line alone confirms. That holds for backtracking searches which cannot see
+    beyond the line. With `VERIFY`, lookaheads might see the next line and `\\B` matches in empty
+    lines of a block, so every match is confirmed.
+    With `BY_LINE`, the lines are searched one by one.
+    """
+    return _line_strategy(list(parse(regex, flags)))
+
+
+def _line_strategy(items: list) -> str:
+    strategy = BLOCK
+    for op, av in items:
+        if op is c.AT and av in (c.AT_BEGINNING_STRING, c.AT_END_STRING):
+            return BY_LINE
+        if op is c.ASSERT_NOT or (op is c.ASSERT and av[0] < 0):
+            return BY_LINE
+        if op is c.ATOMIC_GROUP or op is c.POSSESSIVE_REPEAT:
+            return BY_LINE
+        # \B matches in an empty line of a block, but not in the empty line alone
+        if op is c.ASSERT or (op is c.AT and av is c.AT_NON_BOUNDARY):
+            strategy = VERIFY
+        for sequence in children(op, av):
+            inner = _line_strategy(list(sequence))
+            if inner is BY_LINE:
+                return BY_LINE
+            if inner is VERIFY:
+                strategy = VERIFY
+    return strategy
@@ -0,0 +1,311 @@
+"""
+Opt-in instrumentation of the proxied `re` functions.
+
+When no listener is registered, the proxied functions only pay for checking that the list
+of listeners is empty. Listeners are callables which receive a `CallEvent` for every proxied
+call (`search`, `match`, `sub`, ...) and a `CompileEvent` for every pattern compiled by a
+`human_regex.registry.PatternRegistry`, or by `re.compile` when the pattern cache is disabled.
+
+The `record` context manager registers a `Recorder`, which collects statistics per pattern:
+
+```py
+import json
+
+from human_regex import StringRegex as Sre
+from human_regex.instrumentation import record
+
+number = Sre(r"\\d").one_or_more
+with record() as recorder:
+    for line in ("a 1", "b 22", "c"):
+        number.search(line)
+stats = recorder.to_dict()["patterns"][0]
+assert stats["pattern"] == r"\\d+"
+assert stats["calls"] == 3
+assert stats["functions"] == {"search": 3}
+assert stats["input_size"] == 8
+json.loads(recorder.to_json())
+```
+"""
+
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import NamedTuple
+
+Text_Element = str | bytes
+"""
+@private
+"""
+
+
+class CallEvent(NamedTuple):
+    """
+    A proxied call of *function* of *pattern*, which took *duration_ns* nanoseconds
+    and searched a text of *size* characters or bytes.
+    """
+
+    pattern: Text_Element
+    function: str
+    flags: int
+    duration_ns: int
+    size: int
+
+
+class CompileEvent(NamedTuple):
+    """
+    Compilation of *pattern*, which took *duration_ns* nanoseconds.
+    """
+
+    pattern: Text_Element
+    flags: int
+    duration_ns: int
+
+
+Listener = Callable[[CallEvent | CompileEvent], None]
+"""
+@private
+"""
+
+listeners: list[Listener] = []
+"""
+@private
+Registered listeners. The proxied functions check this very list, so it is only ever changed in place.
+"""
+
+_lock = threading.Lock()
+
+
+def add_listener(listener: Listener) -> None:
+    """
+    Registers *listener* to receive the events of all proxied calls and compilations.
+    """
+    with _lock:
+        listeners.append(listener)
+
+
+def remove_listener(listener: Listener) -> None:
+    """
+    Unregisters *listener*.
+    """
+    with _lock:
+        listeners.remove(listener)
+
+
+def emit(event: CallEvent | CompileEvent) -> None:
+    """
+    @private
+    """
+    for listener in tuple(listeners):
+        listener(event)
+
+
+def instrumented_compile(pattern: Text_Element, flags: int):
+    """
+    @private
+    Compiles *pattern* with `re.compile`, bypassing any `human_regex.registry.PatternRegistry`,
+    and emits a `CompileEvent` about it.
+    """
+    start = time.perf_counter_ns()
+    compiled = re.compile(pattern, flags)
+    duration = time.perf_counter_ns() - start
+    # plain str or bytes, so listeners do not keep the instances alive
+    pattern = str(pattern) if isinstance(pattern, str) else bytes(pattern)
+    emit(CompileEvent(pattern, int(flags), duration))
+    return compiled
+
+
+def instrumented_call(method, target, function: str, pattern: Text_Element, flags: int, *, args, size_position=0):
+    """
+    @private
+    Calls *method* of *target* like the proxied *function* would, and emits a `CallEvent` about it.
+    For `finditer`, the matches are found while iterating, so the event is emitted when the
+    iterator is exhausted or closed, with the time spent in it.
+    """
+    string = args[size_position] if len(args) > size_position else ""
+    try:
+        size = len(string)
+    except TypeError:
+        size = 0
+    # plain str or bytes, so listeners do not keep the instances alive
+    pattern = str(pattern) if isinstance(pattern, str) else bytes(pattern)
+    event = CallEvent(pattern, function, int(flags), 0, size)
+    start = time.perf_counter_ns()
+    try:
+        result = method(target, *args)
+    except BaseException:
+        emit(event._replace(duration_ns=time.perf_counter_ns() - start))
+        raise
+    duration = time.perf_counter_ns() - start
+    if function == "finditer":
+        return _TimedIterator(result, event, duration)
+    emit(event._replace(duration_ns=duration))
+    return result
+
+
+class _TimedIterator:
+    """
+    Adds up the time spent in *iterator* and emits *event* with it once the iterator is done.
+    """
+
+    __slots__ = ("duration", "event", "iterator")
+
+    def __init__(self, iterator: Iterator, event: CallEvent, duration: int) -> None:
+        self.iterator = iterator
+        self.event: CallEvent | None = event
+        self.duration = duration
+
+    def __iter__(self) -> "_TimedIterator":
+        return self
+
+    def __next__(self):
+        if self.event is None:
+            raise StopIteration
+        start = time.perf_counter_ns()
+        try:
+            match = next(self.iterator)
+        except BaseException:
+            self.duration += time.perf_counter_ns() - start
+            self.close()
+            raise
+        self.duration += time.perf_counter_ns() - start
+        return match
+
+    def close(self) -> None:
+        """
+        Emits the event, if that was not done yet.
+        """
+        event, self.event = self.event, None
+        if event is not None:
+            emit(event._replace(duration_ns=self.duration))
+
+    def __del__(self) -> None:
+        self.close()
+
+
+class PatternStats:
+    """
+    Statistics of the calls of one pattern collected by a `Recorder`.
+    """
+
+    __slots__ = ("calls", "compile_ns", "compiles", "functions", "input_size", "max_ns", "samples", "total_ns")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.input_size = 0
+        self.compiles = 0
+        self.compile_ns = 0
+        self.functions: dict[str, int] = {}
+        self.samples: list[int] = []
+        """
+        Durations of (a uniform sample of) the calls, for the percentiles.
+        """
+
+    def percentile(self, fraction: float) -> int:
+        """
+        Duration in nanoseconds below which *fraction* of the sampled calls finished.
+        """
+        if not self.samples:
+            return 0
+        ordered = sorted(self.samples)
+        return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+class Recorder:
+    """
+    A listener collecting `PatternStats` for every pattern. At most *max_samples* durations
+    are kept per pattern for the percentiles, chosen by reservoir sampling.
+    """
+
+    def __init__(self, max_samples: int = 10_000) -> None:
+        self.max_samples = max_samples
+        self.stats: dict[tuple[Text_Element, int], PatternStats] = {}
+        """
+        Statistics per pattern and flags.
+        """
+        self._lock = threading.Lock()
+        # recorders are rarely used, so random and json are only imported by them
+        import random  # noqa: PLC0415 (only recorders use it)
+
+        self._random = random.Random(0)  # noqa: S311 (samples durations, no secrets)
+
+    def __call__(self, event: CallEvent | CompileEvent) -> None:
+        with self._lock:
+            stats = self.stats.get((event.pattern, event.flags))
+            if stats is None:
+                stats = self.stats[(event.pattern, event.flags)] = PatternStats()
+            if isinstance(event, CompileEvent):
+                stats.compiles += 1
+                stats.compile_ns += event.duration_ns
+                return
+            stats.calls += 1
+            stats.total_ns += event.duration_ns
+            stats.max_ns = max(stats.max_ns, event.duration_ns)
+            stats.input_size += event.size
+            stats.functions[event.function] = stats.functions.get(event.function, 0) + 1
+            if len(stats.samples) < self.max_samples:
+                stats.samples.append(event.duration_ns)
+            else:
+                index = self._random.randrange(stats.calls)
+                if index < self.max_samples:
+                    stats.samples[index] = event.duration_ns
+
+    def reset(self) -> None:
+        """
+        Forgets all collected statistics.
+        """
+        with self._lock:
+            self.stats.clear()
+
+    def to_dict(self) -> dict:
+        """
+        Exports the statistics, patterns with the greatest total time first.
+        `bytes` patterns are decoded as Latin-1 and marked by their *type*.
+        """
+        with self._lock:
+            items = sorted(self.stats.items(), key=lambda item: item[1].total_ns, reverse=True)
+            patterns = [
+                {
+                    "pattern": pattern.decode("latin-1") if isinstance(pattern, bytes) else pattern,
+                    "type": type(pattern).__name__,
+                    "flags": int(flags),
+                    "calls": stats.calls,
+                    "functions": dict(stats.functions),
+                    "total_ns": stats.total_ns,
+                    "mean_ns": stats.total_ns // stats.calls if stats.calls else 0,
+                    "p50_ns": stats.percentile(0.5),
+                    "p90_ns": stats.percentile(0.9),
+                    "p99_ns": stats.percentile(0.99),
+                    "max_ns": stats.max_ns,
+                    "input_size": stats.input_size,
+                    "compiles": stats.compiles,
+                    "compile_ns": stats.compile_ns,
+                }
+                for (pattern, flags), stats in items
+            ]
+        return {"patterns": patterns}
+
+    def to_json(self, **kwargs) -> str:
+        """
+        Exports the statistics as JSON, *kwargs* are passed to `json.dumps`.
+        """
+        import json  # noqa: PLC0415 (only the export uses it)
+
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+@contextmanager
+def record(recorder: Recorder | None = None) -> Iterator[Recorder]:
+    """
+    Collects statistics of all proxied calls made within the `with` block
+    into *recorder*, or into a new `Recorder`.
+    """
+    recorder = Recorder() if recorder is None else recorder
+    add_listener(recorder)
+    try:
+        yield recorder
+    finally:
+        remove_listener(recorder)
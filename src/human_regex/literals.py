@@ -0,0 +1,164 @@
+"""
+Literal substrings which every match of a pattern contains, and a prefilter built on them.
+
+Many patterns contain literal text between their variable parts, like `" with "` here:
+
+```py
+from human_regex import StringRegex as Sre
+
+word = Sre(r"\\w").one_or_more
+sre = word.named("burger") + " with " + word.named("extra")
+assert sre.required_literals() == (" with ",)
+assert sre.search("quarterpounder and cheese") is None
+assert sre.search("quarterpounder with cheese").group("extra") == "cheese"
+```
+
+A text which does not contain a required literal cannot match. Before running the regular
+expression engine, the proxied `search`, `findall` and `finditer` (as well as `search_file`
+and `finditer_file` of `human_regex.BytesRegex`) look for the longest required literal with
+`str.find` or `bytes.find`, which scan for it at the speed of `memchr`. Texts without it are
+rejected right away. Literals the pattern starts with are not looked for, as `re` already
+scans for literal prefixes by itself. `match` and `fullmatch` are not prefiltered: they
+usually fail at the start of a text, without reading all of it.
+
+The literals are found in the syntax tree of the pattern (see `human_regex.syntax`): runs of
+literal characters, including those in groups and in repetitions of at least one, and in
+positive lookarounds. Alternatives, optional parts and case-insensitive parts contribute none.
+Set `prefilter` to False on an instance or a class to turn the prefilter off.
+"""
+
+from functools import lru_cache
+from re import _constants as c
+
+from .registry import make_key
+from .syntax import REPEATS, parse
+
+Text_Element = str | bytes
+"""
+@private
+"""
+
+CASELESS_FLAGS = c.SRE_FLAG_IGNORECASE | c.SRE_FLAG_LOCALE
+"""
+@private
+Flags under which literal characters match more than themselves.
+"""
+
+CACHE_SIZE = 4096
+"""
+@private
+Number of patterns whose literals are remembered.
+"""
+
+
+def required_literals(pattern: Text_Element, flags: int = 0) -> tuple[Text_Element, ...]:
+    """
+    Returns the literal substrings every match of *pattern* compiled with *flags* contains,
+    longest first. Literals contained in other returned literals are left out.
+    """
+    return _analyze(*make_key(pattern, flags))[0]
+
+
+def prefilter_literal(pattern: Text_Element, flags: int = 0) -> Text_Element | None:
+    """
+    @private
+    The literal the prefilter looks for: the longest required literal, or None if there is none,
+    or if *pattern* starts with it.
+    """
+    return _analyze(*make_key(pattern, flags))[1]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _analyze(pattern: Text_Element, flags: int) -> tuple[tuple[Text_Element, ...], Text_Element | None]:
+    tree = parse(pattern, flags)
+    runs, exact = _sequence(list(tree), tree.state.flags)
+    if exact is not None:
+        runs = [exact]
+    join = bytes if isinstance(pattern, bytes) else lambda run: "".join(map(chr, run))
+    texts = []
+    for text in sorted(map(join, runs), key=len, reverse=True):
+        if text and not any(text in longer for longer in texts):
+            texts.append(text)
+    if not texts:
+        return (), None
+    longest = texts[0]
+    if _starts_with_literal(list(tree), tree.state.flags) and join(runs[0]) == longest:
+        # the runs are in the order of the pattern, the first one is its literal prefix
+        return tuple(texts), None
+    return tuple(texts), longest
+
+
+def _sequence(items: list, flags: int) -> tuple[list[list[int]], list[int] | None]:
+    """
+    Returns the runs of literal characters which every match of *items* contains, in the order
+    of the pattern, and the characters of the whole match if *items* always match the same text.
+    """
+    runs = []
+    asserted = []
+    run = []
+    exact = True
+
+    def flush():
+        if run:
+            runs.append(run[:])
+            run.clear()
+
+    for op, av in items:
+        if op is c.LITERAL and not flags & CASELESS_FLAGS:
+            run.append(av)
+        elif op is c.AT or op is c.ASSERT_NOT:
+            # zero-width, the characters around them are still adjacent
+            continue
+        elif op is c.ASSERT:
+            # the text of a positive lookaround is in the string, though not necessarily here
+            inner_runs, inner_exact = _sequence(av[1], flags)
+            asserted.extend([inner_exact] if inner_exact is not None else inner_runs)
+            exact = False
+        elif op is c.SUBPATTERN or op is c.ATOMIC_GROUP:
+            if op is c.SUBPATTERN:
+                _, add_flags, del_flags, content = av
+                inner_flags = (flags | add_flags) & ~del_flags
+            else:
+                content, inner_flags = av, flags
+            inner_runs, inner_exact = _sequence(content, inner_flags)
+            if inner_exact is not None:
+                run.extend(inner_exact)
+            else:
+                exact = False
+                flush()
+                runs.extend(inner_runs)
+        elif op in REPEATS and av[0] >= 1:
+            minimum, maximum, content = av
+            inner_runs, inner_exact = _sequence(content, flags)
+            if inner_exact is not None and minimum == maximum:
+                run.extend(inner_exact * minimum)
+            elif inner_exact is not None and inner_exact:
+                # the first repetition follows the preceding run, the last one precedes the next run
+                exact = False
+                run.extend(inner_exact * minimum)
+                flush()
+                run.extend(inner_exact * minimum)
+            else:
+                exact = False
+                flush()
+                runs.extend(inner_runs)
+        else:
+            exact = False
+            flush()
+    if exact:
+        return [], run
+    flush()
+    return runs + asserted, None
+
+
+def _starts_with_literal(items: list, flags: int) -> bool:
+    """
+    Whether *items* start with a literal character `re` can scan for.
+    """
+    for op, av in items:
+        if op is c.AT:
+            continue
+        if op is c.SUBPATTERN and not av[1] and not av[2]:
+            return _starts_with_literal(av[3], flags)
+        return op is c.LITERAL and not flags & CASELESS_FLAGS
+    return False
@@ -0,0 +1,171 @@
+"""
+Match objects which are not produced directly by the `re` module.
+
+`re.Match` objects can neither be created outside of `re`, nor shifted to other positions,
+nor pickled. Where `human_regex` reports matches found in pieces of a larger text, or
+matches found in another process, it uses `DetachedMatch` instead, which offers the reading
+part of the `re.Match` interface.
+"""
+
+import re
+from re import _parser
+
+Text_Element = str | bytes
+"""
+@private
+"""
+
+
+class DetachedMatch:
+    """
+    A match with the interface of `re.Match`, whose positions are shifted by *offset*.
+
+    *string* is the text the regular expression was run over. For matches found in a stream,
+    it is only the part of the stream which begins at *offset*. *lastindex* is the group which
+    the engine closed last, None if no group was closed; if it is not given, it is guessed from
+    the spans, which is ambiguous when groups end at the same position.
+    """
+
+    __slots__ = ("endpos", "lastgroup", "lastindex", "offset", "pos", "re", "regs", "string")
+
+    def __init__(
+        self,
+        string: Text_Element,
+        pattern: re.Pattern,
+        regs: tuple[tuple[int, int], ...],
+        *,
+        offset: int = 0,
+        pos: int = 0,
+        endpos: int | None = None,
+        lastindex: int | None = -1,
+    ) -> None:
+        self.string = string
+        self.re = pattern
+        self.offset = offset
+        self.regs = regs
+        """
+        Spans of all groups, relative to *string*.
+        """
+        self.pos = pos
+        self.endpos = len(string) if endpos is None else endpos
+        if lastindex == -1:
+            # the last group closed is taken to be the matched group with the greatest end,
+            # among those the one opened first
+            lastindex = None
+            for index in range(1, len(regs)):
+                start, end = regs[index]
+                if start >= 0 and (lastindex is None or end > regs[lastindex][1]):
+                    lastindex = index
+        self.lastindex = lastindex
+        names = {index: name for name, index in pattern.groupindex.items()}
+        self.lastgroup = names.get(lastindex)
+
+    @classmethod
+    def from_match(cls, match: re.Match, offset: int = 0) -> "DetachedMatch":
+        """
+        Copies *match*, shifting its positions by *offset*.
+        """
+        detached = cls.__new__(cls)
+        detached.string = match.string
+        detached.re = match.re
+        detached.offset = offset
+        detached.regs = match.regs
+        detached.lastindex = match.lastindex
+        detached.lastgroup = match.lastgroup
+        detached.pos = match.pos
+        detached.endpos = match.endpos
+        return detached
+
+    def compact(self) -> "DetachedMatch":
+        """
+        Returns a copy which keeps only the part of *string* covered by the groups of the match,
+        e.g. before sending the match to another process.
+        """
+        spans = [span for span in self.regs if span[0] >= 0]
+        low = min(start for start, _ in spans)
+        high = max(end for _, end in spans)
+        compacted = DetachedMatch.__new__(DetachedMatch)
+        compacted.string = self.string[low:high]
+        compacted.re = self.re
+        compacted.offset = self.offset + low
+        compacted.regs = tuple((start - low, end - low) if start >= 0 else (start, end) for start, end in self.regs)
+        compacted.lastindex = self.lastindex
+        compacted.lastgroup = self.lastgroup
+        compacted.pos = max(self.pos - low, 0)
+        compacted.endpos = min(self.endpos - low, high - low)
+        return compacted
+
+    def _index(self, group: int | str) -> int:
+        if isinstance(group, int) and 0 <= group < len(self.regs):
+            return group
+        index = self.re.groupindex.get(group)
+        if index is None:
+            msg = "no such group"
+            raise IndexError(msg)
+        return index
+
+    def _group(self, group: int | str, default=None) -> Text_Element | None:
+        start, end = self.regs[self._index(group)]
+        if start < 0:
+            return default
+        return self.string[start:end]
+
+    def group(self, *groups: int | str) -> Text_Element | tuple[Text_Element | None, ...] | None:
+        if not groups:
+            return self._group(0)
+        if len(groups) == 1:
+            return self._group(groups[0])
+        return tuple(self._group(group) for group in groups)
+
+    def expand(self, template: Text_Element) -> Text_Element:
+        """
+        Returns *template* with its backslash escapes and group references replaced, like `re.Match.expand`.
+        """
+        return expand_template(compile_template(template, self.re), self)
+
+    def __getitem__(self, group: int | str) -> Text_Element | None:
+        return self._group(group)
+
+    def groups(self, default=None) -> tuple[Text_Element | None, ...]:
+        return tuple(self._group(index, default) for index in range(1, len(self.regs)))
+
+    def groupdict(self, default=None) -> dict[str, Text_Element | None]:
+        return {name: self._group(index, default) for name, index in self.re.groupindex.items()}
+
+    def start(self, group: int | str = 0) -> int:
+        start = self.regs[self._index(group)][0]
+        return start if start < 0 else start + self.offset
+
+    def end(self, group: int | str = 0) -> int:
+        end = self.regs[self._index(group)][1]
+        return end if end < 0 else end + self.offset
+
+    def span(self, group: int | str = 0) -> tuple[int, int]:
+        return self.start(group), self.end(group)
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} object; span={self.span()!r}, match={self.group()!r}>"
+
+
+def compile_template(template: Text_Element, pattern) -> tuple | list:
+    """
+    @private
+    Parses the replacement *template* for *pattern*, an object with the `groups` and `groupindex` of `re.Pattern`.
+    """
+    return _parser.parse_template(template, pattern)
+
+
+def expand_template(template: tuple | list, match) -> Text_Element:
+    """
+    @private
+    Expands *template*, parsed by `compile_template`, with the groups of *match*.
+    """
+    if isinstance(template, tuple):
+        # before Python 3.12, a template is a pair of group references and literals
+        return _parser.expand_template(template, match)
+    # literals and group numbers alternate
+    empty = match.string[:0]
+    return empty.join(item if index % 2 == 0 else match.group(item) or empty for index, item in enumerate(template))
@@ -0,0 +1,709 @@
+"""
+A structured representation of regular expressions as trees of immutable nodes.
+
+Every `human_regex.StringRegex` and `human_regex.BytesRegex` has a `node` attribute: the tree of
+`Literal`, `Set`, `Group`, `Lookaround`, `Quantifier`, `Alternation`, `Backreference`
+and `Conditional` nodes (and a few more) which the expression is made of. The tree follows
+the text of the expression, so a non-capturing group stays a `Group` and `a|b` stays an `Alternation`,
+unlike the syntax tree of `re` (see `human_regex.syntax`), which is simplified while it is parsed.
+
+Nodes are hash-consed: constructing a node equal to an existing one returns the existing node,
+so shared sub-patterns are stored once, and nodes are compared and hashed by identity,
+which makes them cheap cache keys.
+
+```py
+from human_regex import StringRegex as Sre
+from human_regex.nodes import Group, Literal, Quantifier, Sequence
+
+digits = Sre(r"\\d").one_or_more
+sre = Sre("v") + digits.named("major") + r"\\." + digits.named("minor")
+major, minor = sre.node.items[1], sre.node.items[3]
+assert isinstance(major, Group) and major.name == "major"
+assert major.content is minor.content
+assert isinstance(major.content, Quantifier) and major.content.minimum == 1
+assert Sre("ab").one_or_more.node is Sequence((Literal("a"), Quantifier(Literal("b"), 1, None)))
+assert Sre.from_node(sre.node) == r"v(?P<major>\\d+)\\.(?P<minor>\\d+)"
+```
+
+By default, the tree is parsed from the text when `node` is first used. With the class attribute
+`build_nodes` set to True, the combinators of `human_regex.bases.general_regex.GeneralRegexBase`
+build the nodes of their results from the nodes of their operands, alongside the text, so only
+the expressions created from text are ever parsed (once per distinct text). The nodes describe what
+an expression means when compiled without flags, apart from those given inline in the expression.
+"""
+
+import re
+import threading
+import weakref
+from functools import lru_cache
+from re import _parser
+
+from . import syntax
+
+Text_Element = str | bytes
+"""
+@private
+"""
+
+PARSE_CACHE_SIZE = 4096
+"""
+@private
+Number of distinct texts whose trees are remembered.
+"""
+
+WHITESPACE = frozenset(" \t\n\r\v\f")
+"""
+@private
+Whitespace ignored in verbose patterns.
+"""
+
+QUANTIFIER = re.compile(r"\{(\d*)(?:(,)(\d*))?\}")
+"""
+@private
+"""
+
+_interned: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+_lock = threading.Lock()
+
+
+class Node:
+    """
+    Base class of the nodes. Nodes are immutable and hash-consed, so equal nodes are identical.
+    """
+
+    __slots__ = ("__weakref__",)
+
+    _fields: tuple[str, ...] = ()
+
+    @classmethod
+    def _intern(cls, *values):
+        key = (cls, *values)
+        with _lock:
+            node = _interned.get(key)
+            if node is None:
+                node = object.__new__(cls)
+                for field, value in zip(cls._fields, values, strict=True):
+                    object.__setattr__(node, field, value)
+                _interned[key] = node
+        return node
+
+    def __setattr__(self, name, value):
+        msg = f"{type(self).__name__} nodes are immutable"
+        raise AttributeError(msg)
+
+    def __reduce__(self):
+        return _restore, (type(self), tuple(getattr(self, field) for field in self._fields))
+
+    def __repr__(self) -> str:
+        first, *others = self._fields
+        values = [repr(getattr(self, first)), *(f"{field}={getattr(self, field)!r}" for field in others)]
+        return f"{type(self).__name__}({', '.join(values)})"
+
+
+def _restore(cls, values):
+    return cls._intern(*values)
+
+
+def _plain(text: Text_Element) -> Text_Element:
+    return str(text) if isinstance(text, str) else bytes(text)
+
+
+class Literal(Node):
+    """
+    Characters matching themselves. *text* is not escaped.
+    """
+
+    __slots__ = ("text",)
+    _fields = ("text",)
+
+    def __new__(cls, text: Text_Element):
+        return cls._intern(_plain(text))
+
+
+class Atom(Node):
+    """
+    A class of single characters given by an escape sequence or a dot, like `\\d` or `.`.
+    """
+
+    __slots__ = ("text",)
+    _fields = ("text",)
+
+    def __new__(cls, text: Text_Element):
+        return cls._intern(_plain(text))
+
+
+class Anchor(Node):
+    """
+    A position rather than characters, like `^`, `$` or `\\b`.
+    """
+
+    __slots__ = ("text",)
+    _fields = ("text",)
+
+    def __new__(cls, text: Text_Element):
+        return cls._intern(_plain(text))
+
+
+class Set(Node):
+    """
+    A character set `[...]`, with its content *text* in the syntax of sets.
+    """
+
+    __slots__ = ("negated", "text")
+    _fields = ("text", "negated")
+
+    def __new__(cls, text: Text_Element, negated: bool = False):  # noqa: FBT001, FBT002
+        return cls._intern(_plain(text), bool(negated))
+
+
+class Group(Node):
+    """
+    A group around *content*: capturing (named if *name* is given), non-capturing,
+    atomic, or non-capturing with scoped inline *flags* like `"s-i"`.
+    """
+
+    __slots__ = ("atomic", "capture", "content", "flags", "name")
+    _fields = ("content", "name", "capture", "atomic", "flags")
+
+    def __new__(
+        cls,
+        content: Node,
+        name: Text_Element | None = None,
+        *,
+        capture: bool = True,
+        atomic: bool = False,
+        flags: Text_Element | None = None,
+    ):
+        if name is not None:
+            name = _plain(name)
+        if flags is not None:
+            flags = _plain(flags)
+        capture = bool(capture) and not atomic and flags is None
+        return cls._intern(content, name, capture, bool(atomic), flags)
+
+
+class Lookaround(Node):
+    """
+    A lookahead or, if *behind*, a lookbehind assertion of *content*, negative if *negative*.
+    """
+
+    __slots__ = ("behind", "content", "negative")
+    _fields = ("content", "behind", "negative")
+
+    def __new__(cls, content: Node, *, behind: bool = False, negative: bool = False):
+        return cls._intern(content, bool(behind), bool(negative))
+
+
+class Quantifier(Node):
+    """
+    Repetition of *content* from *minimum* to *maximum* times, or any number of times if *maximum* is None.
+    *mode* is `"greedy"`, `"lazy"` or `"possessive"`.
+    """
+
+    __slots__ = ("content", "maximum", "minimum", "mode")
+    _fields = ("content", "minimum", "maximum", "mode")
+
+    def __new__(cls, content: Node, minimum: int, maximum: int | None, mode: str = "greedy"):
+        return cls._intern(content, minimum, maximum, mode)
+
+
+class Alternation(Node):
+    """
+    Alternatives tried from left to right.
+    """
+
+    __slots__ = ("alternatives",)
+    _fields = ("alternatives",)
+
+    def __new__(cls, alternatives):
+        return cls._intern(tuple(alternatives))
+
+
+class Sequence(Node):
+    """
+    Nodes matched one after another. The empty sequence matches the empty string.
+    """
+
+    __slots__ = ("items",)
+    _fields = ("items",)
+
+    def __new__(cls, items):
+        return cls._intern(tuple(items))
+
+
+class Backreference(Node):
+    """
+    The text matched by the group *group*, given by its name or number.
+    """
+
+    __slots__ = ("group",)
+    _fields = ("group",)
+
+    def __new__(cls, group: int | Text_Element):
+        return cls._intern(group if isinstance(group, int) else _plain(group))
+
+
+class Conditional(Node):
+    """
+    *yes* if the group *group* (a name or number) matched, *no* otherwise.
+    """
+
+    __slots__ = ("group", "no", "yes")
+    _fields = ("group", "yes", "no")
+
+    def __new__(cls, group: int | Text_Element, yes: Node, no: Node | None = None):
+        return cls._intern(group if isinstance(group, int) else _plain(group), yes, no)
+
+
+class Flags(Node):
+    """
+    Inline flags like `(?mi)` at the start of an expression, given by their letters.
+    """
+
+    __slots__ = ("letters",)
+    _fields = ("letters",)
+
+    def __new__(cls, letters: Text_Element):
+        return cls._intern(_plain(letters))
+
+
+EMPTY = Sequence(())
+"""
+@private
+"""
+
+QUANTIFIABLE = (Literal, Atom, Set, Group, Lookaround, Backreference, Conditional)
+"""
+@private
+Nodes which are rendered as a single atom, as long as a `Literal` has a single character.
+"""
+
+
+def parse(pattern: Text_Element, flags: int = 0) -> Node:
+    """
+    Returns the tree of *pattern*. Raises `re.error` if *pattern* is invalid.
+    Of *flags*, only `re.VERBOSE` changes the tree.
+    """
+    node = _parsed(_plain(pattern), int(flags) & re.VERBOSE)
+    if node is None:
+        syntax.parse(pattern, flags)
+    return node
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parsed(pattern: Text_Element, flags: int) -> Node | None:
+    try:
+        state = syntax.parse(pattern, flags).state
+    except re.error:
+        return None
+    return _Parser(pattern, state, verbose=bool(flags & re.VERBOSE)).parse()
+
+
+def node_of(element) -> Node | None:
+    """
+    @private
+    The node of *element*, or None if it is not a valid regular expression.
+    """
+    if not isinstance(element, str | bytes):
+        element = element.render()
+    attributes = getattr(element, "__dict__", None)
+    if attributes is not None and "_node" in attributes:
+        return attributes["_node"]
+    node = _parsed(_plain(element), 0)
+    if attributes is not None:
+        attributes["_node"] = node
+    return node
+
+
+def render(node: Node) -> str:
+    """
+    Renders *node* into the text of a regular expression, bytes being decoded with latin-1.
+    See `human_regex.bases.general_regex.GeneralRegexBase.from_node`.
+    """
+    if isinstance(node, Sequence):
+        return _render_sequence(node.items)
+    if isinstance(node, Literal):
+        return re.escape(_text(node.text))
+    if isinstance(node, Atom | Anchor):
+        return _text(node.text)
+    if isinstance(node, Set):
+        return f"[{'^' if node.negated else ''}{_text(node.text)}]"
+    if isinstance(node, Alternation):
+        return "|".join(render(alternative) for alternative in node.alternatives)
+    if isinstance(node, Group):
+        content = render(node.content)
+        if node.atomic:
+            return f"(?>{content})"
+        if node.name is not None:
+            return f"(?P<{_text(node.name)}>{content})"
+        if node.capture:
+            return f"({content})"
+        return f"(?{_text(node.flags or '')}:{content})"
+    if isinstance(node, Lookaround):
+        kind = ("<" if node.behind else "") + ("!" if node.negative else "=")
+        return f"(?{kind}{render(node.content)})"
+    if isinstance(node, Quantifier):
+        return _render_quantifier(node)
+    if isinstance(node, Backreference):
+        return f"\\{node.group}" if isinstance(node.group, int) else f"(?P={_text(node.group)})"
+    if isinstance(node, Conditional):
+        no = "" if node.no is None else "|" + _render_grouped(node.no)
+        return f"(?({_text(node.group)}){_render_grouped(node.yes)}{no})"
+    if isinstance(node, Flags):
+        return f"(?{_text(node.letters)})"
+    msg = f"cannot render {node!r}"
+    raise TypeError(msg)
+
+
+def _text(text) -> str:
+    if isinstance(text, bytes):
+        return text.decode("latin-1")
+    return str(text)
+
+
+def _render_sequence(items) -> str:
+    parts = []
+    for index, item in enumerate(items):
+        text = _render_grouped(item)
+        if isinstance(item, Backreference) and isinstance(item.group, int) and index + 1 < len(items):
+            following = items[index + 1]
+            if isinstance(following, Literal) and _text(following.text)[:1].isdigit():
+                # \1 followed by 0 would be read as \10
+                text = f"(?:{text})"
+        parts.append(text)
+    return "".join(parts)
+
+
+def _render_grouped(node: Node) -> str:
+    text = render(node)
+    return f"(?:{text})" if isinstance(node, Alternation) else text
+
+
+def _render_quantifier(node: Quantifier) -> str:
+    content = node.content
+    text = render(content)
+    if not isinstance(content, QUANTIFIABLE) or (isinstance(content, Literal) and len(content.text) != 1):
+        text = f"(?:{text})"
+    minimum, maximum = node.minimum, node.maximum
+    if (minimum, maximum) == (0, None):
+        quantifier = "*"
+    elif (minimum, maximum) == (1, None):
+        quantifier = "+"
+    elif (minimum, maximum) == (0, 1):
+        quantifier = "?"
+    elif minimum == maximum:
+        quantifier = f"{{{minimum}}}"
+    elif maximum is None:
+        quantifier = f"{{{minimum},}}"
+    else:
+        quantifier = f"{{{minimum},{maximum}}}"
+    suffix = {"greedy": "", "lazy": "?", "possessive": "+"}[node.mode]
+    return text + quantifier + suffix
+
+
+# Building nodes alongside the text. Each of these functions returns the node of the text which
+# the corresponding combinator produces, or None if it does not know it, e.g. because the text
+# is not a valid regular expression or one of the operands is None.
+
+
+def concatenation(nodes) -> Node | None:
+    """
+    @private
+    The node of the concatenated texts of *nodes*. Alternations are not grouped,
+    so `a|b` followed by `c` is `a|bc`.
+    """
+    branches = [[]]
+    for node in nodes:
+        if node is None:
+            return None
+        if _starts_with_flags(node) and (len(branches) > 1 or any(item is not EMPTY for item in branches[0])):
+            # global flags must be at the start of the expression
+            return None
+        if isinstance(node, Alternation):
+            first, *rest = node.alternatives
+            branches[-1].append(first)
+            branches.extend([alternative] for alternative in rest)
+        else:
+            branches[-1].append(node)
+    alternatives = [sequence(branch) for branch in branches]
+    return alternatives[0] if len(alternatives) == 1 else Alternation(alternatives)
+
+
+def _starts_with_flags(node: Node) -> bool:
+    if isinstance(node, Sequence):
+        return bool(node.items) and isinstance(node.items[0], Flags)
+    if isinstance(node, Alternation):
+        return _starts_with_flags(node.alternatives[0])
+    return isinstance(node, Flags)
+
+
+def sequence(nodes) -> Node:
+    """
+    @private
+    Nested sequences are flattened and adjacent literals merged. A sequence of a single node is the node.
+    """
+    items = []
+    for node in nodes:
+        for item in node.items if isinstance(node, Sequence) else (node,):
+            if isinstance(item, Literal) and items and isinstance(items[-1], Literal):
+                items[-1] = Literal(items[-1].text + item.text)
+            else:
+                items.append(item)
+    return items[0] if len(items) == 1 else Sequence(items)
+
+
+def quantified(node: Node | None, minimum: int, maximum: int | None, suffix: str | None = None) -> Node | None:
+    """
+    @private
+    The node of *node* followed by a quantifier. Like in the text, the quantifier applies to the last atom.
+    *suffix* is the single character `*`, `+` or `?` the quantifier was written with, if any,
+    which after another quantifier makes it lazy (`?`) or possessive (`+`).
+    """
+    if node is None:
+        return None
+    if isinstance(node, Alternation):
+        last = quantified(node.alternatives[-1], minimum, maximum, suffix)
+        return None if last is None else Alternation((*node.alternatives[:-1], last))
+    if isinstance(node, Sequence):
+        if not node.items:
+            return None
+        last = quantified(node.items[-1], minimum, maximum, suffix)
+        return None if last is None else sequence((*node.items[:-1], last))
+    if isinstance(node, Literal) and len(node.text) > 1:
+        return sequence((Literal(node.text[:-1]), Quantifier(Literal(node.text[-1:]), minimum, maximum)))
+    if isinstance(node, Quantifier):
+        if node.mode == "greedy" and suffix == "?":
+            return Quantifier(node.content, node.minimum, node.maximum, "lazy")
+        if node.mode == "greedy" and suffix == "+":
+            return Quantifier(node.content, node.minimum, node.maximum, "possessive")
+        return None
+    if isinstance(node, QUANTIFIABLE):
+        return Quantifier(node, minimum, maximum)
+    return None
+
+
+def group(content: Node | None, *args, **kwargs) -> Group | None:
+    """
+    @private
+    """
+    return None if content is None else Group(content, *args, **kwargs)
+
+
+def lookaround(content: Node | None, **kwargs) -> Lookaround | None:
+    """
+    @private
+    """
+    return None if content is None else Lookaround(content, **kwargs)
+
+
+def conditional(group_id: int | Text_Element, yes: Node | None, no: Node | None) -> Conditional | None:
+    """
+    @private
+    """
+    # an alternation would end the yes branch early or add a third branch
+    if yes is None or isinstance(yes, Alternation) or isinstance(no, Alternation):
+        return None
+    if not isinstance(group_id, int) and _text(group_id).isdigit():
+        group_id = int(group_id)
+    return Conditional(group_id, yes, no)
+
+
+def backreference(name: Text_Element) -> Backreference | None:
+    """
+    @private
+    """
+    return Backreference(name) if _text(name).isidentifier() else None
+
+
+def comment(text: Text_Element) -> Sequence | None:
+    """
+    @private
+    A comment matches the empty string, unless a parenthesis in it ends the comment early.
+    """
+    return None if ")" in _text(text) else EMPTY
+
+
+def character_set(text: Text_Element) -> Set | None:
+    """
+    @private
+    The node of *text* put in brackets, unless a bracket in it ends the set early.
+    """
+    text = _plain(text)
+    content = _text(text)
+    negated = content.startswith("^")
+    if negated:
+        content = content[1:]
+    index = 0
+    while index < len(content):
+        character = content[index]
+        if character == "\\":
+            index += 1
+        elif character == "]" and index:
+            return None
+        index += 1
+    if not content:
+        return None
+    return Set(text[1:] if negated else text, negated)
+
+
+class _Parser:
+    """
+    Parses the text of a valid pattern into nodes, following its text more closely than the parser of `re`.
+    """
+
+    def __init__(self, pattern: Text_Element, state, *, verbose: bool) -> None:
+        self.is_bytes = isinstance(pattern, bytes)
+        self.source = _parser.Tokenizer(pattern)
+        self.state = state
+        self.verbose = verbose
+
+    def parse(self) -> Node:
+        return self.alternation(self.verbose)
+
+    def native(self, text: str) -> Text_Element:
+        return text.encode("latin-1") if self.is_bytes else text
+
+    def alternation(self, verbose: bool) -> Node:  # noqa: FBT001
+        alternatives = [self.sequence(verbose)]
+        while self.source.match("|"):
+            alternatives.append(self.sequence(verbose))
+        return alternatives[0] if len(alternatives) == 1 else Alternation(alternatives)
+
+    def sequence(self, verbose: bool) -> Node:  # noqa: FBT001
+        source = self.source
+        items = []
+        while True:
+            if verbose:
+                self.skip_whitespace()
+            if source.next is None or source.next in ("|", ")"):
+                return sequence(items)
+            node, verbose = self.atom(verbose)
+            if node is None:
+                if not items:
+                    continue
+                # a quantifier after a comment applies to the node before the comment
+                node = items.pop()
+            while True:
+                if verbose:
+                    self.skip_whitespace()
+                quantifier = self.quantifier()
+                if quantifier is None:
+                    break
+                node = Quantifier(node, *quantifier)
+            items.append(node)
+
+    def skip_whitespace(self) -> None:
+        source = self.source
+        while source.next is not None and (source.next in WHITESPACE or source.next == "#"):
+            if source.get() == "#":
+                while source.next is not None and source.get() != "\n":
+                    pass
+
+    def quantifier(self) -> tuple | None:
+        source = self.source
+        this = source.next
+        if this in ("*", "+", "?"):
+            source.get()
+            minimum, maximum = {"*": (0, None), "+": (1, None), "?": (0, 1)}[this]
+        elif this == "{":
+            match = QUANTIFIER.match(source.decoded_string, source.tell())
+            if match is None or match.group() == "{}":
+                return None
+            source.seek(match.end())
+            low, comma, high = match.groups()
+            minimum = int(low) if low else 0
+            maximum = (int(high) if high else None) if comma else minimum
+        else:
+            return None
+        mode = "greedy"
+        if source.match("?"):
+            mode = "lazy"
+        elif source.match("+"):
+            mode = "possessive"
+        return minimum, maximum, mode
+
+    def atom(self, verbose: bool) -> tuple[Node | None, bool]:  # noqa: FBT001
+        """
+        Returns the next node, or None for comments, and whether the rest is verbose.
+        """
+        source = self.source
+        start = source.tell()
+        this = source.get()
+        if this == "[":
+            return self.character_set(), verbose
+        if this == "(":
+            return self.group(verbose)
+        if this == ".":
+            return Atom(self.native(this)), verbose
+        if this in ("^", "$"):
+            return Anchor(self.native(this)), verbose
+        if this[0] == "\\":
+            op, av = _parser._escape(source, this, self.state)
+            text = self.native(source.decoded_string[start : source.tell()])
+            if op is syntax.c.LITERAL:
+                return Literal(self.native(chr(av))), verbose
+            if op is syntax.c.GROUPREF:
+                return Backreference(av), verbose
+            if op is syntax.c.AT:
+                return Anchor(text), verbose
+            return Atom(text), verbose
+        return Literal(self.native(this)), verbose
+
+    def character_set(self) -> Set:
+        source = self.source
+        negated = source.match("^")
+        content_start = source.tell()
+        first = True
+        while True:
+            this = source.get()
+            if this == "]" and not first:
+                break
+            if this[0] == "\\":
+                _parser._class_escape(source, this)
+            first = False
+        text = source.decoded_string[content_start : source.tell() - 1]
+        return Set(self.native(text), negated)
+
+    def group(self, verbose: bool) -> tuple[Node | None, bool]:  # noqa: FBT001
+        source = self.source
+        if not source.match("?"):
+            return self.close(Group(self.alternation(verbose))), verbose
+        this = source.get()
+        if this == ":":
+            return self.close(Group(self.alternation(verbose), capture=False)), verbose
+        if this == "P":
+            if source.match("<"):
+                name = self.native(source.getuntil(">", "group name"))
+                return self.close(Group(self.alternation(verbose), name)), verbose
+            source.match("=")
+            return Backreference(self.native(source.getuntil(")", "group name"))), verbose
+        if this == "#":
+            while source.get() != ")":
+                pass
+            return None, verbose
+        if this in ("=", "!"):
+            return self.close(Lookaround(self.alternation(verbose), negative=this == "!")), verbose
+        if this == "<":
+            negative = source.get() == "!"
+            return self.close(Lookaround(self.alternation(verbose), behind=True, negative=negative)), verbose
+        if this == ">":
+            return self.close(Group(self.alternation(verbose), atomic=True)), verbose
+        if this == "(":
+            condition = source.getuntil(")", "group name")
+            group_id = int(condition) if condition.isdigit() else self.native(condition)
+            yes = self.sequence(verbose)
+            no = self.sequence(verbose) if source.match("|") else None
+            return self.close(Conditional(group_id, yes, no)), verbose
+        # inline flags, either global like (?x) or scoped like (?s-i:...)
+        letters = this
+        while source.next not in (":", ")"):
+            letters += source.get()
+        added, _, removed = letters.partition("-")
+        if source.get() == ")":
+            return Flags(self.native(letters)), verbose or "x" in added
+        scoped = (verbose or "x" in added) and "x" not in removed
+        return self.close(Group(self.alternation(scoped), flags=self.native(letters))), verbose
+
+    def close(self, node: Node) -> Node:
+        self.source.match(")")
+        return node
@@ -0,0 +1,244 @@
+"""
+Simplifying regular expressions before they are compiled.
+
+Patterns built with combinators are full of redundancy: non-capturing groups around single atoms,
+`{1}` quantifiers, `{0,}` instead of `*`, repeated alternatives. `optimize` parses a pattern
+into the syntax tree of `re` (see `human_regex.syntax`), simplifies the tree and renders it
+back into an equivalent, but cheaper pattern:
+
+```py
+from human_regex import StringRegex as Sre
+
+digit = Sre(r"\\d")
+sre = digit.no_capture.exactly(1) + Sre("x").repeat(0, None) + (Sre("ab") | "cd" | "ab").no_capture
+assert sre == r"(?:\\d){1}x{0,}(?:ab|cd|ab)"
+assert sre.optimize() == r"\\dx*(?:ab|cd)"
+assert Sre(r"\\w").one_or_more.no_capture.one_or_more.optimize() == r"\\w+"
+assert Sre("[a-cb-f]").followed_by("a").append("[a-z]").optimize() == "[a-f]a"
+```
+
+The parser of `re` already dissolves non-capturing groups, factors out common prefixes
+of alternatives and merges alternatives of single characters into sets. On top of that, the tree is simplified by:
+
+- dropping `{1}` quantifiers,
+- merging a repetition of an unbounded repetition into one (`(?:a+)*` becomes `a*`),
+- removing duplicate and empty alternatives and merging nested alternations,
+- merging overlapping and adjacent ranges of character sets,
+- dropping lookarounds which the adjacent part of the pattern already implies (`(?=ab)abc` becomes `abc`),
+  and turning a lookahead for a single character followed by a set containing it into the character.
+
+Only transformations which neither change the groups nor where and how the pattern matches are applied.
+"""
+
+import re
+from re import _constants as c
+
+from .syntax import REPEATS, SubPattern, children, parse, render, unparse
+
+Text_Element = str | bytes
+"""
+@private
+"""
+
+MATCHER_FLAGS = c.SRE_FLAG_IGNORECASE | c.SRE_FLAG_MULTILINE | c.SRE_FLAG_DOTALL | c.SRE_FLAG_ASCII | c.SRE_FLAG_UNICODE
+"""
+@private
+Flags which change what a single character atom matches.
+"""
+
+CHARACTER_ATOMS = (c.LITERAL, c.NOT_LITERAL, c.ANY, c.IN)
+"""
+@private
+Opcodes matching exactly one character.
+"""
+
+
+def optimize(pattern: Text_Element, flags: int = 0) -> Text_Element:
+    """
+    Returns a pattern equivalent to *pattern* when compiled with *flags*, but cheaper to compile and match.
+    Returns *pattern* itself if it cannot be simplified.
+    """
+    tree = parse(pattern, flags)
+    optimizer = _Optimizer(tree)
+    items = optimizer.sequence(list(tree), tree.state.flags)
+    text = unparse(SubPattern(tree.state, items), flags)
+    if not optimizer.changed and len(text) >= len(pattern):
+        return pattern
+    return text
+
+
+class _Optimizer:
+    def __init__(self, tree: SubPattern) -> None:
+        self.is_bytes = tree.state.is_bytes
+        self.names = {index: name for name, index in tree.state.groupdict.items()}
+        self.changed = False
+
+    def sequence(self, items, flags: int) -> list:
+        result = []
+        for node in items:
+            result.extend(self.node(node, flags))
+        return self.lookarounds(result, flags)
+
+    def node(self, node: tuple, flags: int) -> list:
+        """
+        Returns the optimized nodes replacing *node*.
+        """
+        op, av = node
+        if op is c.SUBPATTERN:
+            group, add_flags, del_flags, content = av
+            content = self.sequence(content, (flags | add_flags) & ~del_flags)
+            if group is None and not add_flags and not del_flags:
+                return content
+            return [(op, (group, add_flags, del_flags, content))]
+        if op in REPEATS:
+            return self.repeat(op, *av, flags)
+        if op is c.BRANCH:
+            return self.branch([self.sequence(alternative, flags) for alternative in av[1]], flags)
+        if op is c.IN:
+            return [self.character_set(av, flags)]
+        if op is c.ATOMIC_GROUP:
+            return [(op, self.sequence(av, flags))]
+        if op is c.ASSERT or op is c.ASSERT_NOT:
+            return [(op, (av[0], self.sequence(av[1], flags)))]
+        if op is c.GROUPREF_EXISTS:
+            group, yes, no = av
+            no = None if no is None else self.sequence(no, flags)
+            return [(op, (group, self.sequence(yes, flags), no))]
+        return [node]
+
+    def repeat(self, op, minimum: int, maximum: int, content, flags: int) -> list:
+        content = self.sequence(content, flags)
+        if (minimum, maximum) == (1, 1) and op is not c.POSSESSIVE_REPEAT:
+            self.changed = True
+            return content
+        if op is c.MAX_REPEAT and minimum <= 1 and maximum == c.MAXREPEAT and len(content) == 1:
+            inner_op, inner_av = content[0]
+            if inner_op is c.MAX_REPEAT and inner_av[0] <= 1 and inner_av[1] in (1, c.MAXREPEAT):
+                # every number of repetitions of the inner one is reached in the same order of preference
+                self.changed = True
+                return [(op, (min(minimum, inner_av[0]), c.MAXREPEAT, inner_av[2]))]
+        return [(op, (minimum, maximum, content))]
+
+    def branch(self, alternatives: list[list], flags: int) -> list:
+        unique = []
+        for alternative in alternatives:
+            if len(alternative) == 1 and alternative[0][0] is c.BRANCH:
+                nested = alternative[0][1][1]
+                self.changed = True
+            else:
+                nested = [alternative]
+            for item in nested:
+                # an alternative equal to an earlier one can never match where the earlier one did not
+                if item in unique:
+                    self.changed = True
+                else:
+                    unique.append(item)
+        prefix = []
+        while len(unique) > 1 and all(unique) and all(item[0] == unique[0][0] for item in unique[1:]):
+            prefix.append(unique[0][0])
+            unique = [item[1:] for item in unique]
+            self.changed = True
+        if len(unique) > 1 and all(len(item) == 1 and _single_character(item[0]) for item in unique):
+            members = []
+            for ((op, av),) in unique:
+                for member in [(c.LITERAL, av)] if op is c.LITERAL else av:
+                    if member not in members:
+                        members.append(member)
+            unique = [[self.character_set(members, flags)]]
+            self.changed = True
+        if len(unique) == 1:
+            return prefix + unique[0]
+        return [*prefix, (c.BRANCH, (None, unique))]
+
+    def character_set(self, items: list, flags: int) -> tuple:
+        """
+        Merges the overlapping and adjacent literals and ranges of a set.
+        """
+        if flags & c.SRE_FLAG_LOCALE:
+            return (c.IN, items)
+        negated = [item for item in items if item[0] is c.NEGATE]
+        others = [
+            item for item in items if item[0] is not c.NEGATE and item[0] is not c.LITERAL and item[0] is not c.RANGE
+        ]
+        ranges = sorted((av, av) if op is c.LITERAL else av for op, av in items if op is c.LITERAL or op is c.RANGE)
+        merged = []
+        for low, high in ranges:
+            if merged and low <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], high))
+            else:
+                merged.append((low, high))
+        members = []
+        for low, high in merged:
+            if high - low > 1:
+                members.append((c.RANGE, (low, high)))
+            else:
+                # a range of two characters is no shorter than the two literals
+                members.extend((c.LITERAL, code) for code in range(low, high + 1))
+        if len(members) + len(others) == 1 and members and members[0][0] is c.LITERAL:
+            self.changed = True
+            return (c.NOT_LITERAL if negated else c.LITERAL, members[0][1])
+        new_items = negated + members + others
+        if len(new_items) < len(items):
+            self.changed = True
+            return (c.IN, new_items)
+        return (c.IN, items)
+
+    def lookarounds(self, items: list, flags: int) -> list:
+        result = []
+        for index, node in enumerate(items):
+            op, av = node
+            if op is c.ASSERT or op is c.ASSERT_NOT:
+                direction, content = av
+                following = items[index + 1 :]
+                if op is c.ASSERT and not _has_groups(content):
+                    implied = following[: len(content)] if direction == 1 else result[len(result) - len(content) :]
+                    if implied == content:
+                        self.changed = True
+                        continue
+                if direction == 1 and len(content) == 1 and following and _single_character(content[0]):
+                    if (
+                        op is c.ASSERT
+                        and content[0][0] is c.LITERAL
+                        and self.matches(following[0], content[0][1], flags)
+                    ):
+                        # (?=a)[a-z] is just a
+                        items[index + 1] = content[0]
+                        self.changed = True
+                        continue
+                    if (
+                        op is c.ASSERT_NOT
+                        and following[0][0] is c.LITERAL
+                        and not self.matches(content[0], following[0][1], flags)
+                    ):
+                        # (?!a)b is just b
+                        self.changed = True
+                        continue
+            result.append(node)
+        return result
+
+    def matches(self, atom: tuple, code: int, flags: int) -> bool:
+        """
+        Whether the single character *atom* matches the character *code* under *flags*.
+        """
+        if atom[0] not in CHARACTER_ATOMS or flags & c.SRE_FLAG_LOCALE:
+            return False
+        text = render([atom], self.names)
+        character = chr(code)
+        if self.is_bytes:
+            text, character = text.encode("latin-1"), character.encode("latin-1")
+        return re.fullmatch(text, character, flags & MATCHER_FLAGS) is not None
+
+
+def _single_character(node: tuple) -> bool:
+    """
+    Whether *node* is a literal or a set which is not negated, so it can be merged into a set.
+    """
+    op, av = node
+    return op is c.LITERAL or (op is c.IN and all(item[0] is not c.NEGATE for item in av))
+
+
+def _has_groups(items: list) -> bool:
+    return any(
+        (op is c.SUBPATTERN and av[0] is not None) or any(_has_groups(child) for child in children(op, av))
+        for op, av in items
+    )
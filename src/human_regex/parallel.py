@@ -0,0 +1,164 @@
+"""
+Running one pattern over many files or texts in parallel.
+
+The pattern and its flags are sent to every worker once. Each worker compiles the pattern
+on first use through its own `human_regex.registry.default_registry` and then only receives
+the paths or texts to search.
+
+```py
+from human_regex import StringRegex as Sre
+
+number = Sre(r"\\d").one_or_more
+texts = ["1 and 2", "none", "33"]
+assert list(number.search_many(texts, workers=2, executor="thread")) == [["1", "2"], [], ["33"]]
+```
+
+Results of the methods returning matches (`search`, `match`, `fullmatch` and `finditer`)
+are `human_regex.matches.DetachedMatch` objects, because `re.Match` objects cannot be
+sent between processes.
+"""
+
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
+from itertools import islice
+
+from .matches import DetachedMatch
+
+Text_Element = str | bytes
+"""
+@private
+"""
+
+METHODS = ("findall", "search", "match", "fullmatch", "finditer", "split")
+"""
+@private
+Proxied methods which can be run by `search_many`.
+"""
+
+EXECUTORS = {"process": ProcessPoolExecutor, "thread": ThreadPoolExecutor}
+"""
+@private
+"""
+
+BATCH_SIZE = 16
+"""
+@private
+Number of items sent to a worker process at once.
+"""
+
+WINDOW_PER_WORKER = 2
+"""
+@private
+Number of batches per worker which are submitted ahead of the results being consumed.
+"""
+
+_worker_pattern = None
+_worker_flags = 0
+
+
+def _init_worker(pattern, flags: int) -> None:
+    global _worker_pattern, _worker_flags  # noqa: PLW0603
+    _worker_pattern = pattern
+    _worker_flags = flags
+
+
+def _load(item: Text_Element | os.PathLike, pattern, encoding: str | None) -> Text_Element:
+    if not isinstance(item, os.PathLike):
+        return item
+    if isinstance(pattern, bytes):
+        with open(item, "rb") as file:
+            return file.read()
+    with open(item, encoding=encoding) as file:
+        return file.read()
+
+
+def _detach(result):
+    if result is None or isinstance(result, list | tuple | str | bytes):
+        return result
+    if hasattr(result, "regs"):
+        return DetachedMatch.from_match(result).compact()
+    # an iterator of matches
+    return [DetachedMatch.from_match(match).compact() for match in result]
+
+
+def _apply(method: str, encoding: str | None, kwargs: dict, item, *, pattern=None, flags: int | None = None):
+    if pattern is None:
+        pattern, flags = _worker_pattern, _worker_flags
+    text = _load(item, pattern, encoding)
+    return _detach(getattr(pattern, method)(text, flags=flags, **kwargs))
+
+
+def search_many(
+    pattern,
+    items: Iterable[Text_Element | os.PathLike],
+    flags: int = 0,
+    *,
+    method: str = "findall",
+    workers: int | None = None,
+    executor: str = "process",
+    ordered: bool = True,
+    encoding: str | None = None,
+    **kwargs,
+) -> Iterator:
+    """
+    Runs the proxied *method* of *pattern* over each of *items* in a pool of *workers*.
+    Items which are `os.PathLike` (e.g. `pathlib.Path`) are files to be read (in text mode
+    with *encoding* for `StringRegex`, in binary mode for `BytesRegex`), `str` and `bytes`
+    items are searched directly. Further keyword arguments are passed to *method*.
+
+    With *ordered*, the results are yielded in the order of *items*. Otherwise pairs of the index
+    of the item and its result are yielded as soon as they are ready. Items are consumed lazily:
+    only a few batches per worker are in flight at any time, so *items* can be an endless
+    iterator and the results are streamed rather than accumulated.
+    """
+    if method not in METHODS:
+        msg = f"method must be one of {', '.join(METHODS)}"
+        raise ValueError(msg)
+    if executor not in EXECUTORS:
+        msg = f"executor must be one of {', '.join(EXECUTORS)}"
+        raise ValueError(msg)
+    task = partial(_apply, method, encoding, kwargs)
+    if executor == "process":
+        pool: Executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(pattern, flags))
+        # batches amortize the cost of sending items to the processes
+        batch_size = BATCH_SIZE
+    else:
+        pool = ThreadPoolExecutor(workers)
+        task = partial(task, pattern=pattern, flags=flags)
+        batch_size = 1
+    window = WINDOW_PER_WORKER * (workers or os.cpu_count() or 1)
+    return _results(pool, task, items, ordered=ordered, batch_size=batch_size, window=window)
+
+
+def _apply_batch(task, batch: list) -> list:
+    return [task(item) for item in batch]
+
+
+def _results(pool: Executor, task, items, *, ordered: bool, batch_size: int, window: int) -> Iterator:
+    numbered = enumerate(items)
+    pending: deque = deque()
+
+    def submit() -> bool:
+        batch = list(islice(numbered, batch_size))
+        if batch:
+            future = pool.submit(_apply_batch, task, [item for _, item in batch])
+            pending.append((future, batch[0][0]))
+        return bool(batch)
+
+    with pool:
+        while len(pending) < window and submit():
+            pass
+        while pending:
+            if ordered:
+                future, _ = pending.popleft()
+                yield from future.result()
+            else:
+                done, _ = wait([future for future, _ in pending], return_when=FIRST_COMPLETED)
+                for future, first in [entry for entry in pending if entry[0] in done]:
+                    pending.remove((future, first))
+                    yield from enumerate(future.result(), first)
+            while len(pending) < window and submit():
+                pass
@@ -0,0 +1,229 @@
+"""
+A bounded registry of compiled patterns, independent of the internal cache of `re`.
+
+All functions proxied by `human_regex.StringRegex` and `human_regex.BytesRegex` obtain their
+compiled patterns from a `PatternRegistry` (by default `default_registry`). The registry keeps
+at most *capacity* patterns and evicts the least recently used one when it runs full.
+The registry is the only owner of the compiled patterns: instances merely remember the key under
+which they find theirs, so every proxied call counts as a hit and keeps its pattern recently used,
+and an evicted pattern is really gone (unless the caller of `compile` holds on to it).
+Patterns which must stay compiled no matter what can be pinned:
+
+```py
+from human_regex import StringRegex as Sre
+from human_regex.registry import PatternRegistry
+
+registry = PatternRegistry(capacity=2)
+hot = registry.pin(Sre(r"\\d+"))
+registry.compile("a")
+registry.compile("b")
+registry.compile("c")  # evicts "a", the pinned pattern stays
+assert registry.compile(r"\\d+") is hot
+assert registry.stats.evictions == 1
+```
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# re.compile would store every pattern in the shared cache of the re module as well,
+# evicting the patterns of other libraries, so we compile with the internal compiler directly.
+from re import _compiler as re_compiler
+from typing import NamedTuple
+
+from .instrumentation import CompileEvent, emit, listeners
+
+Text_Element = str | bytes
+"""
+@private
+"""
+
+
+class RegistryStats(NamedTuple):
+    """
+    Counters of a `PatternRegistry`.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    pinned: int
+    capacity: int
+
+
+Key = tuple[Text_Element, int]
+"""
+@private
+"""
+
+
+def make_key(pattern: Text_Element, flags: int = 0) -> Key:
+    """
+    @private
+    The key of *pattern* compiled with *flags* in a registry.
+    """
+    # store plain str or bytes, so the registry does not keep StringRegex
+    # or BytesRegex instances (and everything memoized on them) alive
+    if type(pattern) is not str and type(pattern) is not bytes:
+        pattern = str(pattern) if isinstance(pattern, str) else bytes(pattern)
+    return pattern, int(flags)
+
+
+def _compile(pattern_key: Key) -> re.Pattern:
+    if not listeners:
+        return re_compiler.compile(*pattern_key)
+    start = time.perf_counter_ns()
+    compiled = re_compiler.compile(*pattern_key)
+    emit(CompileEvent(*pattern_key, time.perf_counter_ns() - start))
+    return compiled
+
+
+class PatternRegistry:
+    """
+    Thread-safe LRU cache of compiled `re.Pattern` objects keyed by pattern text and flags.
+    """
+
+    def __init__(self, capacity: int = 4096) -> None:
+        if capacity < 0:
+            msg = "capacity must not be negative"
+            raise ValueError(msg)
+        self._capacity = capacity
+        self._patterns: OrderedDict[Key, re.Pattern] = OrderedDict()
+        self._pinned: dict[Key, re.Pattern] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def capacity(self) -> int:
+        """
+        Maximum number of unpinned patterns kept compiled. Lowering it evicts
+        the least recently used patterns immediately.
+        """
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, capacity: int) -> None:
+        if capacity < 0:
+            msg = "capacity must not be negative"
+            raise ValueError(msg)
+        with self._lock:
+            self._capacity = capacity
+            self._evict()
+
+    @property
+    def stats(self) -> RegistryStats:
+        """
+        Current hit, miss and eviction counters and the occupancy of the registry.
+        Every proxied call of an instance counts as a hit or miss.
+        """
+        with self._lock:
+            return RegistryStats(
+                self._hits, self._misses, self._evictions, len(self._patterns), len(self._pinned), self._capacity
+            )
+
+    def reset_stats(self) -> None:
+        """
+        Sets the hit, miss and eviction counters back to zero.
+        """
+        with self._lock:
+            self._hits = self._misses = self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._patterns) + len(self._pinned)
+
+    def __contains__(self, item: Text_Element | tuple[Text_Element, int]) -> bool:
+        """
+        Whether a pattern is registered: *item* is a pattern compiled without flags,
+        or a tuple of a pattern and its flags.
+        """
+        pattern_key = make_key(*item) if isinstance(item, tuple) else make_key(item)
+        with self._lock:
+            return pattern_key in self._pinned or pattern_key in self._patterns
+
+    def get(self, pattern: Text_Element, flags: int = 0) -> re.Pattern | None:
+        """
+        Returns the compiled *pattern* for *flags* if it is registered, without compiling it,
+        counting a hit or miss, or making it recently used.
+        """
+        pattern_key = make_key(pattern, flags)
+        with self._lock:
+            return self._pinned.get(pattern_key) or self._patterns.get(pattern_key)
+
+    def compile(self, pattern: Text_Element, flags: int = 0) -> re.Pattern:
+        """
+        Returns the compiled *pattern* for *flags*, compiling and registering it if needed.
+        """
+        return self.compile_key(make_key(pattern, flags))
+
+    def compile_key(self, key: Key) -> re.Pattern:
+        """
+        @private
+        Like `PatternRegistry.compile`, for a key made by `make_key`.
+        """
+        with self._lock:
+            compiled = self._pinned.get(key)
+            if compiled is None:
+                compiled = self._patterns.get(key)
+                if compiled is not None:
+                    self._patterns.move_to_end(key)
+            if compiled is not None:
+                self._hits += 1
+                return compiled
+            self._misses += 1
+        compiled = _compile(key)
+        with self._lock:
+            if key not in self._pinned:
+                self._patterns[key] = compiled
+                self._evict()
+        return compiled
+
+    def pin(self, pattern: Text_Element, flags: int = 0) -> re.Pattern:
+        """
+        Compiles *pattern* if needed and exempts it from eviction. Pinned patterns
+        do not count towards the *capacity*.
+        """
+        key = make_key(pattern, flags)
+        with self._lock:
+            compiled = self._patterns.pop(key, None) or self._pinned.get(key)
+        if compiled is None:
+            compiled = _compile(key)
+        with self._lock:
+            self._pinned[key] = compiled
+        return compiled
+
+    def unpin(self, pattern: Text_Element, flags: int = 0) -> None:
+        """
+        Makes a pinned *pattern* subject to eviction again.
+        """
+        key = make_key(pattern, flags)
+        with self._lock:
+            compiled = self._pinned.pop(key, None)
+            if compiled is not None:
+                self._patterns[key] = compiled
+                self._evict()
+
+    def clear(self, *, pinned: bool = False) -> None:
+        """
+        Removes all unpinned patterns, and the pinned ones as well if *pinned* is true.
+        """
+        with self._lock:
+            self._patterns.clear()
+            if pinned:
+                self._pinned.clear()
+
+    def _evict(self) -> None:
+        while len(self._patterns) > self._capacity:
+            self._patterns.popitem(last=False)
+            self._evictions += 1
+
+
+default_registry = PatternRegistry()
+"""
+The registry used by `human_regex.StringRegex` and `human_regex.BytesRegex` unless
+their *pattern_registry* attribute is set to a different one.
+"""
@@ -0,0 +1,149 @@
+"""
+Running large catalogs of independent rules, most of which cannot match a given text.
+
+A `RuleIndex` indexes each rule by the longest literal every match of it contains
+(see `human_regex.literals`). A text is scanned once for all indexed literals, with a single
+`GeneralRegexBase.any_of` expression of them, and only the rules whose literal was found are
+searched for. Rules without a required literal, like alternations or case-insensitive rules,
+are searched for in every text. With thousands of rules over log lines, a handful of rules
+is usually left to run per line:
+
+```py
+from human_regex import StringRegex as Sre
+
+number = Sre(r"\\d").one_or_more
+index = Sre.rule_index({
+    "timeout": Sre("timeout after ") + number.named("ms") + "ms",
+    "refused": Sre("connection refused"),
+    "status": Sre("status=") + Sre("[45]") + Sre(r"\\d{2}"),
+    "fatal": Sre("fatal|panic"),
+})
+assert index.literals["timeout"] == "timeout after "
+assert index.literals["fatal"] is None
+line = "GET /api timeout after 350ms"
+assert index.candidates(line) == ["timeout", "fatal"]
+assert index.search_all(line)["timeout"].group("ms") == "350"
+assert index.matching_ids("status=503") == {"status"}
+```
+
+Which rules match does not depend on the index: `RuleIndex.matching_ids` returns the same ids
+as searching for every rule separately. Rules whose longest literal is very short, like a single
+space, are candidates for almost every text; join them with longer literals where possible.
+"""
+
+import re
+from collections.abc import Hashable, Iterable, Mapping
+
+from .literals import required_literals
+
+Text_Element = str | bytes
+"""
+@private
+"""
+
+
+class RuleIndex:
+    """
+    Independent rules, indexed by the literals they require, so that only the rules
+    which can match a text are searched for in it.
+
+    *rules* is either a mapping of rule ids to patterns or an iterable of patterns, whose ids
+    are then their indices. *regex_class* is `human_regex.StringRegex` or `human_regex.BytesRegex`,
+    usually given by `GeneralRegexBase.rule_index`. All rules are compiled with *flags*.
+    """
+
+    def __init__(
+        self,
+        rules: Mapping[Hashable, Text_Element] | Iterable[Text_Element],
+        regex_class: type,
+        flags: int = 0,
+    ) -> None:
+        items = rules.items() if isinstance(rules, Mapping) else enumerate(rules)
+        ids = []
+        compiled = []
+        literals = {}
+        positions: dict[Text_Element, list[int]] = {}
+        always = []
+        for position, (rule_id, pattern) in enumerate(items):
+            regex = regex_class(pattern)
+            try:
+                compiled.append(regex.compile(flags))
+            except re.error as e:
+                msg = f"rule {rule_id!r} is not a valid regular expression: {e}"
+                raise ValueError(msg) from e
+            ids.append(rule_id)
+            required = required_literals(regex, flags)
+            literal = literals[rule_id] = required[0] if required else None
+            if literal is None:
+                always.append(position)
+            else:
+                positions.setdefault(literal, []).append(position)
+        self.ids: tuple[Hashable, ...] = tuple(ids)
+        """
+        Ids of the rules in the order in which they were given.
+        """
+        self.literals: dict[Hashable, Text_Element | None] = literals
+        """
+        The literal each rule is indexed by, or None for the rules which are searched for in every text.
+        """
+        self.flags = flags
+        self.pattern = regex_class.any_of(positions) if positions else None
+        """
+        The expression matching any of the indexed literals, or None if no rule has a literal.
+        """
+        self._compiled = tuple(compiled)
+        self._always = tuple(always)
+        self._scanner = None if self.pattern is None else self.pattern.compile()
+        # the scanner finds the longest literal starting at each position, the shorter ones
+        # starting there are its prefixes, so each literal stands for the rules of its prefixes too
+        self._positions = {
+            literal: tuple(
+                position for end in range(1, len(literal) + 1) for position in positions.get(literal[:end], ())
+            )
+            for literal in positions
+        }
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _candidate_positions(self, string: Text_Element) -> list[int]:
+        found = set(self._always)
+        if self._scanner is not None:
+            found_literals = set()
+            search = self._scanner.search
+            match = search(string)
+            while match is not None:
+                found_literals.add(match.group())
+                # literals may overlap, so the next one can start right after the start of this one
+                match = search(string, match.start() + 1)
+            for literal in found_literals:
+                found.update(self._positions[literal])
+        return sorted(found)
+
+    def candidates(self, string: Text_Element) -> list[Hashable]:
+        """
+        Returns the ids of the rules which may match *string*, in the order of the rules:
+        the rules whose literal is in *string* and the rules without a literal.
+        """
+        ids = self.ids
+        return [ids[position] for position in self._candidate_positions(string)]
+
+    def search_all(self, string: Text_Element) -> dict[Hashable, re.Match]:
+        """
+        Searches for the candidate rules in *string*. Returns the first match of each rule
+        which matches, keyed by the id of the rule, in the order of the rules.
+        """
+        ids = self.ids
+        compiled = self._compiled
+        matches = {}
+        for position in self._candidate_positions(string):
+            match = compiled[position].search(string)
+            if match is not None:
+                matches[ids[position]] = match
+        return matches
+
+    def matching_ids(self, string: Text_Element) -> set[Hashable]:
+        """
+        Returns the ids of all rules which match anywhere in *string*.
+        """
+        return set(self.search_all(string))
@@ -0,0 +1,211 @@
+"""
+Matching many patterns over one text in a single pass.
+
+A `PatternSet` combines its patterns into one alternation of named groups and compiles it once.
+Every search over a text is then a single run of the regular expression engine, no matter how many
+patterns are in the set. Matches report the id of the pattern which matched:
+
+```py
+from human_regex import StringRegex as Sre
+
+word = Sre(r"\\w").one_or_more
+scanner = Sre.scanner({
+    "greeting": Sre("hello|hi").no_capture + " " + word.named("name"),
+    "number": Sre(r"\\d").one_or_more,
+})
+matches = list(scanner.finditer("hi Bob, you are 42"))
+assert [m.pattern_id for m in matches] == ["greeting", "number"]
+assert matches[0].groups == {"name": "Bob"}
+assert matches[1].text == "42"
+assert scanner.matching_ids("nothing to see") == set()
+```
+
+At any position the patterns are tried in the order in which they were given, like the branches of
+an alternation, so `PatternSet.finditer` reports at most one match per position. Patterns must not use
+numbered backreferences or numbered conditionals, because their groups are renumbered in the combined
+expression, and names of their groups must be unique in the set. Flags at the start of a pattern,
+like `(?i)`, are applied to that pattern only.
+"""
+
+import re
+import sys
+from collections.abc import Hashable, Iterable, Iterator, Mapping
+from typing import NamedTuple
+
+Text_Element = str | bytes
+"""
+@private
+"""
+
+LEADING_FLAGS = re.compile(r"\(\?([aiLmsux]+)\)")
+"""
+@private
+"""
+
+GROUP_PREFIX = "_hr_pattern_"
+"""
+@private
+Prefix of the names of the groups which wrap the individual patterns.
+"""
+
+
+class ScanMatch(NamedTuple):
+    """
+    A match of one of the patterns of a `PatternSet`.
+    """
+
+    pattern_id: Hashable
+    start: int
+    end: int
+    text: Text_Element
+    groups: dict[str, Text_Element | None]
+    """
+    Named groups of the matching pattern.
+    """
+
+
+class PatternSet:
+    """
+    Several patterns compiled into one alternation and searched for in a single pass.
+
+    *patterns* is either a mapping of pattern ids to patterns or an iterable of patterns,
+    whose ids are then their indices. *regex_class* is `human_regex.StringRegex` or
+    `human_regex.BytesRegex`, usually given by `GeneralRegexBase.scanner`.
+    """
+
+    def __init__(
+        self,
+        patterns: Mapping[Hashable, Text_Element] | Iterable[Text_Element],
+        regex_class: type,
+        flags: int = 0,
+    ) -> None:
+        items = patterns.items() if isinstance(patterns, Mapping) else enumerate(patterns)
+        ids = []
+        wrapped = []
+        own_group_names = []
+        seen_names = set()
+        for index, (pattern_id, pattern) in enumerate(items):
+            ids.append(pattern_id)
+            regex = _scope_leading_flags(regex_class(pattern))
+            try:
+                names = tuple(regex.compile(flags).groupindex)
+            except re.error as e:
+                msg = f"pattern {pattern_id!r} is not a valid regular expression: {e}"
+                raise ValueError(msg) from e
+            for name in names:
+                if name in seen_names or name.startswith(GROUP_PREFIX):
+                    msg = f"group name {name!r} of pattern {pattern_id!r} is not unique in the set"
+                    raise ValueError(msg)
+                seen_names.add(name)
+            own_group_names.append(names)
+            label = f"{GROUP_PREFIX}{index}"
+            if isinstance(regex_class.EMPTY, bytes):
+                label = label.encode()
+            wrapped.append(regex.named(label))
+        self.ids: tuple[Hashable, ...] = tuple(ids)
+        """
+        Ids of the patterns in the order in which they are tried.
+        """
+        self.pattern = regex_class(regex_class.OR).join(wrapped)
+        """
+        The combined regular expression.
+        """
+        try:
+            self.compiled: re.Pattern = self.pattern.compile(flags)
+            """
+            The compiled combined regular expression.
+            """
+        except re.error as e:
+            msg = f"the patterns cannot be combined into one regular expression: {e}"
+            raise ValueError(msg) from e
+        self.flags = flags
+        self._wrapped = tuple(wrapped)
+        # combined expressions of subsets of the patterns, used by matching_ids
+        self._subsets: dict[tuple[int, ...], re.Pattern] = {tuple(range(len(wrapped))): self.compiled}
+        groupindex = self.compiled.groupindex
+        self._groups = {
+            f"{GROUP_PREFIX}{index}": (
+                pattern_id,
+                tuple((name, groupindex[name]) for name in names),
+            )
+            for index, (pattern_id, names) in enumerate(zip(self.ids, own_group_names, strict=True))
+        }
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _scan_match(self, match: re.Match) -> ScanMatch:
+        # the wrapping group is the outermost one, so it is the last one closed
+        pattern_id, names = self._groups[match.lastgroup]
+        return ScanMatch(
+            pattern_id,
+            match.start(),
+            match.end(),
+            match.group(),
+            {name: match.group(index) for name, index in names},
+        )
+
+    def search(self, string: Text_Element, pos: int = 0, endpos: int = sys.maxsize) -> ScanMatch | None:
+        """
+        Returns the first match of any of the patterns in *string*, or `None`.
+        """
+        match = self.compiled.search(string, pos, endpos)
+        return None if match is None else self._scan_match(match)
+
+    def match(self, string: Text_Element, pos: int = 0, endpos: int = sys.maxsize) -> ScanMatch | None:
+        """
+        Returns the match of any of the patterns at the beginning of *string*, or `None`.
+        """
+        match = self.compiled.match(string, pos, endpos)
+        return None if match is None else self._scan_match(match)
+
+    def finditer(self, string: Text_Element, pos: int = 0, endpos: int = sys.maxsize) -> Iterator[ScanMatch]:
+        """
+        Yields all non-overlapping matches of any of the patterns in *string*.
+        """
+        scan_match = self._scan_match
+        for match in self.compiled.finditer(string, pos, endpos):
+            yield scan_match(match)
+
+    def matching_ids(self, string: Text_Element) -> set[Hashable]:
+        """
+        Returns the ids of all patterns which match anywhere in *string*, like a separate
+        `search` with each of them would. A pass over *string* finds the patterns matching
+        at distinct positions. Patterns whose matches were hidden by overlapping matches
+        of others are searched for in further passes, only with the patterns not found yet.
+        """
+        groups = self._groups
+        remaining = tuple(range(len(self._wrapped)))
+        found: set[int] = set()
+        while remaining:
+            new = {int(match.lastgroup[len(GROUP_PREFIX) :]) for match in self._subset(remaining).finditer(string)}
+            if not new:
+                break
+            found |= new
+            remaining = tuple(index for index in remaining if index not in new)
+        return {groups[f"{GROUP_PREFIX}{index}"][0] for index in found}
+
+    def _subset(self, indices: tuple[int, ...]) -> re.Pattern:
+        compiled = self._subsets.get(indices)
+        if compiled is None:
+            regex_class = type(self.pattern)
+            subset = regex_class(regex_class.OR).join(self._wrapped[index] for index in indices)
+            compiled = self._subsets[indices] = subset.compile(self.flags)
+        return compiled
+
+
+def _scope_leading_flags(regex):
+    """
+    Turns the global flags at the start of *regex* into flags of a group around the rest of it,
+    so that *regex* can become a part of a larger expression.
+    """
+    text = regex.decode("latin-1") if isinstance(regex, bytes) else str(regex)
+    letters = ""
+    while match := LEADING_FLAGS.match(text):
+        letters += match.group(1)
+        text = text[match.end() :]
+    if not letters:
+        return regex
+    # in verbose mode, a comment on the last line would swallow the closing parenthesis
+    scoped = f"(?{letters}:{text}{chr(10) if 'x' in letters else ''})"
+    return type(regex)(scoped.encode("latin-1") if isinstance(regex, bytes) else scoped)
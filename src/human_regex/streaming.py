@@ -0,0 +1,193 @@
+"""
+Searching texts which do not fit into memory, chunk by chunk.
+
+The text is read in chunks and scanned with a carry-over window, so matches spanning the
+boundary of two chunks are found as well. The window is given by *max_match_len*, which must
+be at least the length of the longest possible match (including any lookahead or lookbehind).
+Memory use is bounded by the chunk size plus twice the window; each reported match only keeps
+the text it covers.
+
+The matches are `human_regex.matches.DetachedMatch` objects whose positions are absolute
+offsets in the whole stream. `finditer_stream` reads file objects and iterables of chunks,
+`afinditer` reads asynchronous streams such as `asyncio.StreamReader`:
+
+```py
+import io
+
+from human_regex import StringRegex as Sre
+
+number = Sre(r"\\d").one_or_more
+stream = io.StringIO("1 22 333 " * 1000)
+matches = list(number.finditer_stream(stream, max_match_len=16, chunk_size=100))
+assert len(matches) == 3000
+assert matches[-1].span() == (8996, 8999)
+assert matches[-1].group() == "333"
+```
+"""
+
+import codecs
+import re
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from typing import IO
+
+from .matches import DetachedMatch
+
+Text_Element = str | bytes
+"""
+@private
+"""
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+"""
+@private
+"""
+
+DEFAULT_MAX_MATCH_LEN = 4096
+"""
+@private
+"""
+
+DEFAULT_OFFLOAD_THRESHOLD = 1 << 16
+"""
+@private
+"""
+
+
+class ChunkScanner:
+    """
+    Incremental scanner over a sequence of chunks. Each call of `ChunkScanner.feed` returns
+    the matches which can no longer change by more text arriving, `ChunkScanner.close` returns the rest.
+    """
+
+    def __init__(self, pattern: re.Pattern, max_match_len: int = DEFAULT_MAX_MATCH_LEN) -> None:
+        if max_match_len < 1:
+            msg = "max_match_len must be positive"
+            raise ValueError(msg)
+        self.pattern = pattern
+        self.max_match_len = max_match_len
+        self._buffer = pattern.pattern[:0]
+        # absolute position of the start of the buffer in the stream
+        self._offset = 0
+        # scanning continues here, the text before it is kept as context for lookbehinds
+        self._position = 0
+        # absolute position of the last empty match, which must not be reported again
+        self._last_empty = -1
+
+    def feed(self, chunk: Text_Element) -> list[DetachedMatch]:
+        """
+        Appends *chunk* to the stream and returns the matches which are complete.
+        """
+        self._buffer += chunk
+        return self._scan(final=False)
+
+    def close(self) -> list[DetachedMatch]:
+        """
+        Ends the stream and returns the remaining matches.
+        """
+        return self._scan(final=True)
+
+    def _scan(self, *, final: bool) -> list[DetachedMatch]:
+        buffer = self._buffer
+        offset = self._offset
+        # a match starting before the limit ends before the end of the buffer,
+        # so it would not be different if the following chunk were already known
+        limit = len(buffer) if final else len(buffer) - self.max_match_len
+        position = self._position
+        matches = []
+        for match in self.pattern.finditer(buffer, position):
+            start, end = match.span()
+            if start >= limit and not final:
+                break
+            if start == end:
+                if start + offset == self._last_empty:
+                    continue
+                self._last_empty = start + offset
+            # a compact copy does not keep the whole buffer alive
+            matches.append(DetachedMatch.from_match(match, offset).compact())
+            position = end
+        if not final:
+            position = max(position, limit)
+            keep = max(position - self.max_match_len, 0)
+            self._buffer = buffer[keep:]
+            self._offset = offset + keep
+            self._position = position - keep
+        return matches
+
+
+def iter_chunks(source: IO | Iterable[Text_Element], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterable[Text_Element]:
+    """
+    @private
+    Chunks of a file object or of an iterable of chunks.
+    """
+    read = getattr(source, "read", None)
+    if read is None:
+        return source
+    return iter(lambda: read(chunk_size), source.read(0))
+
+
+def finditer_stream(
+    pattern: re.Pattern,
+    source: IO | Iterable[Text_Element],
+    max_match_len: int = DEFAULT_MAX_MATCH_LEN,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[DetachedMatch]:
+    """
+    Yields all non-overlapping matches of the compiled *pattern* in *source*, which is
+    a file object opened for reading, or an iterable of `str` or `bytes` chunks.
+    """
+    scanner = ChunkScanner(pattern, max_match_len)
+    for chunk in iter_chunks(source, chunk_size):
+        yield from scanner.feed(chunk)
+    yield from scanner.close()
+
+
+async def _achunks(source, chunk_size: int) -> AsyncIterator[Text_Element]:
+    read = getattr(source, "read", None)
+    if read is None:
+        async for chunk in source:
+            yield chunk
+        return
+    while chunk := await read(chunk_size):
+        yield chunk
+
+
+async def afinditer(
+    pattern: re.Pattern,
+    source,
+    max_match_len: int = DEFAULT_MAX_MATCH_LEN,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    *,
+    encoding: str | None = None,
+    offload_threshold: int = DEFAULT_OFFLOAD_THRESHOLD,
+) -> AsyncIterator[DetachedMatch]:
+    """
+    Yields all non-overlapping matches of the compiled *pattern* in the asynchronous *source*:
+    an object with a coroutine method `read(n)` like `asyncio.StreamReader`, or an
+    asynchronous iterable of chunks. Chunks of at least *offload_threshold* characters
+    or bytes are scanned in the default executor of the event loop, so that the loop is
+    not blocked. For `str` patterns, `bytes` chunks are decoded incrementally with *encoding*
+    (UTF-8 by default).
+    """
+    import asyncio  # noqa: PLC0415 (slow to import, only needed here)
+
+    loop = asyncio.get_running_loop()
+    scanner = ChunkScanner(pattern, max_match_len)
+    decoder = None
+    wants_text = isinstance(pattern.pattern, str)
+    chunks: AsyncIterable[Text_Element] = _achunks(source, chunk_size)
+    async for chunk in chunks:
+        if wants_text and isinstance(chunk, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder(encoding or "utf-8")()
+            chunk = decoder.decode(chunk)  # noqa: PLW2901
+        if len(chunk) >= offload_threshold:
+            matches = await loop.run_in_executor(None, scanner.feed, chunk)
+        else:
+            matches = scanner.feed(chunk)
+        for match in matches:
+            yield match
+    if decoder is not None:
+        for match in scanner.feed(decoder.decode(b"", final=True)):
+            yield match
+    for match in scanner.close():
+        yield match
@@ -0,0 +1,327 @@
+"""
+Parsing regular expressions into the syntax tree of the `re` module, and rendering such trees back to text.
+
+The tree is the one `re` builds before compiling a pattern: a list of `(opcode, argument)` pairs,
+where the arguments of groups, alternatives and repetitions contain further such lists.
+Tools analyzing or rewriting patterns work on this tree and render the result with `unparse`:
+
+```py
+from human_regex import StringRegex as Sre
+from human_regex.syntax import parse, unparse
+
+tree = parse(Sre("(?:ab|cd)").one_or_more.named("pair"))
+assert unparse(tree) == "(?P<pair>(?:ab|cd)+)"
+assert unparse(parse(rb"[^a-z\\s]{2}")) == rb"[^a-z\\s]{2}"
+```
+
+The rendered text is equivalent to the parsed one, but not necessarily identical:
+`re` already merges simple alternatives (`a|b` becomes `[ab]`), factors out common prefixes
+of alternatives and drops comments and insignificant whitespace of verbose patterns.
+"""
+
+import re
+from re import _constants as c
+from re import _parser
+
+Text_Element = str | bytes
+"""
+@private
+"""
+
+SubPattern = _parser.SubPattern
+"""
+@private
+"""
+
+MAXREPEAT = c.MAXREPEAT
+"""
+@private
+"""
+
+FLAG_LETTERS = {
+    c.SRE_FLAG_ASCII: "a",
+    c.SRE_FLAG_IGNORECASE: "i",
+    c.SRE_FLAG_LOCALE: "L",
+    c.SRE_FLAG_MULTILINE: "m",
+    c.SRE_FLAG_DOTALL: "s",
+    c.SRE_FLAG_UNICODE: "u",
+    c.SRE_FLAG_VERBOSE: "x",
+}
+"""
+@private
+"""
+
+CATEGORIES = {
+    c.CATEGORY_DIGIT: r"\d",
+    c.CATEGORY_NOT_DIGIT: r"\D",
+    c.CATEGORY_SPACE: r"\s",
+    c.CATEGORY_NOT_SPACE: r"\S",
+    c.CATEGORY_WORD: r"\w",
+    c.CATEGORY_NOT_WORD: r"\W",
+}
+"""
+@private
+"""
+
+ANCHORS = {
+    c.AT_BEGINNING: "^",
+    c.AT_BEGINNING_STRING: r"\A",
+    c.AT_END: "$",
+    c.AT_END_STRING: r"\Z",
+    c.AT_BOUNDARY: r"\b",
+    c.AT_NON_BOUNDARY: r"\B",
+}
+"""
+@private
+"""
+
+FIRST_PRINTABLE = 0x20
+"""
+@private
+"""
+
+DELETE = 0x7F
+"""
+@private
+"""
+
+CONTROL_ESCAPES = {0x09: r"\t", 0x0A: r"\n", 0x0B: r"\v", 0x0C: r"\f", 0x0D: r"\r"}
+"""
+@private
+"""
+
+REPEATS = (c.MAX_REPEAT, c.MIN_REPEAT, c.POSSESSIVE_REPEAT)
+"""
+@private
+"""
+
+ATOMS = (c.LITERAL, c.NOT_LITERAL, c.ANY, c.IN, c.SUBPATTERN, c.ATOMIC_GROUP, c.GROUPREF, c.GROUPREF_EXISTS)
+"""
+@private
+Opcodes which are rendered as a single atom, so they can be quantified without a non-capturing group.
+"""
+
+
+def parse(pattern: Text_Element, flags: int = 0) -> SubPattern:
+    """
+    Parses *pattern* into the syntax tree of `re`. Raises `re.error` if *pattern* is invalid.
+    """
+    if type(pattern) is not str and type(pattern) is not bytes:
+        pattern = str(pattern) if isinstance(pattern, str) else bytes(pattern)
+    tree = _parser.parse(pattern, int(flags))
+    # the tree does not tell whether it was parsed from str or bytes
+    tree.state.is_bytes = isinstance(pattern, bytes)
+    return tree
+
+
+def unparse(tree: SubPattern, flags: int = 0) -> Text_Element:
+    """
+    Renders a tree returned by `parse` back into a pattern, which has the same meaning
+    when compiled with *flags* as the parsed pattern. Flags given inline in the parsed
+    pattern, and not in *flags*, are rendered as global inline flags.
+    """
+    names = {index: name for name, index in tree.state.groupdict.items()}
+    inline = tree.state.flags & ~int(flags) & ~(c.SRE_FLAG_UNICODE | c.SRE_FLAG_VERBOSE)
+    text = render(tree, names)
+    if inline:
+        text = f"(?{flag_letters(inline)}){text}"
+    return text.encode("latin-1") if getattr(tree.state, "is_bytes", False) else text
+
+
+def flag_letters(flags: int) -> str:
+    """
+    @private
+    """
+    return "".join(letter for flag, letter in FLAG_LETTERS.items() if flags & flag)
+
+
+def escape(code: int) -> str:
+    """
+    @private
+    A literal character, escaped if needed.
+    """
+    if code < FIRST_PRINTABLE or code == DELETE:
+        return CONTROL_ESCAPES.get(code, f"\\x{code:02x}")
+    return re.escape(chr(code))
+
+
+def render(items: list, names: dict[int, str]) -> str:
+    """
+    @private
+    Renders a sequence of tree nodes. *names* maps the numbers of named groups to their names.
+    """
+    parts = []
+    for index, (op, av) in enumerate(items):
+        text = render_node(op, av, names)
+        if op is c.BRANCH and len(items) > 1:
+            text = f"(?:{text})"
+        elif op is c.GROUPREF and av not in names and index + 1 < len(items):
+            following_op, following_av = items[index + 1]
+            if following_op is c.LITERAL and chr(following_av).isdigit():
+                # \1 followed by 0 would be read as \10
+                text = f"(?:{text})"
+        parts.append(text)
+    return "".join(parts)
+
+
+def render_node(op, av, names: dict[int, str]) -> str:
+    """
+    @private
+    """
+    if op is c.LITERAL:
+        return escape(av)
+    if op is c.NOT_LITERAL:
+        return f"[^{escape(av)}]"
+    if op is c.ANY:
+        return "."
+    if op is c.IN:
+        return render_set(av)
+    if op is c.AT:
+        return ANCHORS[av]
+    if op is c.BRANCH:
+        return "|".join(render(branch, names) for branch in av[1])
+    if op is c.SUBPATTERN:
+        group, add_flags, del_flags, content = av
+        if group is None:
+            flags = flag_letters(add_flags)
+            if del_flags:
+                flags += "-" + flag_letters(del_flags)
+            return f"(?{flags}:{render(content, names)})"
+        if group in names:
+            return f"(?P<{names[group]}>{render(content, names)})"
+        return f"({render(content, names)})"
+    if op in REPEATS:
+        minimum, maximum, content = av
+        return render_item(content, names) + render_quantifier(op, minimum, maximum)
+    if op is c.GROUPREF:
+        return f"(?P={names[av]})" if av in names else f"\\{av}"
+    if op is c.GROUPREF_EXISTS:
+        group, yes, no = av
+        condition = names.get(group, group)
+        if no is None:
+            return f"(?({condition}){render_alternative(yes, names)})"
+        return f"(?({condition}){render_alternative(yes, names)}|{render_alternative(no, names)})"
+    if op is c.ASSERT or op is c.ASSERT_NOT:
+        direction, content = av
+        kind = ("=" if op is c.ASSERT else "!") if direction == 1 else ("<=" if op is c.ASSERT else "<!")
+        return f"(?{kind}{render(content, names)})"
+    if op is c.ATOMIC_GROUP:
+        return f"(?>{render(av, names)})"
+    msg = f"cannot render opcode {op}"
+    raise ValueError(msg)
+
+
+def render_alternative(items: list, names: dict[int, str]) -> str:
+    """
+    @private
+    Renders a branch of a conditional, grouped if it is an alternation itself.
+    """
+    text = render(items, names)
+    if len(items) == 1 and items[0][0] is c.BRANCH:
+        return f"(?:{text})"
+    return text
+
+
+def render_item(content: list, names: dict[int, str]) -> str:
+    """
+    @private
+    Renders the *content* of a repetition, grouped if it is not a single atom.
+    """
+    text = render(content, names)
+    if len(content) == 1 and content[0][0] in ATOMS:
+        return text
+    return f"(?:{text})"
+
+
+def render_quantifier(op, minimum: int, maximum: int) -> str:
+    """
+    @private
+    """
+    if (minimum, maximum) == (0, MAXREPEAT):
+        quantifier = "*"
+    elif (minimum, maximum) == (1, MAXREPEAT):
+        quantifier = "+"
+    elif (minimum, maximum) == (0, 1):
+        quantifier = "?"
+    elif minimum == maximum:
+        quantifier = f"{{{minimum}}}"
+    elif maximum == MAXREPEAT:
+        quantifier = f"{{{minimum},}}"
+    else:
+        quantifier = f"{{{minimum},{maximum}}}"
+    if op is c.MIN_REPEAT:
+        return quantifier + "?"
+    if op is c.POSSESSIVE_REPEAT:
+        return quantifier + "+"
+    return quantifier
+
+
+def render_set(items: list) -> str:
+    """
+    @private
+    """
+    if len(items) == 1 and items[0][0] is c.CATEGORY:
+        return CATEGORIES[items[0][1]]
+    parts = []
+    for op, av in items:
+        if op is c.NEGATE:
+            parts.append("^")
+        elif op is c.LITERAL:
+            parts.append(escape(av))
+        elif op is c.RANGE:
+            parts.append(f"{escape(av[0])}-{escape(av[1])}")
+        elif op is c.CATEGORY:
+            parts.append(CATEGORIES[av])
+        else:
+            msg = f"cannot render opcode {op} in a set"
+            raise ValueError(msg)
+    return f"[{''.join(parts)}]"
+
+
+def children(op, av) -> tuple:
+    """
+    @private
+    The sequences of tree nodes contained in the node *(op, av)*.
+    """
+    if op in REPEATS:
+        return (av[2],)
+    if op is c.SUBPATTERN:
+        return (av[3],)
+    if op is c.BRANCH:
+        return av[1]
+    if op is c.ATOMIC_GROUP:
+        return (av,)
+    if op is c.ASSERT or op is c.ASSERT_NOT:
+        return (av[1],)
+    if op is c.GROUPREF_EXISTS:
+        return (av[1],) if av[2] is None else (av[1], av[2])
+    return ()
+
+
+def substitute(items: list, replacements: dict[int, tuple]) -> list:
+    """
+    @private
+    Copies the sequence of tree nodes *items*, replacing the nodes whose `id` is a key
+    of *replacements* by the corresponding new nodes.
+    """
+    result = []
+    for node in items:
+        if id(node) in replacements:
+            result.append(replacements[id(node)])
+            continue
+        op, av = node
+        if op in REPEATS:
+            av = (av[0], av[1], substitute(av[2], replacements))
+        elif op is c.SUBPATTERN:
+            av = (*av[:3], substitute(av[3], replacements))
+        elif op is c.BRANCH:
+            av = (av[0], [substitute(branch, replacements) for branch in av[1]])
+        elif op is c.ATOMIC_GROUP:
+            av = substitute(av, replacements)
+        elif op is c.ASSERT or op is c.ASSERT_NOT:
+            av = (av[0], substitute(av[1], replacements))
+        elif op is c.GROUPREF_EXISTS:
+            no = None if av[2] is None else substitute(av[2], replacements)
+            av = (av[0], substitute(av[1], replacements), no)
+        result.append((op, av))
+    return result
@@ -1,51 +1,95 @@
-def create_class_property(constant, encoding):
-    maybe_encoded = constant
-    if encoding:
-        maybe_encoded = str.encode(constant, encoding=encoding)
-
-    @classmethod
-    @property
-    # ruff: noqa: ARG001
-    def func(cls):
-        return maybe_encoded
-
-    return func
-
-
-building_blocks = {
-    "EMPTY": "",
-    "OPEN_CHAR_SET": "[",
-    "CLOSE_CHAR_SET": "]",
-    "OPEN_GROUP": "(",
-    "CLOSE_GROUP": ")",
-    "OPEN_EXTENSION": "(?",
-    "CLOSE_EXTENSION": ")",
-    "OPEN_NAME": "P<",
-    "CLOSE_NAME": ">",
-    "OPEN_QUANTIFIER": "{",
-    "CLOSE_QUANTIFIER": "}",
-    "QUANTIFIER_SEPARATOR": ",",
-    "OR": "|",
-    "NO_CAPTURE": ":",
-    "FLAGS_END": ":",
-    "ATOMIC": ">",
-    "NAME_REFERENCE": "P=",
-    "COMMENT": "#",
-    "FOLLOWED_BY": "=",
-    "NOT_FOLLOWED_BY": "!",
-    "PRECEDED_BY": "<=",
-    "NOT_PRECEDED_BY": "<!",
-    "ZERO_OR_MORE": "*",
-    "ONE_OR_MORE": "+",
-    "OPTIONAL": "?",
-    "LAZY": "?",
-}
-
-
-def make_re_proxy_function(func):
-    def proxied(self, *args, **kwargs):
-        result = func(self, *args, **kwargs)
-        return result
-
-    proxied.__doc__ = f"Proxy for re.{func.__name__}\n" + func.__doc__
-    return proxied
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    @private
+    Returns the module *name*, which is only executed when one of its attributes is first used.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class StringBuildingBlocks:
+    """
+    @private
+    The pieces of syntax `human_regex.bases.general_regex.GeneralRegexBase` builds expressions of,
+    as `str` for `human_regex.StringRegex`.
+    """
+
+    __slots__ = ()
+
+    TEXT_TYPE = str
+    EMPTY = ""
+    OPEN_CHAR_SET = "["
+    CLOSE_CHAR_SET = "]"
+    OPEN_GROUP = "("
+    CLOSE_GROUP = ")"
+    OPEN_EXTENSION = "(?"
+    CLOSE_EXTENSION = ")"
+    OPEN_NAME = "P<"
+    CLOSE_NAME = ">"
+    OPEN_QUANTIFIER = "{"
+    CLOSE_QUANTIFIER = "}"
+    QUANTIFIER_SEPARATOR = ","
+    OR = "|"
+    NO_CAPTURE = ":"
+    FLAGS_END = ":"
+    ATOMIC = ">"
+    NAME_REFERENCE = "P="
+    COMMENT = "#"
+    FOLLOWED_BY = "="
+    NOT_FOLLOWED_BY = "!"
+    PRECEDED_BY = "<="
+    NOT_PRECEDED_BY = "<!"
+    ZERO_OR_MORE = "*"
+    ONE_OR_MORE = "+"
+    OPTIONAL = "?"
+    LAZY = "?"
+
+
+class BytesBuildingBlocks:
+    """
+    @private
+    The pieces of syntax of `StringBuildingBlocks` as `bytes` for `human_regex.BytesRegex`.
+    """
+
+    __slots__ = ()
+
+    TEXT_TYPE = bytes
+    EMPTY = b""
+    OPEN_CHAR_SET = b"["
+    CLOSE_CHAR_SET = b"]"
+    OPEN_GROUP = b"("
+    CLOSE_GROUP = b")"
+    OPEN_EXTENSION = b"(?"
+    CLOSE_EXTENSION = b")"
+    OPEN_NAME = b"P<"
+    CLOSE_NAME = b">"
+    OPEN_QUANTIFIER = b"{"
+    CLOSE_QUANTIFIER = b"}"
+    QUANTIFIER_SEPARATOR = b","
+    OR = b"|"
+    NO_CAPTURE = b":"
+    FLAGS_END = b":"
+    ATOMIC = b">"
+    NAME_REFERENCE = b"P="
+    COMMENT = b"#"
+    FOLLOWED_BY = b"="
+    NOT_FOLLOWED_BY = b"!"
+    PRECEDED_BY = b"<="
+    NOT_PRECEDED_BY = b"<!"
+    ZERO_OR_MORE = b"*"
+    ONE_OR_MORE = b"+"
+    OPTIONAL = b"?"
+    LAZY = b"?"
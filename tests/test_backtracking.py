@@ -0,0 +1,70 @@
+import pytest
+
+from human_regex import BytesRegex as Bre
+from human_regex import StringRegex as Sre
+from human_regex.backtracking import RegexTimeoutError, TimeoutGuard, analyze
+from human_regex.matches import DetachedMatch
+
+
+@pytest.mark.parametrize(
+    ("pattern", "kind", "fragment"),
+    [
+        ("(a+)+", "nested_quantifier", "(a+)+"),
+        (r"(\w+\s?)+$", "nested_quantifier", r"(\w+\s?)+"),
+        ("(?:a*)*b", "nested_quantifier", "(?:a*)*"),
+        (r"(x+x+)+y", "nested_quantifier", "(x+x+)+"),
+        (r"^(\d+\w+)+z", "nested_quantifier", r"(\d+\w+)+"),
+        ("(a|a)*b", "overlapping_alternation", "(a(?:|))*"),
+        (r"(\w|\d\d)+!", "overlapping_alternation", r"(\w|\d\d)+"),
+    ],
+)
+def test_flagged(pattern, kind, fragment):
+    (finding,) = analyze(pattern)
+    assert finding.kind == kind
+    assert finding.fragment == fragment
+    assert len(finding.rewritten) == len(finding.suggestions)
+    # the original patterns would not finish on this text within hours
+    adversarial = "a" * 30 + "1" * 30 + "x" * 30 + " " * 30 + "!"
+    for rewritten in finding.rewritten:
+        with TimeoutGuard(rewritten, timeout=5) as guarded:
+            guarded.search(adversarial)
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [r"\w+", "(a|ab)*c", r"(\w+\s)+", "(ab+c)+", "(a++)+", "(?>(a+))+", "(a|b)+", r"(?:[a-z]+\.)+com", "(a+b+)+"],
+)
+def test_not_flagged(pattern):
+    assert analyze(pattern) == []
+
+
+def test_suggestions():
+    (finding,) = Sre("a").one_or_more.unnamed.one_or_more.backtracking_risks()
+    assert finding.suggestions == ("(a++)+", "((?>a+))+")
+    (finding,) = Bre(rb"(x+x+)+").backtracking_risks()
+    assert finding.suggestions == (b"(x+x+)++", b"(?>(x+x+)+)")
+    (finding,) = Sre(r"^(a|a)*$").backtracking_risks()
+    assert finding.rewritten == ("^(a(?:|))*+$", "^(?>(a(?:|))*)$", "^(a(?>|))*$")
+
+
+def test_guarded_calls():
+    with Sre(r"(?P<n>\d+)").guarded(timeout=10) as guarded:
+        match = guarded.search("ab 12")
+        assert isinstance(match, DetachedMatch)
+        assert match.span("n") == (3, 5)
+        assert guarded.findall("1 2") == ["1", "2"]
+        assert [m.group() for m in guarded.finditer("1 2")] == ["1", "2"]
+        assert guarded.subn("#", "1 2", count=1) == ("# 2", 1)
+        assert guarded.match("x") is None
+
+
+def test_guarded_timeout():
+    guarded = Sre("(a+)+b").guarded(timeout=0.2)
+    try:
+        with pytest.raises(RegexTimeoutError):
+            guarded.search("a" * 40)
+        assert guarded.fullmatch("aab").group() == "aab"
+    finally:
+        guarded.close()
+    with pytest.raises(ValueError):
+        Sre("a").guarded(timeout=0)
@@ -0,0 +1,46 @@
+from array import array
+
+import pytest
+
+from human_regex import BytesRegex as Bre
+from human_regex import StringRegex as Sre
+
+word = Sre(r"\w").one_or_more
+pair = word.named("key") + "=" + word.named("value")
+rows = ["a=1", "no pair", " b=2"]
+
+
+def test_match_all():
+    mask = pair.match_all(rows)
+    assert isinstance(mask, array)
+    assert list(mask) == [1, 0, 0]
+    assert list(pair.match_all(rows, method="search")) == [1, 0, 1]
+    assert list(Sre("A=1").match_all(rows, Sre.I, method="fullmatch")) == [1, 0, 0]
+
+
+def test_match_all_numpy():
+    np = pytest.importorskip("numpy")
+    mask = pair.match_all(rows, numpy=True)
+    assert mask.dtype == np.bool_
+    assert mask.tolist() == [True, False, False]
+
+
+def test_sub_all():
+    assert pair.sub_all(rows, r"\g<value>=\g<key>") == ["1=a", "no pair", " 2=b"]
+    assert Bre(b"a").sub_all([b"aaa", b"b"], b"x", 2) == [b"xxa", b"b"]
+
+
+def test_extract_named_groups():
+    assert pair.extract(rows) == {"key": ["a", None, "b"], "value": ["1", None, "2"]}
+    assert pair.extract(rows, groups=["value"]) == {"value": ["1", None, "2"]}
+    assert pair.extract(rows, method="match") == {"key": ["a", None, None], "value": ["1", None, None]}
+
+
+def test_extract_unnamed_groups():
+    assert Sre(r"(\d)(\d)?").extract(["1", "23", "x"]) == {1: ["1", "2", None], 2: [None, "3", None]}
+    assert Bre(rb"\d+").extract([b"a1", b"22"]) == {0: [b"1", b"22"]}
+
+
+def test_invalid_method():
+    with pytest.raises(ValueError, match="method"):
+        pair.match_all(rows, method="findall")
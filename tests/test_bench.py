@@ -0,0 +1,22 @@
+import json
+
+from human_regex import bench
+
+
+def test_bench_writes_json(tmp_path, capsys):
+    output = tmp_path / "bench.json"
+    assert bench.main(["--depth", "3", "--number", "1", "--repeat", "1", "--output", str(output)]) == 0
+    report = json.loads(output.read_text())
+    names = {result["name"] for result in report["results"]}
+    assert "StringRegex.named x3" in names
+    assert "StringRegex.named" in names
+    assert "bytes.join for yes_no (BytesRegex)" in names
+    assert "BytesRegex.yes_no x3" in names
+    assert "re.Pattern.search (StringRegex)" in names
+    assert all(result["best_ns"] > 0 for result in report["results"])
+    assert "StringRegex.search" in capsys.readouterr().out
+
+
+def test_bench_filter():
+    results = bench.run(bench.all_benchmarks(2), number=1, repeat=1, name_filter="build BytesRegex.join")
+    assert [result["name"] for result in results] == ["BytesRegex.join of 2"]
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from human_regex import BytesRegex as Bre
+from human_regex import StringRegex as Sre
+from human_regex.bundle import BundleEntry, BundleError, PatternBundle, _hash
+
+digits = Sre(r"\d").one_or_more
+PATTERNS = {
+    "version": digits.named("major") + r"\." + digits.named("minor"),
+    "word": (Sre(r"\w+"), Sre.I),
+    "plain": "a|b",
+    "bytes": (Bre(rb"\xe9(\d)"), Bre.S),
+}
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "patterns.json"
+    PatternBundle(PATTERNS).save(path)
+    return path
+
+
+def test_round_trip(path):
+    bundle = PatternBundle.load(path)
+    assert list(bundle) == list(PATTERNS)
+    assert type(bundle["version"]) is Sre
+    assert type(bundle["plain"]) is Sre
+    assert bundle["bytes"] == rb"\xe9(\d)"
+    assert type(bundle["bytes"]) is Bre
+    assert bundle.entries["word"] == BundleEntry(Sre(r"\w+"), Sre.I, 0, {})
+    assert bundle.entries["version"].groupindex == {"major": 1, "minor": 2}
+    assert bundle.compile("bytes").flags & Bre.S
+    assert bundle.compile("word").match("ABC").group() == "ABC"
+    assert bundle.to_json() == PatternBundle(PATTERNS).to_json()
+
+
+def test_invalid_bundles(path):
+    document = json.loads(path.read_text())
+    document["patterns"][0]["pattern"] = "tampered"
+    path.write_text(json.dumps(document))
+    with pytest.raises(BundleError, match="hash"):
+        PatternBundle.load(path)
+    path.write_text("{")
+    with pytest.raises(BundleError, match="not a valid bundle"):
+        PatternBundle.load(path)
+    path.write_text(json.dumps({"format": 99}))
+    with pytest.raises(BundleError, match="format"):
+        PatternBundle.load(path)
+
+
+def test_groups_are_checked_on_compile(path):
+    document = json.loads(path.read_text())
+    document["patterns"][0]["groups"] = 3
+    patterns = document["patterns"]
+    document["sha256"] = _hash(patterns)
+    bundle = PatternBundle.from_json(json.dumps(document))
+    with pytest.raises(BundleError, match="version"):
+        bundle.compile("version")
+    assert bundle.compile("word")
+
+
+def test_load_or_build(tmp_path):
+    path = tmp_path / "patterns.json"
+    built = []
+
+    def build():
+        built.append(True)
+        return PatternBundle(PATTERNS)
+
+    first = PatternBundle.load_or_build(path, build)
+    second = PatternBundle.load_or_build(path, build)
+    assert built == [True]
+    assert dict(first) == dict(second)
+    path.write_text("garbage")
+    PatternBundle.load_or_build(path, build)
+    assert built == [True, True]
+    assert PatternBundle.load(path)["plain"] == "a|b"
@@ -195,3 +195,51 @@ def test_bytes_compile():
     assert isinstance(compiled, re.Pattern)
     assert compiled.pattern == b"(?P<label>content)"
     assert compiled.flags == Bre.I
+
+
+def test_bytes_any_of():
+    b = Bre.any_of((b"ab", b"ac", b"b"))
+    assert b == b"(?:a[bc]|b)"
+    assert type(b) is Bre
+    assert b.findall(b"ab b ac ad") == [b"ab", b"b", b"ac"]
+
+
+def test_bytes_search_file(tmp_path):
+    path = tmp_path / "capture.bin"
+    path.write_bytes(bytes(1000) + b"MAGIC" + bytes(1000) + b"magic")
+    b = Bre(b"magic")
+    assert b.search_file(path).span() == (2005, 2010)
+    assert b.search_file(path, Bre.I).span() == (1000, 1005)
+    assert Bre(b"absent").search_file(path) is None
+
+
+def test_bytes_finditer_file(tmp_path):
+    path = tmp_path / "capture.bin"
+    path.write_bytes(b"\x01\x02" + bytes(100) + b"\x01\x02")
+    b = Bre(b"\x01(?P<second>.)")
+    assert [m.start() for m in b.finditer_file(path)] == [0, 102]
+    views = [(m.group("second"), view) for m, view in b.finditer_file(path, memoryviews=True)]
+    assert [(second, view.tobytes()) for second, view in views] == [(b"\x02", b"\x01\x02")] * 2
+    assert all(isinstance(view, memoryview) for _, view in views)
+
+
+def test_bytes_search_empty_file(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    assert Bre(b"").search_file(path).span() == (0, 0)
+    assert list(Bre(b"x").finditer_file(path)) == []
+
+
+def test_bytes_mapped_file_is_closed(tmp_path):
+    path = tmp_path / "capture.bin"
+    path.write_bytes(b"ab" * 100)
+    with Bre.mapped_file(path) as data:
+        assert Bre(b"(ab)+").fullmatch(data)
+    assert data.closed
+    matches = list(Bre(b"a(?P<b>b)").finditer_file(path))
+    assert [m.group("b") for m in matches] == [b"b"] * 100
+    assert matches[-1].span() == (198, 200)
+    iterator = Bre(b"ab").finditer_file(path)
+    assert next(iterator).span() == (0, 2)
+    iterator.close()
+    assert Bre(b"ba").search_file(path).group() == b"ba"
@@ -0,0 +1,89 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from human_regex import BytesRegex as Bre
+from human_regex import StringRegex as Sre
+from human_regex import cli
+from human_regex.bundle import PatternBundle
+
+PATTERNS_MODULE = """
+from human_regex import BytesRegex as Bre
+from human_regex import StringRegex as Sre
+
+number = Sre(r"\\d").one_or_more
+status = Sre("status=") + number
+raw_ok = Bre(b"ok")
+_private = Sre("hidden")
+"""
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    directory = tmp_path / "corpus"
+    (directory / "nested").mkdir(parents=True)
+    (directory / "a.log").write_text("status=200 ok\nstatus=404\n")
+    (directory / "nested" / "b.log").write_text("ok 1 2 3")
+    return directory
+
+
+def test_cli_reports_and_writes_json(tmp_path, corpus, capsys):
+    patterns = tmp_path / "patterns.py"
+    patterns.write_text(PATTERNS_MODULE)
+    output = tmp_path / "run.json"
+    assert cli.main([str(patterns), str(corpus), "--repeat", "1", "--output", str(output)]) == 0
+    printed = capsys.readouterr().out
+    assert "3 expressions over 2 files" in printed
+    assert "MB/s" in printed
+    document = json.loads(output.read_text())
+    assert document["corpus"] == {"files": 2, "bytes": 33, "lines": 3}
+    results = {result["name"]: result for result in document["results"]}
+    assert set(results) == {"number", "status", "raw_ok"}
+    assert results["number"]["matches"] == 5
+    assert results["status"]["matches"] == 2
+    assert results["raw_ok"]["bytes"] is True
+    assert results["raw_ok"]["matches"] == 2
+    assert [result["best_ms"] for result in document["results"]] == sorted(
+        (result["best_ms"] for result in document["results"]), reverse=True
+    )
+    assert all(result["mb_per_s"] > 0 and result["compile_ms"] >= 0 for result in document["results"])
+
+
+def test_cli_grep_filter_and_patterns_mapping(tmp_path, corpus, monkeypatch, capsys):
+    (tmp_path / "cli_patterns.py").write_text(
+        "PATTERNS = {'status': r'status=\\d+', 'word': (r'OK', 2), 'bytes': b'o'}\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    output = tmp_path / "run.json"
+    arguments = ["cli_patterns", str(corpus / "a.log"), "-m", "grep", "-r", "1", "-k", "t", "-o", str(output)]
+    assert cli.main(arguments) == 0
+    results = {result["name"]: result for result in json.loads(output.read_text())["results"]}
+    assert set(results) == {"status", "bytes"}
+    assert results["status"]["matches"] == 2
+    assert results["bytes"]["matches"] == 1
+    assert cli.load_patterns("cli_patterns")["word"] == (Sre("OK"), Sre.I)
+    assert "2 expressions over 1 files" in capsys.readouterr().out
+
+
+def test_cli_loads_bundles(tmp_path, corpus):
+    path = tmp_path / "bundle.json"
+    PatternBundle({"digit": Sre(r"\d"), "space": (Bre(rb"\s"), 0)}).save(path)
+    assert cli.load_patterns(str(path)) == {"digit": (r"\d", 0), "space": (rb"\s", 0)}
+    assert cli.main([str(path), str(corpus), "-r", "1", "-n", "0"]) == 0
+
+
+def test_cli_errors(tmp_path, corpus, capsys):
+    with pytest.raises(SystemExit):
+        cli.main(["no_such_module_here", str(corpus)])
+    assert "no_such_module_here" in capsys.readouterr().err
+    (tmp_path / "broken.py").write_text("PATTERNS = ['(unclosed']\n")
+    with pytest.raises(SystemExit):
+        cli.main([str(tmp_path / "broken.py"), str(corpus)])
+    assert "invalid expression" in capsys.readouterr().err
+
+
+def test_python_m_human_regex():
+    result = subprocess.run([sys.executable, "-m", "human_regex", "--help"], capture_output=True, text=True, check=True)
+    assert result.stdout.startswith("usage: human-regex")
@@ -0,0 +1,74 @@
+import re
+
+from human_regex import BytesRegex as Bre
+from human_regex import DeferredBytesRegex, DeferredStringRegex
+from human_regex import StringRegex as Sre
+
+
+def test_deferred_renders_like_eager():
+    def build(r, sep):
+        word = r.one_or_more.named("word")
+        return (
+            r.join((word, word))
+            .append(sep)
+            .prepend(sep)
+            .optional.unnamed.repeat(1, 3)
+            .followed_by(sep)
+            .not_preceded_by(sep)
+            .atomic
+        )
+
+    eager = build(Sre(r"\w"), " ")
+    deferred = build(Sre(r"\w").deferred, " ")
+    assert type(deferred) is DeferredStringRegex
+    assert deferred.render() == eager
+    assert type(deferred.render()) is Sre
+
+
+def test_deferred_bytes():
+    deferred = Bre(b"0-9").deferred.set.exactly(3) | b"x"
+    assert type(deferred) is DeferredBytesRegex
+    assert bytes(deferred) == b"[0-9]{3}|x"
+    assert type(deferred.render()) is Bre
+    assert deferred == b"[0-9]{3}|x"
+
+
+def test_deferred_yes_no_and_set_flags():
+    assert DeferredStringRegex.yes_no(1, "a", "b").render() == Sre.yes_no(1, "a", "b")
+    assert DeferredStringRegex.set_flags("i").render() == "(?i)"
+
+
+def test_deferred_renders_once():
+    deferred = Sre("a").deferred.named("x")
+    rendered = deferred.render()
+    assert deferred.render() is rendered
+    assert str(deferred) == "(?P<x>a)"
+
+
+def test_deferred_deep_chain():
+    deferred = Sre("").deferred
+    for _ in range(5000):
+        deferred = deferred.append("a")
+    assert deferred.render() == "a" * 5000
+
+
+def test_deferred_compile_and_proxies():
+    deferred = Sre(r"\d").deferred.one_or_more.named("number")
+    compiled = deferred.compile(Sre.I)
+    assert isinstance(compiled, re.Pattern)
+    assert deferred.search("abc 42").group("number") == "42"
+    assert deferred.findall("1 22") == ["1", "22"]
+
+
+def test_deferred_mixes_with_eager():
+    deferred = Sre(r"\d").deferred.one_or_more
+    assert Sre("a") + deferred == r"a\d+"
+    assert type(Sre("a") + deferred) is Sre
+    assert Sre(" ").join([deferred, "x"]) == r"\d+ x"
+    assert Sre.concatenate(deferred for _ in range(2)) == r"\d+\d+"
+    assert "x" + deferred == r"x\d+"
+    assert type("x" + deferred) is DeferredStringRegex
+    assert ("x" | deferred).render() == r"x|\d+"
+    assert Bre(b"-").join([Bre(b"a").deferred, b"b"]) == b"a-b"
+    assert len(deferred) == 3
+    assert re.search(deferred.render(), "a 12").group() == "12"
@@ -0,0 +1,107 @@
+import re
+import sys
+
+import pytest
+
+from human_regex import BytesRegex as Bre
+from human_regex import StringRegex as Sre
+from human_regex.engines import (
+    Engine,
+    EngineUnavailableError,
+    ReEngine,
+    RegexModuleEngine,
+    available_engines,
+    get_engine,
+    register_engine,
+)
+from human_regex.instrumentation import record
+
+
+class CountingEngine(Engine):
+    name = "counting"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.compiled_patterns = []
+
+    def compile(self, pattern, flags=0):
+        self.compiled_patterns.append((pattern, flags))
+        return re.compile(pattern, flags)
+
+
+@pytest.fixture
+def counting():
+    engine = CountingEngine()
+    register_engine(engine)
+    return engine
+
+
+def test_engine_per_call(counting):
+    sre = Sre(r"\d").one_or_more
+    assert sre.search("a 12 b", engine="counting").group() == "12"
+    assert sre.match("12", engine=counting).group() == "12"
+    assert sre.fullmatch("12 ", engine="counting") is None
+    assert sre.findall("1 2", engine="counting") == ["1", "2"]
+    assert [m.group() for m in sre.finditer("1 2", engine="counting")] == ["1", "2"]
+    assert sre.split("a1b2c", 1, engine="counting") == ["a", "b2c"]
+    assert sre.sub("#", "a1b2", engine="counting") == "a#b#"
+    assert sre.subn("#", "a1b2", 1, Sre.I, engine="counting") == ("a#b2", 1)
+    assert sre.compile(engine="counting") is re.compile(r"\d+")
+    # compiled once per flags, then taken from the cache of the engine
+    assert counting.compiled_patterns == [(r"\d+", 0), (r"\d+", int(Sre.I))]
+    assert sre.cached_patterns == {}
+
+
+def test_engine_per_instance_and_class(counting, monkeypatch):
+    sre = Sre("x")
+    sre.engine = "counting"
+    assert sre.findall("xx") == ["x", "x"]
+    assert Sre("y").findall("yy") == ["y", "y"]
+    assert counting.compiled_patterns == [("x", 0)]
+    monkeypatch.setattr(Bre, "engine", counting)
+    assert Bre(b"z").search(b"az").start() == 1
+    assert counting.compiled_patterns == [("x", 0), (b"z", 0)]
+    # a per-call engine wins over the engine of the class
+    assert Bre(b"w").search(b"w", engine="re").start() == 0
+    assert len(counting.compiled_patterns) == 2
+
+
+def test_re_engine_uses_the_registry():
+    sre = Sre("registry engine")
+    assert sre.compile(engine="re") is sre.compile()
+    assert sre.search("the registry engine", engine=ReEngine()).start() == 4
+    assert get_engine("re").compile("a") is re.compile("a")
+
+
+def test_prefilter_only_for_re_semantics(counting):
+    sre = Sre(r"\d+ kg")
+    assert sre.search("12 lb", engine="re") is None
+    assert sre.findall("12 lb", engine="counting") == []
+    # the counting engine does not promise the semantics of re, so it ran the search
+    assert counting.compiled_patterns == [(r"\d+ kg", 0)]
+
+
+def test_engine_calls_are_instrumented(counting):  # noqa: ARG001
+    with record() as recorder:
+        Sre("a").findall("aa", engine="counting")
+    assert recorder.stats[("a", 0)].functions == {"findall": 1}
+
+
+def test_engine_lookup_errors(monkeypatch):
+    with pytest.raises(ValueError, match="unknown engine 'nope'"):
+        Sre("a").search("a", engine="nope")
+    assert "re" in available_engines()
+    engine = RegexModuleEngine()
+    monkeypatch.setitem(sys.modules, "regex", None)
+    assert not engine.available
+    with pytest.raises(EngineUnavailableError):
+        get_engine(engine)
+    with pytest.raises(EngineUnavailableError):
+        engine.compile("a")
+
+
+def test_regex_module_engine():
+    pytest.importorskip("regex")
+    sre = Sre(r"(?P<word>\w+)").named("outer")
+    assert sre.search("hello", engine="regex").group("word") == "hello"
+    assert "regex" in available_engines()
@@ -0,0 +1,121 @@
+import io
+import re
+
+import pytest
+
+from human_regex import BytesRegex as Bre
+from human_regex import StringRegex as Sre
+from human_regex.grep import BLOCK, BY_LINE, VERIFY, GrepLine, line_strategy
+
+TEXT = "".join(
+    [
+        "boot ok\n",
+        "\n",
+        "disk full at 90%\n",
+        "fan ok\r\n",
+        "disk\n",
+        "full\n",
+        "ERROR 42 disk\n",
+        "ok ok ok\n",
+        "x" * 50 + " disk full\n",
+        "last line without break disk",
+    ]
+)
+
+PATTERNS = [
+    "disk full",
+    r"disk\s+full",
+    "^ok",
+    "ok$",
+    "^$",
+    "x*",
+    r"\d+",
+    r"disk(?=\sfull)",
+    r"disk(?!\sfull)",
+    r"(?<=ERROR )\d+",
+    r"\Aok",
+    r"ok\Z",
+    r"(?>disk\s*)full",
+    r"[^%]*%",
+    "(?s)disk.*full",
+    "nowhere",
+    r"\B",
+]
+
+
+def expected_lines(pattern: str, text: str, flags: int = 0) -> list[tuple[str, int, int]]:
+    lines = []
+    offset = 0
+    for number, line in enumerate(text.split("\n"), 1):
+        if re.search(pattern, line, flags) and not (number > text.count("\n") and not line):
+            lines.append((line, number, offset))
+        offset += len(line) + 1
+    return lines
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+@pytest.mark.parametrize("block_size", [1, 7, 64, 1 << 20])
+def test_grep_finds_the_lines_a_search_per_line_finds(pattern, block_size):
+    hits = Sre(pattern).grep(io.StringIO(TEXT), line_numbers=True, offsets=True, block_size=block_size)
+    assert [tuple(hit) for hit in hits] == expected_lines(pattern, TEXT)
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_grep_modes(pattern):
+    sre = Sre(pattern)
+    expected = expected_lines(pattern, TEXT)
+    assert sre.grep(io.StringIO(TEXT), "count", block_size=16) == len(expected)
+    first = sre.grep(io.StringIO(TEXT), "first", block_size=16)
+    assert first == (GrepLine(expected[0][0], None, None) if expected else None)
+    assert sre.grep(io.StringIO(TEXT), "files-with-matches") is bool(expected)
+
+
+def test_grep_paths_and_bytes(tmp_path):
+    path = tmp_path / "log"
+    path.write_bytes("caf\xe9 open\nclosed\ncaf\xe9 closed\n".encode())
+    assert [hit.line for hit in Sre("closed").grep(path)] == ["closed", "caf\xe9 closed"]
+    hits = list(Bre(b"closed").grep(str(path), offsets=True, line_numbers=True))
+    assert hits == [(b"closed", 2, 11), ("caf\xe9 closed".encode(), 3, 18)]
+    assert Bre(rb"^caf").grep(path, "count", Bre.M) == 2
+    assert Sre("CLOSED").grep(path, "first", Sre.I).line == "closed"
+
+
+def test_grep_stops_at_the_first_match():
+    source = io.StringIO("match\n" + "filler\n" * 100_000)
+    assert Sre("match").grep(source, "first", block_size=64).line == "match"
+    assert source.tell() < 1000
+
+
+def test_grep_skips_blocks_without_the_literal(monkeypatch):
+    sre = Sre(r"\d+ kg")
+    searched = []
+    original = Sre.compile
+
+    def compile_and_record(self, flags=0):
+        compiled = original(self, flags)
+        return type("Recorder", (), {"search": lambda _, *args: searched.append(args) or compiled.search(*args)})()
+
+    monkeypatch.setattr(Sre, "compile", compile_and_record)
+    assert sre.grep(io.StringIO("12 lb\n" * 100), "count", line_numbers=True) == 0
+    assert searched == []
+
+
+def test_grep_rejects_bad_arguments():
+    with pytest.raises(ValueError, match="mode"):
+        Sre("x").grep(io.StringIO(""), "all")
+    with pytest.raises(ValueError, match="block_size"):
+        Sre("x").grep(io.StringIO(""), block_size=0)
+
+
+@pytest.mark.parametrize(
+    ("pattern", "strategy"),
+    [
+        (r"disk\s+full", BLOCK),
+        ("a(?:b|c(?=d))", VERIFY),
+        (r"(a|\Ab)", BY_LINE),
+        ("x(?<=x)", BY_LINE),
+        ("a*+", BY_LINE),
+    ],
+)
+def test_line_strategy(pattern, strategy):
+    assert line_strategy(pattern) == strategy
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+
+IMPORT_TIME_BUDGET_US = 100_000
+"""
+Import time of human_regex, including the modules of the standard library it imports,
+in microseconds. Generous enough for sources without cached bytecode.
+"""
+
+HEAVY_MODULES = [
+    "asyncio",
+    "concurrent.futures",
+    "inspect",
+    "json",
+    "multiprocessing",
+    "random",
+    "human_regex.backtracking",
+    "human_regex.batch",
+    "human_regex.engines",
+    "human_regex.grep",
+    "human_regex.optimizer",
+    "human_regex.parallel",
+    "human_regex.rules",
+    "human_regex.scanner",
+    "human_regex.syntax",
+]
+
+
+def run(code: str, *options: str) -> subprocess.CompletedProcess:
+    command = [sys.executable, *options, "-c", code]
+    return subprocess.run(command, capture_output=True, text=True, check=True)  # noqa: S603
+
+
+def test_heavy_modules_are_not_imported():
+    code = "import sys, human_regex; print(*sys.modules); print(type(sys.modules['human_regex.nodes']).__name__)"
+    modules, nodes_type = run(code).stdout.splitlines()
+    assert set(modules.split()).isdisjoint(HEAVY_MODULES)
+    assert nodes_type == "_LazyModule"
+
+
+def test_import_time_budget():
+    timings = []
+    for _ in range(5):
+        last_line = run("import human_regex", "-X", "importtime").stderr.splitlines()[-1]
+        _, _, cumulative, name = (part.strip() for part in last_line.replace(":", "|").split("|"))
+        assert name == "human_regex"
+        timings.append(int(cumulative))
+    assert min(timings) < IMPORT_TIME_BUDGET_US
+
+
+def test_lazy_modules_work():
+    code = (
+        "from human_regex import StringRegex as Sre, nodes; "
+        "assert Sre('a|b').node is nodes.Alternation((nodes.Literal('a'), nodes.Literal('b'))); "
+        "assert list(Sre('a').search_many(['a', 'b'], executor='thread')) == [['a'], []]"
+    )
+    run(code)
@@ -0,0 +1,139 @@
+import json
+import re
+import time
+
+from human_regex import BytesRegex as Bre
+from human_regex import StringRegex as Sre
+from human_regex.instrumentation import (
+    CallEvent,
+    CompileEvent,
+    Recorder,
+    add_listener,
+    listeners,
+    record,
+    remove_listener,
+)
+from human_regex.registry import PatternRegistry
+
+
+def test_no_listeners_by_default():
+    assert listeners == []
+    assert Sre("a").search("xa").span() == (1, 2)
+
+
+def test_record_calls():
+    digits = Sre(r"\d+")
+    with record() as recorder:
+        digits.search("ab 12")
+        digits.findall("1 2 3", re.A)
+        digits.sub("#", "a1b22")
+        digits.split("1,2", flags=0)
+    assert listeners == []
+    digits.search("not recorded")
+    stats = recorder.stats
+    assert set(stats) == {(r"\d+", 0), (r"\d+", int(re.A))}
+    plain = stats[(r"\d+", 0)]
+    assert plain.calls == 3
+    assert plain.functions == {"search": 1, "sub": 1, "split": 1}
+    assert plain.input_size == len("ab 12") + len("a1b22") + len("1,2")
+    assert len(plain.samples) == 3
+    assert plain.percentile(0.5) <= plain.max_ns <= plain.total_ns
+
+
+def test_record_bytes_and_uncached():
+    word = Bre(rb"\w+")
+    word.cache_patterns = False
+    with record() as recorder:
+        word.match(b"abc")
+    (entry,) = recorder.to_dict()["patterns"]
+    assert entry["pattern"] == r"\w+"
+    assert entry["type"] == "bytes"
+    assert entry["functions"] == {"match": 1}
+    assert entry["input_size"] == 3
+
+
+def test_compile_events():
+    events = []
+    add_listener(events.append)
+    try:
+        registry = PatternRegistry()
+        registry.compile("a+")
+        registry.compile("a+")
+        registry.pin(b"b")
+    finally:
+        remove_listener(events.append)
+    assert [event.pattern for event in events] == ["a+", b"b"]
+    assert all(isinstance(event, CompileEvent) and event.duration_ns >= 0 for event in events)
+
+
+def test_compile_events_without_pattern_cache():
+    word = Sre(r"\w+")
+    word.cache_patterns = False
+    events = []
+    add_listener(events.append)
+    try:
+        word.search("ab", Sre.I)
+        word.compile()
+    finally:
+        remove_listener(events.append)
+    assert [type(event) for event in events] == [CompileEvent, CallEvent, CompileEvent]
+    assert [(event.pattern, event.flags) for event in events] == [(r"\w+", re.I), (r"\w+", re.I), (r"\w+", 0)]
+    assert type(events[0].pattern) is str
+
+
+def test_custom_listener():
+    events = []
+    add_listener(events.append)
+    try:
+        Sre("b").fullmatch("b")
+    finally:
+        remove_listener(events.append)
+    (event,) = [event for event in events if isinstance(event, CallEvent)]
+    assert event[:3] == ("b", "fullmatch", 0)
+    assert type(event.pattern) is str
+    assert event.size == 1
+
+
+def test_finditer_time_includes_the_iteration():
+    events = []
+    add_listener(events.append)
+    try:
+        # backtracks a lot before each of the two matches
+        slow = Sre(r"(\d+)+x|\d")
+        matches = slow.finditer("1" * 18 + " 1")
+        assert not [event for event in events if isinstance(event, CallEvent)]
+        started = time.perf_counter_ns()
+        assert len(list(matches)) == 19
+        elapsed = time.perf_counter_ns() - started
+        closed = slow.finditer("1 2")
+        next(closed)
+        closed.close()
+    finally:
+        remove_listener(events.append)
+    first, second = [event for event in events if isinstance(event, CallEvent)]
+    assert first.function == second.function == "finditer"
+    assert first.duration_ns >= elapsed // 2
+    assert second.size == 3
+
+
+def test_sampling_is_bounded():
+    recorder = Recorder(max_samples=10)
+    for duration in range(100):
+        recorder(CallEvent("a", "search", 0, duration, 1))
+    stats = recorder.stats[("a", 0)]
+    assert stats.calls == 100
+    assert len(stats.samples) == 10
+    assert stats.max_ns == 99
+
+
+def test_export():
+    recorder = Recorder()
+    recorder(CallEvent("slow", "search", 0, 100, 1))
+    recorder(CallEvent("fast", "match", 0, 1, 1))
+    recorder(CompileEvent("fast", 0, 5))
+    exported = json.loads(recorder.to_json())
+    assert [entry["pattern"] for entry in exported["patterns"]] == ["slow", "fast"]
+    assert exported["patterns"][1]["compiles"] == 1
+    assert exported["patterns"][1]["compile_ns"] == 5
+    recorder.reset()
+    assert recorder.to_dict() == {"patterns": []}
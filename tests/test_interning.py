@@ -0,0 +1,70 @@
+import gc
+import weakref
+
+import pytest
+
+from human_regex import BytesRegex as Bre
+from human_regex import StringRegex as Sre
+from human_regex.bases import general_regex
+
+
+@pytest.fixture
+def interning(monkeypatch):
+    monkeypatch.setattr(Sre, "intern_patterns", True)
+    monkeypatch.setattr(Bre, "intern_patterns", True)
+
+
+def test_intern():
+    digits = Sre.intern(r"\d+")
+    assert type(digits) is Sre
+    assert Sre.intern(r"\d+") is digits
+    assert Sre.intern(Sre(r"\d+")) is digits
+    assert Bre.intern(rb"\d+") is not digits
+    assert Bre.intern(rb"\d+") == rb"\d+"
+
+
+def test_combinators_return_shared_instances(interning):  # noqa: ARG001
+    first = Sre(r"\d").repeat(1, 3)
+    second = Sre(r"\d").repeat(1, 3)
+    assert first is second
+    assert Sre(r"\d").repeat(1, 4) is not first
+    assert Sre(r"\d") + "{1,3}" is first
+    assert Sre(r"\d").named("d") is Sre(r"\d").named("d")
+    assert Sre("a-z").set.optional is Sre("a-z").set.optional
+    assert Bre(b"x").one_or_more is Bre(b"x").one_or_more
+    assert first.compile() is second.compile()
+
+
+def test_combinators_are_memoized(interning, monkeypatch):  # noqa: ARG001
+    digit = Sre(r"\d")
+    expected = digit.repeat(1, 3).named("n")
+    interned = []
+    intern = Sre.intern.__func__
+    monkeypatch.setattr(Sre, "intern", classmethod(lambda cls, text: interned.append(text) or intern(cls, text)))
+    assert Sre(r"\d").repeat(1, 3).named("n") is expected
+    assert interned == []
+    assert Sre(r"\d").repeat(1, 3).named("m") is not expected
+    assert interned == ["(?P<m>\\d{1,3})"]
+
+
+def test_unused_instances_are_released(interning):  # noqa: ARG001
+    sre = weakref.ref(Sre("only used here").no_capture)
+    gc.collect()
+    assert sre() is None
+    assert all("only used here" not in key for key in general_regex._derived[True].keys())
+
+
+def test_interning_is_off_by_default():
+    assert Sre(r"\d").repeat(1, 3) is not Sre(r"\d").repeat(1, 3)
+    assert Sre("a").deferred.optional is not Sre("a").deferred.optional
+
+
+def test_bytes_are_interned_in_bounded_tables(interning, monkeypatch):  # noqa: ARG001
+    monkeypatch.setattr(general_regex, "INTERN_TABLE_SIZE", 2)
+    first = Bre.intern(b"first")
+    assert Bre.intern(b"first") is first
+    Bre.intern(b"second")
+    Bre.intern(b"first")
+    Bre.intern(b"third")
+    assert Bre.intern(b"first") is first
+    assert len(general_regex._interned[False]) == 2
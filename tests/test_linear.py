@@ -0,0 +1,166 @@
+import random
+import re
+import time
+
+import pytest
+
+from human_regex import BytesRegex as Bre
+from human_regex import StringRegex as Sre
+from human_regex.engines import LinearEngine, UnsupportedPatternError, available_engines, get_engine
+from human_regex.engines.linear import LinearPattern
+from human_regex.matches import DetachedMatch
+
+rng = random.Random(25)  # noqa: S311 (reproducible test texts)
+TEXTS = ["", "a", "ab", "aab", "abcd", "b\n", "\n", "ab\n", "key=val x=", "1.5 22", "ABc bC"] + [
+    "".join(rng.choice("ab c\nx=1.B") for _ in range(rng.randint(0, 12))) for _ in range(150)
+]
+
+PATTERNS = [
+    "a",
+    "a*",
+    "a+?",
+    "(a|ab)(c|bcd)(d*)",
+    r"(?P<k>\w+)=(?P<v>\w*)",
+    r"^\w+$",
+    r"(?m)^\w+$",
+    r"\bab\b",
+    r"\Bb\B",
+    r"\B",
+    "(a|b)*?c",
+    "[^ab]+",
+    "(?i)AB",
+    "a{2,3}",
+    "a{2,}?",
+    "(a)|(b)",
+    "$",
+    r"\Z",
+    r"\A",
+    "(?s).",
+    "a$",
+    "(?m)a$",
+    "(ab|a)(bc|c)?",
+    "(x)?y",
+    "a|",
+    "(?:a|b){0,3}c",
+    r"\d+(\.\d+)?",
+    "(?i:b)c",
+    r"\w*\b",
+    r"(?a)\w+",
+    "(a*)*b",
+    "(a?)+?b",
+    "(?:x*|b)+",
+    r"(?:\w*?|.{1,3}a*)+",
+    "(a)(b?)",
+    "(?P<x>a)(?P<y>b?)(?P<z>c)?",
+]
+
+
+def spans(match):
+    return match and (match.regs, match.lastindex, match.lastgroup)
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_same_matches_as_re(pattern):
+    expected = re.compile(pattern)
+    linear = LinearPattern(pattern)
+    assert (linear.groups, linear.groupindex, linear.flags) == (expected.groups, expected.groupindex, expected.flags)
+    for text in TEXTS:
+        for pos, endpos in [(0, len(text)), (1, len(text)), (0, len(text) - 1), (2, len(text) - 1)]:
+            if pos > endpos:
+                continue
+            for method in ("search", "match", "fullmatch"):
+                assert spans(getattr(linear, method)(text, pos, endpos)) == spans(
+                    getattr(expected, method)(text, pos, endpos)
+                ), (method, text, pos, endpos)
+            assert [spans(m) for m in linear.finditer(text, pos, endpos)] == [
+                spans(m) for m in expected.finditer(text, pos, endpos)
+            ]
+        assert linear.findall(text) == expected.findall(text)
+        assert linear.split(text) == expected.split(text)
+        assert linear.subn(r"<\g<0>>", text) == expected.subn(r"<\g<0>>", text)
+
+
+def test_bytes_and_flags():
+    assert LinearPattern(rb"\bab$").search(b"x ab\n").span() == (2, 4)
+    assert LinearPattern(r"(?:\w*?|.{1,3}a*)+", re.M | re.S).search("ba1").span() == (0, 0)
+    assert LinearPattern(rb"(?i)\xe9").search(b"\xc9") is None
+    assert LinearPattern("(?i)\u212a").search("k").span() == (0, 1)
+    assert LinearPattern("(?x) a b # comment").fullmatch("ab")
+    assert LinearPattern(r"\w+", re.ASCII).findall("h\xe9llo") == ["h", "llo"]
+    assert LinearPattern(rb"[a-c]+").sub(lambda m: m.group().upper(), b"abcd", 1) == b"ABCd"
+    assert LinearPattern("x").split("axbxc", 1) == ["a", "bxc"]
+
+
+def test_proxied_functions():
+    pair = Sre(r"\w").one_or_more.named("key") + "=" + Sre(r"\w").one_or_more.named("value")
+    match = pair.search("set color=blue", engine="linear")
+    assert isinstance(match, DetachedMatch)
+    assert match.groupdict() == {"key": "color", "value": "blue"}
+    assert match.lastgroup == "value"
+    # the empty group closed last, although it ends where the previous one does
+    trailing = Sre("a").named("x") + Sre("b").optional.named("y")
+    assert trailing.search("xa", engine="linear").lastgroup == "y"
+    assert Sre("(a)(b?)").search("xa", engine="linear").lastindex == 2
+    assert match.expand(r"\g<value>:\1") == "blue:color"
+    assert pair.match("a=1", engine="linear").span("value") == (2, 3)
+    assert pair.fullmatch("a=1 ", engine="linear") is None
+    assert [m.group() for m in pair.finditer("a=1 b=2", engine="linear")] == ["a=1", "b=2"]
+    assert pair.findall("a=1 b=2", engine="linear") == [("a", "1"), ("b", "2")]
+    assert pair.sub(r"\2=\1", "a=1 b=2", engine="linear") == "1=a 2=b"
+    assert Bre(rb"\d").one_or_more.split(b"a1b22c", engine="linear") == [b"a", b"b", b"c"]
+    assert "linear" in available_engines()
+
+
+def test_linear_time():
+    # (a+)+b takes exponential time with a backtracking engine when b is missing
+    nested = Sre("a").one_or_more.unnamed.one_or_more + "b"
+    started = time.perf_counter()
+    assert nested.search("a" * 20_000, engine="linear") is None
+    assert nested.search("a" * 20_000 + "b", engine="linear").span() == (0, 20_001)
+    assert time.perf_counter() - started < 5
+
+
+def best_time(function, repeat=3):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def test_finding_all_matches_scales_linearly():
+    words = LinearPattern(r"\b\w+=(?P<value>\w*)")
+    short = best_time(lambda: words.findall("key=value x " * 1_000))
+    long = best_time(lambda: words.findall("key=value x " * 8_000))
+    # a quadratic search would take about 64 times longer
+    assert long < 24 * short
+
+
+@pytest.mark.parametrize(
+    ("pattern", "construct"),
+    [
+        (r"(a)\1", "backreferences"),
+        ("a(?=b)", "lookarounds"),
+        ("(?<!a)b", "lookarounds"),
+        ("(a)?(?(1)b|c)", "conditionals"),
+        ("(?>a)", "atomic groups"),
+        ("a*+", "possessive repetitions"),
+        ("(a{1000}){30}", "instructions"),
+    ],
+)
+def test_unsupported_patterns(pattern, construct):
+    with pytest.raises(UnsupportedPatternError, match=construct):
+        LinearPattern(pattern)
+    with pytest.raises(UnsupportedPatternError):
+        Sre(pattern).match("ab", engine="linear")
+    assert isinstance(LinearEngine(fallback=True).compile(pattern), re.Pattern)
+    assert isinstance(get_engine("linear").compile("ab"), LinearPattern)
+
+
+def test_state_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr("human_regex.engines.linear.MAX_STATES", 3)
+    linear = LinearPattern(r"(a|b)*abb")
+    text = "".join(rng.choice("ab") for _ in range(500))
+    assert spans(linear.search(text)) == spans(re.search(r"(a|b)*abb", text))
+    assert len(linear._forward.cache.states) <= 4
@@ -0,0 +1,107 @@
+import re
+
+import pytest
+
+from human_regex import BytesRegex as Bre
+from human_regex import StringRegex as Sre
+from human_regex.instrumentation import record
+from human_regex.literals import prefilter_literal, required_literals
+
+CORPUS = [
+    "",
+    "burger with cheese",
+    "burger and cheese",
+    "with",
+    " with ",
+    "12 kg",
+    "v3.11 with 2 kg and 14 kg",
+    "abbbc abc ac",
+    "WITH ab KG",
+]
+
+
+@pytest.mark.parametrize(
+    ("pattern", "literals", "prefiltered"),
+    [
+        (r"(?P<a>\w+) with (?P<b>\w+)", (" with ",), " with "),
+        ("abc", ("abc",), None),
+        (r"abc\d+x", ("abc", "x"), None),
+        (r"(a\d)bcd", ("bcd", "a"), "bcd"),
+        ("ab+c", ("ab", "bc"), None),
+        ("ab{3}c", ("abbbc",), None),
+        (r"x\d{2}yz(?=qq)", ("yz", "qq", "x"), "yz"),
+        (r"\bfoo\b", ("foo",), None),
+        (r"\d(?:kg|lb)", (), None),
+        (r"\d+ ?kg", ("kg",), "kg"),
+        ("a|b", (), None),
+        (r"(?i)abc\d", (), None),
+        (r"(?i:ab)\dcd", ("cd",), "cd"),
+        (r"\d(?!xyz)", (), None),
+    ],
+)
+def test_required_literals(pattern, literals, prefiltered):
+    assert required_literals(pattern) == literals
+    assert prefilter_literal(pattern) == prefiltered
+
+
+def test_flags_and_bytes():
+    assert required_literals(r"\d kg", re.I) == ()
+    assert Sre(r"\d kg").required_literals(Sre.I) == ()
+    assert Bre(rb"\d\xe9\d\xff").required_literals() == (b"\xe9", b"\xff")
+    with pytest.raises(re.error):
+        Sre("(unclosed").required_literals()
+    # texts without a find method are passed on to the regular expression
+    assert Bre(rb"\d+ kg").search(memoryview(b"12 kg")).group() == b"12 kg"
+
+
+@pytest.mark.parametrize(
+    "sre",
+    [
+        Sre(r"\w").one_or_more.named("burger") + " with " + Sre(r"\w").one_or_more,
+        Sre(r"\d").one_or_more + Sre(" ").optional + "kg",
+        Sre("a") + Sre("b").one_or_more + "c",
+        Sre(r"\d") + Sre("kg").followed_by(" and"),
+        Sre(r"(?i)\d+ kg"),
+    ],
+)
+def test_prefilter_does_not_change_results(monkeypatch, sre):
+    expected = [
+        (re.search(sre, text), re.findall(sre, text), [m.span() for m in re.finditer(sre, text)]) for text in CORPUS
+    ]
+    for prefilter in (True, False):
+        monkeypatch.setattr(Sre, "prefilter", prefilter)
+        results = [(sre.search(text), sre.findall(text), [m.span() for m in sre.finditer(text)]) for text in CORPUS]
+        assert [(m and m.span(), *rest) for m, *rest in results] == [(m and m.span(), *rest) for m, *rest in expected]
+
+
+def test_prefilter_skips_the_regex(monkeypatch):
+    sre = Sre(r"\d").one_or_more + " kg"
+    compiles = []
+    monkeypatch.setattr(sre.pattern_registry, "compile_key", lambda key: compiles.append(key) or re.compile(*key))
+    assert sre.search("12 lb") is None
+    assert sre.findall("12 lb") == []
+    assert list(sre.finditer("12 lb")) == []
+    assert compiles == []
+    sre.prefilter = False
+    assert sre.search("12 lb") is None
+    assert len(compiles) == 1
+
+
+def test_prefilter_applies_while_recording():
+    sre = Sre(r"\d").one_or_more + " kg"
+    with record() as recorder:
+        assert sre.search("12 lb") is None
+        assert sre.findall("12 lb") == []
+        assert list(sre.finditer("12 lb")) == []
+        assert sre.search("12 kg").group() == "12 kg"
+    # the calls answered by the prefilter do not reach the regular expression
+    assert recorder.stats[(r"\d+ kg", 0)].functions == {"search": 1}
+
+
+def test_prefilter_of_mapped_files(tmp_path):
+    path = tmp_path / "data"
+    path.write_bytes(bytes(1000) + b"12 kg")
+    assert Bre(rb"\d+ kg").search_file(path).group() == b"12 kg"
+    assert Bre(rb"\d+ lb").search_file(path) is None
+    assert list(Bre(rb"\d+ lb").finditer_file(path)) == []
+    assert [m.group() for m in Bre(rb"\d+ kg").finditer_file(path)] == [b"12 kg"]
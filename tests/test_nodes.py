@@ -0,0 +1,141 @@
+import gc
+import pickle
+import re
+import weakref
+
+import pytest
+
+from human_regex import BytesRegex as Bre
+from human_regex import StringRegex as Sre
+from human_regex import nodes
+from human_regex.nodes import (
+    Alternation,
+    Anchor,
+    Atom,
+    Backreference,
+    Conditional,
+    Flags,
+    Group,
+    Literal,
+    Lookaround,
+    Quantifier,
+    Sequence,
+    Set,
+)
+
+ROUND_TRIP = [
+    r"v(?P<major>\d+)\.(?P<minor>\d+)",
+    "(?:ab)+|c",
+    "a|b",
+    r"[]a\]-]x{2,3}?",
+    "(?i)a(?s-i:b)",
+    r"(a)\1(?(1)x|y)(?<!z)(?=q)",
+    r"\b^$.\d*+",
+    "(?>a|b)c{2,}",
+    "",
+]
+
+
+@pytest.fixture
+def build_nodes(monkeypatch):
+    monkeypatch.setattr(Sre, "build_nodes", True)
+    monkeypatch.setattr(Bre, "build_nodes", True)
+
+
+@pytest.mark.parametrize("pattern", ROUND_TRIP)
+def test_round_trip(pattern):
+    assert Sre.from_node(Sre(pattern).node) == pattern
+
+
+def test_parse_follows_the_text():
+    assert Sre("(?:ab)+|c").node is Alternation(
+        (Quantifier(Group(Literal("ab"), capture=False), 1, None), Literal("c"))
+    )
+    assert Sre(r"(a)\1(?(1)x)").node is Sequence((Group(Literal("a")), Backreference(1), Conditional(1, Literal("x"))))
+    assert Sre("(?x) a b # comment\n [c] ").node is Sequence((Flags("x"), Literal("ab"), Set("c")))
+    assert Sre("x(?#comment)+").node is Quantifier(Literal("x"), 1, None)
+    assert Sre(r"(?<!\.)\B").node is Sequence((Lookaround(Literal("."), behind=True, negative=True), Anchor(r"\B")))
+    assert Bre(rb"\xe9[^\x00]").node is Sequence((Literal(b"\xe9"), Set(rb"\x00", negated=True)))
+    assert Bre(rb"\xe9").node is not Sre("\xe9").node
+    with pytest.raises(re.error):
+        _ = Sre("(unclosed").node
+
+
+def test_nodes_are_hash_consed():
+    digit = Atom(r"\d")
+    assert Quantifier(digit, 1, 3) is Quantifier(Atom(r"\d"), 1, 3)
+    assert Group(Literal("a"), Sre("x")) is Group(Literal("a"), "x")
+    assert Sre(r"(\d{1,3})\.(\d{1,3})").node.items[0].content is Sre(r"\d{1,3}").node
+    with pytest.raises(AttributeError):
+        digit.text = "x"
+    assert pickle.loads(pickle.dumps(Group(digit, "n"))) is Group(digit, "n")  # noqa: S301
+    assert repr(Group(digit, "n")) == r"Group(Atom('\\d'), name='n', capture=True, atomic=False, flags=None)"
+
+
+def test_unused_nodes_are_released():
+    node = weakref.ref(Literal("only used here"))
+    gc.collect()
+    assert node() is None
+    assert all(value.text != "only used here" for value in nodes._interned.values() if type(value) is Literal)
+
+
+def test_combinators_build_nodes(build_nodes):  # noqa: ARG001
+    nodes._parsed.cache_clear()
+    word = Sre(r"\w").one_or_more
+    sre = Sre(" ").join((word.named("first"), (Sre("Jr") | "Sr").no_capture.optional))
+    # only the texts the expression was created from were parsed
+    assert nodes._parsed.cache_info().misses == len({r"\w", " ", "Jr", "Sr", "|"})
+    assert sre.node is Sequence(
+        (
+            Group(Quantifier(Atom(r"\w"), 1, None), "first"),
+            Literal(" "),
+            Quantifier(Group(Alternation((Literal("Jr"), Literal("Sr"))), capture=False), 0, 1),
+        )
+    )
+    assert sre.node is nodes.parse(sre)
+
+
+@pytest.mark.parametrize(
+    ("sre", "node"),
+    [
+        ((Sre("a") | "b") + "c", Alternation((Literal("a"), Literal("bc")))),
+        (Sre("ab").one_or_more, Sequence((Literal("a"), Quantifier(Literal("b"), 1, None)))),
+        (
+            Sre("a|bc").zero_or_more,
+            Alternation((Literal("a"), Sequence((Literal("b"), Quantifier(Literal("c"), 0, None))))),
+        ),
+        (Sre("a").one_or_more.lazy, Quantifier(Literal("a"), 1, None, "lazy")),
+        (Sre("a").zero_or_more.one_or_more, Quantifier(Literal("a"), 0, None, "possessive")),
+        (Sre("a").repeat(None, 4), Quantifier(Literal("a"), 0, 4)),
+        (Sre("a").exactly(0), Literal("a{}")),
+        (Sre("^a-z").set, Set("a-z", negated=True)),
+        (Sre("a]b").set, Sequence((Set("a"), Literal("b]")))),
+        (
+            Sre("x").followed_by("y").not_preceded_by("z"),
+            Sequence((Lookaround(Literal("z"), behind=True, negative=True), Literal("x"), Lookaround(Literal("y")))),
+        ),
+        (
+            Sre("x").unnamed + Sre.yes_no(1, "a", Sre("b").atomic),
+            Sequence((Group(Literal("x")), Conditional(1, Literal("a"), Group(Literal("b"), atomic=True)))),
+        ),
+        (Sre.yes_no("n", "a|b"), None),
+        (Sre.set_flags("i") + "a" + Sre("b").comment, Sequence((Flags("i"), Literal("a")))),
+        (Sre("b") + Sre.set_flags("i"), None),
+        (Sre("a").modify_flags("-i"), Group(Literal("a"), flags="-i")),
+        (Sre.any_of(("cat", "car")), Sequence((Literal("ca"), Set("rt")))),
+        (Bre(b"\xe9").named(b"e"), Group(Literal(b"\xe9"), b"e")),
+    ],
+)
+def test_combinator_nodes(build_nodes, sre, node):  # noqa: ARG001
+    if node is None:
+        with pytest.raises(re.error):
+            _ = sre.node
+    else:
+        assert sre.node is node
+        assert nodes.parse(sre) is node
+
+
+def test_standalone_references(build_nodes):  # noqa: ARG001
+    # valid as part of a larger expression only, so only the combinators know their nodes
+    assert Sre("ruler").backreference.node is Backreference("ruler")
+    assert Sre.yes_no(1, ">", "$").node is Conditional(1, Literal(">"), Anchor("$"))
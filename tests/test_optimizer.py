@@ -0,0 +1,74 @@
+import itertools
+import re
+
+import pytest
+
+from human_regex import BytesRegex as Bre
+from human_regex import StringRegex as Sre
+from human_regex.optimizer import optimize
+
+ALPHABET = "abcdxA1 "
+CORPUS = ["".join(letters) for length in range(5) for letters in itertools.product(ALPHABET, repeat=length)]
+TEXT = "\n".join(CORPUS)
+
+digit = Sre(r"\d")
+letter = Sre("a-d").set
+
+PATTERNS = [
+    (digit.no_capture.exactly(1) + Sre("x").repeat(0, None), r"\dx*"),
+    ((Sre("ab") | "cd" | "ab").no_capture.one_or_more, "(?:ab|cd)+"),
+    (Sre("a").no_capture.no_capture.unnamed, "(a)"),
+    (Sre("(a|a)*b"), "(a)*b"),
+    (Sre(r"(?:a+)*x"), "a*x"),
+    (Sre(r"(?:a?)+x"), "a*x"),
+    (Sre(r"(?:a*)+?"), r"(?:a*)+?"),
+    (Sre(r"(?:a{2})*"), r"(?:a{2})*"),
+    (Sre("[a-cb-d1]").one_or_more, "[1a-d]+"),
+    (Sre("[^aa]"), "[^a]"),
+    (Sre("(?=ab)abc"), "abc"),
+    (Sre("ab(?<=b)c"), "abc"),
+    (Sre("(?=a)[a-c]b"), "ab"),
+    (Sre("(?!a)bc"), "bc"),
+    (Sre("(?!b)bc"), "(?!b)bc"),
+    (Sre("(?=(a))a"), "(?=(a))a"),
+    (Sre("(?=a)."), "a"),
+    (Sre("(?i)(?=a)[a-c]"), "(?i)a"),
+    (Sre("(?i:(?!A)a)b"), "(?i:(?!A)a)b"),
+    (Sre("(a)?(?(1)(?:b|c)d|x)"), "(a)?(?(1)[bc]d|x)"),
+    (Sre("x(?:y|(?:z|y))"), "x[yz]"),
+    (letter.named("l") + Sre("l").backreference.exactly(1), "(?P<l>[a-d])(?P=l)"),
+    (Sre("a{1}?b{1}+"), "ab{1}+"),
+    (Sre(r"\w+"), r"\w+"),
+]
+
+
+@pytest.mark.parametrize(("pattern", "expected"), PATTERNS)
+def test_optimize(pattern, expected):
+    optimized = pattern.optimize()
+    assert type(optimized) is Sre
+    assert optimized == expected
+    assert len(optimized) <= len(pattern)
+
+
+@pytest.mark.parametrize("pattern", [pattern for pattern, _ in PATTERNS])
+def test_equivalent_on_corpus(pattern):
+    original = re.compile(pattern)
+    optimized = re.compile(pattern.optimize())
+    assert optimized.groupindex == original.groupindex
+    assert optimized.groups == original.groups
+    for text in CORPUS:
+        expected = original.fullmatch(text)
+        found = optimized.fullmatch(text)
+        assert (found and (found.span(), found.groups())) == (expected and (expected.span(), expected.groups()))
+    assert [(m.span(), m.groups()) for m in optimized.finditer(TEXT)] == [
+        (m.span(), m.groups()) for m in original.finditer(TEXT)
+    ]
+
+
+def test_optimize_flags_and_bytes():
+    assert Sre("(?=a)[a-c]").optimize(Sre.I) == "a"
+    assert optimize("x(?:a){1}", re.X) == "xa"
+    assert Bre(rb"(?:\xe9){1}|\xe9").optimize() == b"\xe9"
+    pattern = Sre(r"\d+")
+    assert optimize(pattern) is pattern
+    assert Sre("a").deferred.no_capture.exactly(1).optimize() == "a"
@@ -0,0 +1,79 @@
+import pickle
+
+import pytest
+
+from human_regex import BytesRegex as Bre
+from human_regex import StringRegex as Sre
+from human_regex.matches import DetachedMatch
+
+
+def test_pickle_is_cheap():
+    s = Sre(r"(?P<word>\w+)").named("outer")
+    plain = len(pickle.dumps(s))
+    s.compile()
+    s.compile(Sre.I)
+    assert len(pickle.dumps(s)) == plain
+    restored = pickle.loads(pickle.dumps(s))  # noqa: S301
+    assert restored == s
+    assert type(restored) is Sre
+    assert restored.cached_patterns == {}
+    b = pickle.loads(pickle.dumps(Bre(b"x")))  # noqa: S301
+    assert type(b) is Bre
+
+
+def test_search_many_threads():
+    number = Sre(r"\d").one_or_more
+    texts = ["1 and 2", "none", "33"]
+    assert list(number.search_many(texts, workers=2, executor="thread")) == [["1", "2"], [], ["33"]]
+
+
+def test_search_many_processes_with_files(tmp_path):
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"{i}.log"
+        path.write_bytes(b"x" * i + b"needle" * i)
+        paths.append(path)
+    needle = Bre(b"NEEDLE")
+    counts = [len(found) for found in needle.search_many(paths, Bre.I, workers=2)]
+    assert counts == [0, 1, 2, 3, 4]
+
+
+def test_search_many_as_completed():
+    word = Sre(r"\w+")
+    results = dict(word.search_many(["a b", "c"], method="split", executor="thread", ordered=False, maxsplit=1))
+    assert results == {0: ["", " b"], 1: ["", ""]}
+
+
+def test_search_many_detaches_matches():
+    word = Sre(r"(?P<word>\w+)")
+    first, missing = word.search_many([" some text", " "], method="search", workers=1)
+    assert isinstance(first, DetachedMatch)
+    assert first.span() == (1, 5)
+    assert first.group("word") == "some"
+    assert missing is None
+    (found,) = word.search_many(["a bc"], method="finditer", executor="thread")
+    assert [m.span() for m in found] == [(0, 1), (2, 4)]
+
+
+def test_search_many_invalid_arguments():
+    with pytest.raises(ValueError, match="method"):
+        Sre("a").search_many(["a"], method="sub")
+    with pytest.raises(ValueError, match="executor"):
+        Sre("a").search_many(["a"], executor="cluster")
+
+
+def test_search_many_streams_items():
+    consumed = []
+
+    def texts():
+        for i in range(1000):
+            consumed.append(i)
+            yield str(i)
+
+    number = Sre(r"\d+")
+    results = number.search_many(texts(), workers=2, executor="thread", method="search")
+    assert next(results).group() == "0"
+    assert len(consumed) < 10
+    assert [match.group() for match in results] == [str(i) for i in range(1, 1000)]
+    unordered = dict(number.search_many(texts(), method="findall", ordered=False, workers=2))
+    assert unordered == {i: [str(i)] for i in range(1000)}
@@ -0,0 +1,51 @@
+import re
+
+from human_regex import BytesRegex as Bre
+from human_regex import StringRegex as Sre
+
+
+def test_compile_is_cached_per_flags():
+    s = Sre("a.c")
+    assert s.compile() is s.compile()
+    assert s.compile(Sre.I) is s.compile(Sre.I)
+    assert s.compile(Sre.I) is not s.compile()
+    assert set(s.cached_patterns) == {0, Sre.I}
+
+
+def test_proxied_calls_use_cached_pattern():
+    s = Sre(r"(?P<word>\w+)")
+    assert s.search("  hello").group("word") == "hello"
+    assert s.match("hello world").group() == "hello"
+    assert s.fullmatch("hello") is not None
+    assert s.findall("a b c") == ["a", "b", "c"]
+    assert [m.group() for m in s.finditer("a b")] == ["a", "b"]
+    assert s.split("a b", 1) == ["", "a", " b"]
+    assert s.sub("x", "a b c", 2) == "x x c"
+    assert s.subn("x", "a b c") == ("x x x", 3)
+    assert list(s.cached_patterns) == [0]
+
+
+def test_flags_positional_and_keyword():
+    s = Sre("abc")
+    assert s.search("ABC", Sre.I)
+    assert s.search("ABC", flags=Sre.I)
+    assert s.sub("x", "ABC abc", 0, Sre.I) == "x x"
+    assert s.split("1ABC2", 0, Sre.I) == ["1", "2"]
+    assert set(s.cached_patterns) == {Sre.I}
+
+
+def test_clear_cached_patterns():
+    b = Bre(b"ab")
+    compiled = b.compile()
+    b.clear_cached_patterns()
+    assert b.cached_patterns == {}
+    assert b.compile() == compiled
+    assert b.cached_patterns == {0: compiled}
+
+
+def test_cache_opt_out():
+    s = Sre("ab")
+    s.cache_patterns = False
+    assert s.search("xab").span() == (1, 3)
+    assert isinstance(s.compile(), re.Pattern)
+    assert s.cached_patterns == {}
@@ -0,0 +1,106 @@
+import re
+
+import pytest
+
+from human_regex import BytesRegex as Bre
+from human_regex import StringRegex as Sre
+from human_regex.registry import PatternRegistry, default_registry
+
+
+def test_compile_hit_and_miss():
+    registry = PatternRegistry(capacity=8)
+    compiled = registry.compile("a+", re.I)
+    assert isinstance(compiled, re.Pattern)
+    assert compiled.flags & re.I
+    assert registry.compile(Sre("a+"), re.I) is compiled
+    assert registry.stats[:3] == (1, 1, 0)
+    registry.reset_stats()
+    assert registry.stats.hits == 0
+
+
+def test_lru_eviction():
+    registry = PatternRegistry(capacity=2)
+    a = registry.compile("a")
+    registry.compile("b")
+    assert registry.compile("a") is a
+    registry.compile("c")
+    assert "a" in registry
+    assert "b" not in registry
+    assert registry.stats.evictions == 1
+    registry.capacity = 1
+    assert "a" not in registry
+    assert len(registry) == 1
+
+
+def test_pinning():
+    registry = PatternRegistry(capacity=1)
+    pinned = registry.pin(b"x")
+    registry.compile(b"y")
+    registry.compile(b"z")
+    assert registry.compile(b"x") is pinned
+    assert registry.stats.pinned == 1
+    registry.clear()
+    assert b"x" in registry
+    registry.unpin(b"x")
+    registry.clear()
+    assert b"x" not in registry
+
+
+def test_negative_capacity():
+    with pytest.raises(ValueError, match="negative"):
+        PatternRegistry(capacity=-1)
+
+
+def test_proxies_use_class_registry():
+    registry = PatternRegistry(capacity=4)
+
+    class MyRegex(Sre):
+        pattern_registry = registry
+
+    s = MyRegex("registered")
+    assert s.search("is registered")
+    assert "registered" in registry
+    assert Bre.pattern_registry is default_registry
+
+
+def test_purge():
+    registry = PatternRegistry()
+
+    class MyRegex(Sre):
+        pattern_registry = registry
+
+    MyRegex("p").compile()
+    registry.pin("q")
+    MyRegex.purge()
+    assert "p" not in registry
+    assert "q" in registry
+
+
+def test_registry_owns_instance_patterns():
+    registry = PatternRegistry(capacity=1)
+
+    class MyRegex(Sre):
+        pattern_registry = registry
+
+    hot = MyRegex("hot")
+    for _ in range(10):
+        hot.search("hot")
+    assert registry.stats[:2] == (9, 1)
+    cold = [MyRegex(f"cold{i}") for i in range(10)]
+    for regex in cold:
+        regex.search("x")
+    assert len(registry) == 1
+    assert all(len(regex.cached_patterns) <= 1 for regex in cold)
+    assert sum(len(regex.cached_patterns) for regex in cold) == 1
+    assert hot.cached_patterns == {}
+    assert hot.search("hot")
+
+
+def test_contains_and_get_respect_flags():
+    registry = PatternRegistry()
+    compiled = registry.compile("a", re.I)
+    assert ("a", re.I) in registry
+    assert "a" not in registry
+    assert registry.get(Sre("a"), re.I) is compiled
+    assert registry.get("a") is None
+    assert registry.stats.hits == 0
@@ -0,0 +1,71 @@
+import re
+
+import pytest
+
+from human_regex import BytesRegex as Bre
+from human_regex import StringRegex as Sre
+from human_regex.rules import RuleIndex
+
+NUMBER = Sre(r"\d").one_or_more
+
+RULES = {
+    "timeout": Sre("timeout after ") + NUMBER.named("ms") + "ms",
+    "time": Sre("time") + NUMBER,
+    "timer": Sre(r"\btimer\b"),
+    "refused": Sre("connection refused"),
+    "fatal": Sre("fatal|panic"),
+    "caseless": Sre("(?i)error"),
+    "overlap": Sre("abab") + NUMBER,
+    "prefix": Sre("aba") + NUMBER,
+}
+
+LINES = [
+    "",
+    "GET /api timeout after 350ms",
+    "timeout after ms time42",
+    "the timer ran out",
+    "connection refused, then panic",
+    "ERROR: ababab1 and aba2",
+    "abab7",
+    "nothing at all",
+]
+
+
+def test_rule_index_literals():
+    index = Sre.rule_index(RULES)
+    assert isinstance(index, RuleIndex)
+    assert len(index) == len(RULES)
+    assert index.ids == tuple(RULES)
+    assert index.literals["timeout"] == "timeout after "
+    assert index.literals["timer"] == "timer"
+    assert index.literals["fatal"] is None
+    assert index.literals["caseless"] is None
+    assert index.candidates("nothing at all") == ["fatal", "caseless"]
+    assert index.candidates("GET /api timeout after 350ms") == ["timeout", "time", "fatal", "caseless"]
+
+
+@pytest.mark.parametrize("line", LINES)
+def test_rule_index_matches_like_separate_searches(line):
+    index = Sre.rule_index(RULES)
+    expected = {rule_id: re.search(rule, line) for rule_id, rule in RULES.items()}
+    matches = index.search_all(line)
+    assert list(matches) == [rule_id for rule_id, match in expected.items() if match is not None]
+    assert {rule_id: match.span() for rule_id, match in matches.items()} == {
+        rule_id: match.span() for rule_id, match in expected.items() if match is not None
+    }
+    assert index.matching_ids(line) == set(matches)
+
+
+def test_rule_index_bytes_and_flags():
+    index = Bre.rule_index((Bre(b"\xe9t\xe9 ") + Bre(rb"\d+"), b"abc", Bre(b"x|y")))
+    assert index.literals == {0: b"\xe9t\xe9 ", 1: b"abc", 2: None}
+    assert index.matching_ids(b"\xe9t\xe9 2024, abc") == {0, 1}
+    assert index.candidates(b"nothing") == [2]
+    caseless = Sre.rule_index(["abc", "def"], Sre.I)
+    assert caseless.pattern is None
+    assert caseless.matching_ids("ABC") == {0}
+
+
+def test_rule_index_rejects_invalid_rules():
+    with pytest.raises(ValueError, match="rule 'broken'"):
+        Sre.rule_index({"broken": "(unclosed"})
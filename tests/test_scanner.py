@@ -0,0 +1,71 @@
+import pytest
+
+from human_regex import BytesRegex as Bre
+from human_regex import StringRegex as Sre
+from human_regex.scanner import PatternSet
+
+
+def test_scanner_reports_pattern_ids_and_groups():
+    word = Sre(r"\w").one_or_more
+    scanner = Sre.scanner(
+        {
+            "greeting": Sre("hello|hi").no_capture + " " + word.named("name"),
+            "number": Sre(r"\d").one_or_more.named("digits"),
+        }
+    )
+    assert isinstance(scanner, PatternSet)
+    assert len(scanner) == 2
+    matches = list(scanner.finditer("hi Bob, you are 42"))
+    assert [m.pattern_id for m in matches] == ["greeting", "number"]
+    assert matches[0].groups == {"name": "Bob"}
+    assert (matches[1].start, matches[1].end, matches[1].text) == (16, 18, "42")
+    assert matches[1].groups == {"digits": "42"}
+    assert scanner.search("42 and hello Ann").pattern_id == "number"
+    assert scanner.match("x 42") is None
+    assert scanner.matching_ids("hello Ann") == {"greeting"}
+    assert scanner.matching_ids("nothing to see") == set()
+
+
+def test_scanner_ids_from_iterable_and_nested_groups():
+    scanner = Sre.scanner((Sre("a").unnamed.unnamed, "b", Sre("c").named("c")))
+    assert scanner.ids == (0, 1, 2)
+    assert [m.pattern_id for m in scanner.finditer("cab")] == [2, 0, 1]
+
+
+def test_scanner_bytes():
+    scanner = Bre.scanner({"hex": Bre(b"0-9a-f").set.one_or_more.named(b"value"), "dash": b"-"})
+    found = [(m.pattern_id, m.text, m.groups) for m in scanner.finditer(b"ff-01")]
+    assert found == [("hex", b"ff", {"value": b"ff"}), ("dash", b"-", {}), ("hex", b"01", {"value": b"01"})]
+
+
+def test_scanner_flags():
+    scanner = Sre.scanner(["abc"], Sre.I)
+    assert scanner.search("ABC").text == "ABC"
+
+
+def test_scanner_rejects_duplicate_group_names():
+    with pytest.raises(ValueError, match="not unique"):
+        Sre.scanner((Sre("a").named("x"), Sre("b").named("x")))
+
+
+def test_scanner_rejects_invalid_pattern():
+    with pytest.raises(ValueError, match="'broken'"):
+        Sre.scanner({"broken": "(unclosed"})
+
+
+def test_matching_ids_finds_overlapped_patterns():
+    scanner = Sre.scanner({"err": "error", "code": r"\d+", "e": "e", "r": "r+"})
+    assert scanner.matching_ids("error 42") == {"err", "code", "e", "r"}
+    assert [m.pattern_id for m in scanner.finditer("error 42")] == ["err", "code"]
+    assert scanner.matching_ids("42") == {"code"}
+    assert Bre.scanner([b"ab", b"b"]).matching_ids(b"ab") == {0, 1}
+
+
+def test_scanner_leading_inline_flags():
+    scanner = Sre.scanner({"abc": "(?i)abc", "d": "d", "verbose": "(?x) e  # comment"})
+    assert (
+        scanner.pattern
+        == r"(?P<_hr_pattern_0>(?i:abc))|(?P<_hr_pattern_1>d)|(?P<_hr_pattern_2>(?x: e  # comment" + "\n))"
+    )
+    assert [m.pattern_id for m in scanner.finditer("ABC D d e")] == ["abc", "d", "verbose"]
+    assert Bre.scanner([b"(?i)x"]).search(b"X").text == b"X"
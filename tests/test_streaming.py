@@ -0,0 +1,101 @@
+import asyncio
+import io
+import random
+
+import pytest
+
+from human_regex import BytesRegex as Bre
+from human_regex import StringRegex as Sre
+from human_regex.matches import DetachedMatch
+from human_regex.streaming import ChunkScanner
+
+
+def chunked(text, sizes):
+    position = 0
+    for size in sizes:
+        yield text[position : position + size]
+        position += size
+    yield text[position:]
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [r"\d+", r"(?P<word>[a-c]+)(?=\d)", r"(?<=x)a+", r"\bab\b", r"^a", r"a*", r"c$", r"(a)|(b)|"],
+)
+def test_stream_matches_equal_in_memory_matches(pattern):
+    sre = Sre(pattern)
+    rng = random.Random(pattern)  # noqa: S311
+    for _ in range(30):
+        text = "".join(rng.choice("abcx1 ") for _ in range(rng.randint(0, 300)))
+        sizes = [rng.randint(1, 20) for _ in range(rng.randint(0, 30))]
+        expected = [(m.span(), m.groups()) for m in sre.finditer(text)]
+        found = [(m.span(), m.groups()) for m in sre.finditer_stream(chunked(text, sizes), max_match_len=8)]
+        assert found == expected
+
+
+def test_stream_file_object():
+    number = Sre(r"\d").one_or_more.named("number")
+    stream = io.StringIO("1 22 333 " * 1000)
+    matches = list(number.finditer_stream(stream, max_match_len=16, chunk_size=100))
+    assert len(matches) == 3000
+    assert isinstance(matches[-1], DetachedMatch)
+    assert matches[-1].span() == (8996, 8999)
+    assert matches[-1].group("number") == "333"
+    assert matches[-1].groupdict() == {"number": "333"}
+
+
+def test_stream_bytes():
+    b = Bre(b"\x00\xff")
+    stream = io.BytesIO(b"\x00\xff".join(bytes(300) for _ in range(4)))
+    assert [m.start() for m in b.finditer_stream(stream, max_match_len=2, chunk_size=7)] == [300, 602, 904]
+
+
+def test_stream_flags():
+    found = Sre("abc").finditer_stream(["xA", "Bc"], Sre.I, max_match_len=3)
+    assert [m.group() for m in found] == ["ABc"]
+
+
+def test_stream_memory_is_bounded():
+    scanner = ChunkScanner(Sre("never").compile(), max_match_len=10)
+    for _ in range(100):
+        scanner.feed("x" * 50)
+        assert len(scanner._buffer) <= 50 + 2 * 10
+    assert scanner.close() == []
+
+
+def test_stream_invalid_window():
+    with pytest.raises(ValueError, match="positive"):
+        ChunkScanner(Sre("a").compile(), max_match_len=0)
+
+
+def test_afinditer_stream_reader():
+    async def scan():
+        reader = asyncio.StreamReader()
+        for chunk in (b"err", b"or: 1\nerror: 22\n", b"err", b"or: 333"):
+            reader.feed_data(chunk)
+        reader.feed_eof()
+        error = Bre(rb"error: (?P<code>\d+)")
+        return [(m.start(), m.group("code")) async for m in error.afinditer(reader, chunk_size=4, max_match_len=16)]
+
+    assert asyncio.run(scan()) == [(0, b"1"), (9, b"22"), (19, b"333")]
+
+
+def test_afinditer_decodes_and_offloads():
+    async def chunks():
+        data = "é1 é22 ".encode() * 100
+        for i in range(0, len(data), 7):
+            yield data[i : i + 7]
+
+    async def scan():
+        found = Sre(r"é(\d+)").afinditer(chunks(), max_match_len=8, offload_threshold=1)
+        return [m.group(1) async for m in found]
+
+    assert asyncio.run(scan()) == ["1", "22"] * 100
+
+
+def test_stream_matches_do_not_keep_buffers():
+    number = Sre(r"\d").one_or_more
+    matches = list(number.finditer_stream(io.StringIO("12 abc " * 20000), max_match_len=8, chunk_size=4096))
+    assert len(matches) == 20000
+    assert sum(len(match.string) for match in matches) == 40000
+    assert matches[-1].span() == (139993, 139995)
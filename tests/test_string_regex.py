@@ -195,3 +195,23 @@ def test_string_compile():
     assert isinstance(compiled, re.Pattern)
     assert compiled.pattern == "(?P<label>content)"
     assert compiled.flags == Sre.I | Sre.U
+
+
+def test_string_any_of():
+    s = Sre.any_of(("car", "cart", "care", "cat", "dog"))
+    assert s == "(?:ca(?:r[et]?|t)|dog)"
+    assert type(s) is Sre
+    assert s.findall("my cart, my cat and my dog") == ["cart", "cat", "dog"]
+    assert Sre.any_of(("a.b", "a-c", "a]")) == r"a(?:\-c|\.b|\])"
+    assert Sre.any_of(("", "ab")) == "(?:ab)?"
+    assert Sre.any_of(()).search("anything") is None
+
+
+def test_string_any_of_matches_longest_word():
+    words = ("in", "int", "integer", "inter", "interval", "into", "i")
+    s = Sre.any_of(words)
+    flat = Sre("|").join(sorted(words, key=len, reverse=True))
+    text = "i in int into intern integers interval"
+    assert s.findall(text) == flat.findall(text)
+    assert all(s.fullmatch(word) for word in words)
+    assert Sre("").deferred.any_of(words).render() == s
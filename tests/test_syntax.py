@@ -0,0 +1,51 @@
+import re
+
+import pytest
+
+from human_regex import BytesRegex as Bre
+from human_regex import StringRegex as Sre
+from human_regex.syntax import parse, unparse
+
+ROUND_TRIP = [
+    "(?:ab|cd)e",
+    "(ab)+",
+    "(?i:a)b",
+    "(?s-i:x)",
+    "a{2,5}?b*+c{3}d{2,}",
+    "(?>a)",
+    "(?<=a)b(?!c)(?<!d)(?=e)",
+    "(a)?(?(1)b|c)",
+    r"\bx\Z\A^$\B",
+    r"[^a-z\s]",
+    r"\W",
+    "(?:a*)*",
+    "(?!)",
+    r"\n\t.",
+]
+
+
+@pytest.mark.parametrize("pattern", ROUND_TRIP)
+def test_round_trip(pattern):
+    assert unparse(parse(pattern)) == pattern
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        (r"(?P<n>a)(?P=n)\1", "(?P<n>a)(?P=n)(?P=n)"),
+        (r"(a)\1(?:0)", r"(a)(?:\1)0"),
+        ("a|b", "[ab]"),
+        ("(?i)a b", r"(?i)a\ b"),
+        (r"(?x) a \# b ", r"a\#b"),
+        ("x{0,4}", "x{0,4}"),
+        ("[]a-]", r"[\]a\-]"),
+    ],
+)
+def test_unparse_equivalent(pattern, expected):
+    assert unparse(parse(pattern)) == expected
+
+
+def test_unparse_bytes_and_instances():
+    assert unparse(parse(Bre(rb"\xe9+|x"))) == b"\xe9+|x"
+    assert unparse(parse(Sre("(?i)a"), re.I)) == "(?i)a"
+    assert unparse(parse("(?i)a"), re.I) == "a"